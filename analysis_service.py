@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+from auth_system import AuthSystem
+from new_parser import DB_PATH, ResumeParser, cacheable
+from pdf_extraction import DEFAULT_LIMITS, ExtractionLimits
+from result_records import parsed_to_dicts
+from text_tokenizers import TOKENIZERS
+
+MAX_HEADER_BYTES = 16 * 1024
+REASONS = {
+    200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 415: "Unsupported Media Type", 422: "Unprocessable Entity",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+# One parser per worker process, created by the pool initializer
+_worker_parser = None
+
+def _init_worker(db_path, tokenizer, extraction_limits):
+    global _worker_parser
+    # Workers only read the parse cache; the service's database thread stores into it
+    _worker_parser = ResumeParser(
+        db_path=db_path, headless=True, tokenizer=tokenizer, extraction_limits=extraction_limits)
+
+def _ready():
+    return _worker_parser is not None
+
+def _analyze_upload(pdf_bytes):
+    return _worker_parser.analyze_bytes(pdf_bytes, store=False)
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+class AnalysisService:
+    """Local HTTP front end for the analysis pipeline.
+
+    Uploads are queued in a bounded asyncio.Queue and analyzed by a process pool, so the
+    event loop never parses. When the queue is full new uploads are refused with 503 and
+    Retry-After instead of piling up. Results are saved on one dedicated database thread.
+    """
+
+    def __init__(self, db_path=DB_PATH, workers=None, queue_size=32, max_upload_bytes=10 * 1024 * 1024,
+                 tokenizer="regex", extraction_limits=DEFAULT_LIMITS, use_cache=True):
+        self.db_path = db_path
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.max_upload_bytes = max_upload_bytes
+        self.tokenizer = tokenizer
+        self.extraction_limits = extraction_limits
+        self.use_cache = use_cache
+        self.queue = None
+        self.pool = None
+        self.db_executor = None
+        self.tasks = []
+        self.stats = {"accepted": 0, "rejected": 0, "completed": 0, "failed": 0}
+
+    def _open_db(self):
+        # Runs on the database thread, which then owns the writer's connection
+        self.parser = ResumeParser(db_path=self.db_path, headless=True)
+
+    async def start(self, host="127.0.0.1", port=8080):
+        loop = asyncio.get_running_loop()
+        self.db_executor = ThreadPoolExecutor(max_workers=1, initializer=self._open_db)
+        await loop.run_in_executor(self.db_executor, lambda: None)
+        # Logins use the pooled connections, so they run on the default executor and never
+        # wait behind saves on the database thread
+        self.auth = AuthSystem(self.db_path)
+        # Worker processes are spawned rather than forked from a process that already runs threads
+        self.pool = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker,
+            initargs=(self.db_path if self.use_cache else None, self.tokenizer, self.extraction_limits)
+        )
+        # Start every worker before accepting uploads so the first requests do not pay for the spawn
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)))
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_BYTES)
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.pool.shutdown(cancel_futures=True)
+        self.db_executor.submit(self.parser.release_db).result()
+        self.db_executor.shutdown()
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            future, user_id, filename, pdf_bytes = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.pool, _analyze_upload, pdf_bytes)
+                if result is not None:
+                    result["resume_id"], result["near_duplicate_of"] = await loop.run_in_executor(
+                        self.db_executor, self._save, user_id, filename, result)
+                    self.stats["completed"] += 1
+                else:
+                    self.stats["failed"] += 1
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                self.stats["failed"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    def _save(self, user_id, filename, result):
+        cache = self.parser.parse_cache
+        if result["cache_hit"]:
+            cache.touch(result["cache_key"])
+        elif self.use_cache and cacheable(result):
+            cache.put(result["cache_key"], result["text"], result["parsed_data"])
+        writer = self.parser.writer
+        writer.add(user_id, filename, result["ats_score"], result["parsed_data"], result["text"],
+                   parse_version=result["parse_version"])
+        resume_id = writer.flush()[0]
+        return resume_id, writer.duplicates.pop(resume_id, None)
+
+    def _authenticate(self, headers):
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "basic":
+            return None
+        try:
+            email, _, password = base64.b64decode(credentials).decode("utf-8").partition(":")
+        except (ValueError, UnicodeDecodeError):
+            return None
+        return self.auth.authenticate_user(email, password)
+
+    async def _analyze(self, headers, query, body):
+        loop = asyncio.get_running_loop()
+        user = await loop.run_in_executor(None, self._authenticate, headers)
+        if user is None:
+            raise HTTPError(401, "Valid email and password required (HTTP Basic)",
+                            {"WWW-Authenticate": 'Basic realm="resume-analyzer"'})
+        if not body.startswith(b"%PDF"):
+            raise HTTPError(415, "Send the PDF file itself as the request body")
+        filename = os.path.basename(query.get("filename", ["upload.pdf"])[0]) or "upload.pdf"
+
+        future = loop.create_future()
+        try:
+            self.queue.put_nowait((future, user[0], filename, body))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise HTTPError(503, "Analysis queue is full, retry later", {"Retry-After": "1"})
+        self.stats["accepted"] += 1
+        result = await future
+        if result is None:
+            raise HTTPError(422, "No text could be extracted from the PDF")
+        return {
+            "resume_id": result["resume_id"],
+            "filename": filename,
+            "ats_score": result["ats_score"],
+            **parsed_to_dicts(result["parsed_data"]),
+            "cache_hit": result["cache_hit"],
+            "near_duplicate_of": result["near_duplicate_of"],
+        }
+
+    async def _dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        if url.path == "/analyze":
+            if method != "POST":
+                raise HTTPError(405, "Use POST", {"Allow": "POST"})
+            return await self._analyze(headers, parse_qs(url.query), body)
+        if url.path == "/health":
+            return {"status": "ok", "workers": self.workers, "queued": self.queue.qsize(),
+                    "queue_size": self.queue_size, **self.stats}
+        raise HTTPError(404, f"No route for {url.path}")
+
+    async def _read_request(self, reader):
+        """Return (method, target, headers, body), or None when the client closed the connection"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(400, "Request headers too large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_upload_bytes:
+            raise HTTPError(413, f"Uploads are limited to {self.max_upload_bytes} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method, target, headers, body
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload, extra = 200, await self._dispatch(method, target, headers, body), {}
+                except HTTPError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, e.headers
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    print(f"Error handling request: {e}")
+                    status, payload, extra = 500, {"error": "Internal error"}, {}
+                data = json.dumps(payload).encode("utf-8")
+                head = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json",
+                        f"Content-Length: {len(data)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                head += [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def serve(service, host, port):
+    server = await service.start(host, port)
+    print(f"Resume analysis service listening on http://{host}:{port} with {service.workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Serve resume analysis over HTTP on localhost")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8080)
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--workers", type=int, default=None, help="analysis processes (default: CPU count)")
+    arg_parser.add_argument("--queue-size", type=int, default=32, help="uploads allowed to wait for a worker")
+    arg_parser.add_argument("--max-upload-mb", type=float, default=10, help="largest accepted PDF")
+    arg_parser.add_argument("--tokenizer", choices=sorted(TOKENIZERS), default="regex")
+    arg_parser.add_argument("--max-pages", type=int, default=DEFAULT_LIMITS.max_pages)
+    arg_parser.add_argument("--max-chars", type=int, default=DEFAULT_LIMITS.max_chars)
+    arg_parser.add_argument("--timeout", type=float, default=DEFAULT_LIMITS.timeout)
+    arg_parser.add_argument("--no-cache", action="store_true", help="always re-parse, ignoring the parse cache")
+    args = arg_parser.parse_args(argv)
+
+    service = AnalysisService(
+        db_path=args.db,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        max_upload_bytes=int(args.max_upload_mb * 1024 * 1024),
+        tokenizer=args.tokenizer,
+        extraction_limits=ExtractionLimits(args.max_pages, args.max_chars, args.timeout),
+        use_cache=not args.no_cache
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
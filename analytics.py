@@ -0,0 +1,198 @@
+import argparse
+import sqlite3
+
+# Scores are counted in buckets of ten points; bucket 9 also holds perfect scores
+SCORE_BUCKETS = 10
+# Highest education level found in a resume, stored by index
+EDUCATION_LEVELS = ("None", "Unspecified", "Associate", "Bachelor", "Master", "Doctorate")
+# Keeps the IN lists well under SQLite's bound parameter limit
+ID_CHUNK = 500
+
+# Summary tables kept in step with resume_scores, skills and education by every save and re-score.
+# Their size depends on the number of months, users and distinct skills, never on the number of resumes.
+CREATE_ANALYTICS_TABLES_SQL = [
+    # month is the UTC month the resume was saved in ("2024-05"), taken from parsed_date
+    '''CREATE TABLE IF NOT EXISTS analytics_skills (
+        month TEXT,
+        skill_name TEXT,
+        category TEXT,
+        resumes INTEGER,
+        PRIMARY KEY (month, skill_name)
+    ) WITHOUT ROWID''',
+    '''CREATE TABLE IF NOT EXISTS analytics_monthly_scores (
+        month TEXT,
+        bucket INTEGER,
+        resumes INTEGER,
+        score_sum REAL,
+        PRIMARY KEY (month, bucket)
+    ) WITHOUT ROWID''',
+    '''CREATE TABLE IF NOT EXISTS analytics_user_scores (
+        user_id INTEGER,
+        bucket INTEGER,
+        resumes INTEGER,
+        score_sum REAL,
+        PRIMARY KEY (user_id, bucket)
+    ) WITHOUT ROWID''',
+    '''CREATE TABLE IF NOT EXISTS analytics_education (
+        month TEXT,
+        level INTEGER,
+        resumes INTEGER,
+        PRIMARY KEY (month, level)
+    ) WITHOUT ROWID''',
+]
+
+ANALYTICS_TABLES = ("analytics_skills", "analytics_monthly_scores", "analytics_user_scores", "analytics_education")
+
+BUCKET_SQL = f"MIN(CAST(s.ats_score / 10 AS INTEGER), {SCORE_BUCKETS - 1})"
+LEVEL_SQL = """CASE
+    WHEN degree LIKE 'PhD%' OR degree LIKE 'Doctorate%' THEN 5
+    WHEN degree LIKE 'Master%' OR degree LIKE 'MS %' OR degree LIKE 'MA %' THEN 4
+    WHEN degree LIKE 'Bachelor%' OR degree LIKE 'BS %' OR degree LIKE 'BA %' THEN 3
+    WHEN degree LIKE 'Associate%' THEN 2
+    ELSE 1 END"""
+
+# Each statement adds sign (+1 or -1) times the contribution of the selected resumes;
+# {ids} is filled with "IN (?, ...)" for a set of resumes or "IS NOT NULL" for all of them
+UPDATE_SQL = [
+    """INSERT INTO analytics_skills (month, skill_name, category, resumes)
+       SELECT substr(s.parsed_date, 1, 7), k.skill_name, MAX(k.category), ? * COUNT(DISTINCT k.resume_id)
+       FROM skills k JOIN resume_scores s ON s.id = k.resume_id
+       WHERE k.resume_id {ids} GROUP BY 1, 2
+       ON CONFLICT (month, skill_name) DO UPDATE
+       SET resumes = resumes + excluded.resumes, category = excluded.category""",
+    f"""INSERT INTO analytics_monthly_scores (month, bucket, resumes, score_sum)
+       SELECT substr(s.parsed_date, 1, 7), {BUCKET_SQL}, ? * COUNT(*), ? * SUM(s.ats_score)
+       FROM resume_scores s WHERE s.id {{ids}} AND s.ats_score IS NOT NULL GROUP BY 1, 2
+       ON CONFLICT (month, bucket) DO UPDATE
+       SET resumes = resumes + excluded.resumes, score_sum = score_sum + excluded.score_sum""",
+    f"""INSERT INTO analytics_user_scores (user_id, bucket, resumes, score_sum)
+       SELECT s.user_id, {BUCKET_SQL}, ? * COUNT(*), ? * SUM(s.ats_score)
+       FROM resume_scores s WHERE s.id {{ids}} AND s.ats_score IS NOT NULL AND s.user_id IS NOT NULL
+       GROUP BY 1, 2
+       ON CONFLICT (user_id, bucket) DO UPDATE
+       SET resumes = resumes + excluded.resumes, score_sum = score_sum + excluded.score_sum""",
+    f"""INSERT INTO analytics_education (month, level, resumes)
+       SELECT substr(s.parsed_date, 1, 7), COALESCE(e.level, 0), ? * COUNT(*)
+       FROM resume_scores s LEFT JOIN (
+           SELECT resume_id, MAX({LEVEL_SQL}) AS level FROM education
+           WHERE resume_id {{ids}} GROUP BY resume_id
+       ) e ON e.resume_id = s.id
+       WHERE s.id {{ids}} GROUP BY 1, 2
+       ON CONFLICT (month, level) DO UPDATE SET resumes = resumes + excluded.resumes""",
+]
+# Number of sign parameters and of id lists in each statement of UPDATE_SQL
+UPDATE_PARAMS = [(1, 1), (2, 1), (2, 1), (1, 2)]
+
+def _update(conn, resume_ids, sign):
+    resume_ids = list(resume_ids)
+    for start in range(0, len(resume_ids), ID_CHUNK):
+        chunk = resume_ids[start:start + ID_CHUNK]
+        ids = f"IN ({', '.join('?' * len(chunk))})"
+        for sql, (signs, id_lists) in zip(UPDATE_SQL, UPDATE_PARAMS):
+            conn.execute(sql.format(ids=ids), [sign] * signs + chunk * id_lists)
+
+def add(conn, resume_ids):
+    """Count freshly written resumes into the summary tables; runs in the caller's transaction"""
+    _update(conn, resume_ids, 1)
+
+def remove(conn, resume_ids):
+    """Take resumes out of the summary tables, e.g. before their score or skills are rewritten"""
+    _update(conn, resume_ids, -1)
+    for table in ANALYTICS_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE resumes <= 0")
+
+def rebuild(conn):
+    """Recompute every summary table from the stored results; the caller commits"""
+    for table in ANALYTICS_TABLES:
+        conn.execute(f"DELETE FROM {table}")
+    for sql, (signs, _) in zip(UPDATE_SQL, UPDATE_PARAMS):
+        conn.execute(sql.format(ids="IS NOT NULL"), [1] * signs)
+
+def months(conn):
+    return [row[0] for row in conn.execute("SELECT DISTINCT month FROM analytics_monthly_scores ORDER BY month")]
+
+def top_skills(conn, month=None, category=None, limit=10):
+    """Return [(skill_name, category, resumes)] for one month ("2024-05") or all time, most common first"""
+    conditions, params = [], []
+    if month is not None:
+        conditions.append("month = ?")
+        params.append(month)
+    if category is not None:
+        conditions.append("category = ?")
+        params.append(category)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return conn.execute(
+        f"""SELECT skill_name, MAX(category), SUM(resumes) FROM analytics_skills{where}
+            GROUP BY skill_name ORDER BY 3 DESC, skill_name LIMIT ?""",
+        params + [limit]
+    ).fetchall()
+
+def score_distribution(conn, user_id=None, month=None):
+    """Return {"buckets": [resumes per 10-point bucket], "resumes": n, "average": score or None}.
+
+    Distributions are kept per user (all time) and per month (all users), not per user and month.
+    """
+    if user_id is not None and month is not None:
+        raise ValueError("Score distributions are kept per user or per month, not both")
+    if user_id is not None:
+        rows = conn.execute(
+            "SELECT bucket, resumes, score_sum FROM analytics_user_scores WHERE user_id = ?", (user_id,))
+    elif month is not None:
+        rows = conn.execute(
+            "SELECT bucket, resumes, score_sum FROM analytics_monthly_scores WHERE month = ?", (month,))
+    else:
+        rows = conn.execute(
+            "SELECT bucket, SUM(resumes), SUM(score_sum) FROM analytics_monthly_scores GROUP BY bucket")
+    buckets = [0] * SCORE_BUCKETS
+    total = 0.0
+    for bucket, resumes, score_sum in rows:
+        buckets[bucket] = resumes
+        total += score_sum
+    count = sum(buckets)
+    return {"buckets": buckets, "resumes": count, "average": total / count if count else None}
+
+def education_breakdown(conn, month=None):
+    """Return {level: resumes} over EDUCATION_LEVELS, counting each resume at its highest degree"""
+    sql = "SELECT level, SUM(resumes) FROM analytics_education"
+    params = []
+    if month is not None:
+        sql += " WHERE month = ?"
+        params.append(month)
+    counts = dict(conn.execute(sql + " GROUP BY level", params).fetchall())
+    return {name: counts.get(level, 0) for level, name in enumerate(EDUCATION_LEVELS)}
+
+def main(argv=None):
+    from new_parser import DB_PATH
+    arg_parser = argparse.ArgumentParser(description="Show corpus-wide skill, score and education statistics")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--month", default=None, help="limit to one month, e.g. 2024-05")
+    arg_parser.add_argument("--user-id", type=int, default=None, help="show this user's score distribution")
+    arg_parser.add_argument("--category", choices=["Technical", "Soft", "Domain"], default=None)
+    arg_parser.add_argument("--top", type=int, default=10, help="number of skills to list")
+    arg_parser.add_argument("--rebuild", action="store_true", help="recompute the summary tables from stored results")
+    args = arg_parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.rebuild:
+            with conn:
+                rebuild(conn)
+        period = args.month or "all time"
+        print(f"Top skills ({period}):")
+        for skill_name, category, resumes in top_skills(conn, args.month, args.category, args.top):
+            print(f"  {skill_name:<20} {category:<10} {resumes}")
+        # A user's distribution covers all time
+        scores = score_distribution(conn, args.user_id, args.month if args.user_id is None else None)
+        who = f"user {args.user_id}" if args.user_id is not None else period
+        average = f"{scores['average']:.1f}" if scores["average"] is not None else "-"
+        print(f"ATS scores ({who}): {scores['resumes']} resumes, average {average}")
+        for bucket, resumes in enumerate(scores["buckets"]):
+            print(f"  {bucket * 10:>3}-{bucket * 10 + 9 if bucket < SCORE_BUCKETS - 1 else 100:<3} {resumes}")
+        print(f"Highest education ({period}):")
+        for level, resumes in education_breakdown(conn, args.month).items():
+            print(f"  {level:<12} {resumes}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
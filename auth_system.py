@@ -1,71 +1,155 @@
-import sqlite3
 import hashlib
-import customtkinter as ctk
-from tkinter import messagebox
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import persistence
+
+# The GUI toolkits are imported by AuthUI, so AuthSystem can be used without them
+ctk = messagebox = None
+
+def _load_ui():
+    global ctk, messagebox
+    if ctk is None:
+        import customtkinter
+        from tkinter import messagebox as tk_messagebox
+        ctk, messagebox = customtkinter, tk_messagebox
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire after ttl seconds, holding at most max_entries"""
+
+    def __init__(self, max_entries=1024, ttl=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def discard_where(self, predicate):
+        """Drop every entry whose (key, value) matches predicate"""
+        with self.lock:
+            for key in [key for key, (_, value) in self.entries.items() if predicate(key, value)]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+# Constant statements so each pooled connection compiles them once and reuses them
+CREATE_USERS_SQL = '''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        age INTEGER,
+        email TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL
+    )
+'''
+INSERT_USER_SQL = "INSERT INTO users (name, age, email, password) VALUES (?, ?, ?, ?)"
+AUTHENTICATE_SQL = "SELECT * FROM users WHERE email=? AND password=?"
+USER_BY_ID_SQL = "SELECT * FROM users WHERE id=?"
+UPDATABLE_FIELDS = ("name", "age", "email", "password")
 
 class AuthSystem:
-    def __init__(self, db_path='resumes_analyzer_ATS.db'):
+    """User accounts backed by the shared connection pool of the analyzer database.
+
+    Users looked up by id and successful logins are cached for cache_ttl seconds;
+    registering or updating a user drops the entries that could be stale.
+    """
+
+    def __init__(self, db_path='resumes_analyzer_ATS.db', pool=None, cache_ttl=300.0, cache_size=1024):
         self.db_path = db_path
+        self.pool = pool or persistence.get_pool(db_path)
+        self.users = TTLCache(cache_size, cache_ttl)
+        # Keyed on (email, password hash), so a changed password never matches a cached login
+        self.logins = TTLCache(cache_size, cache_ttl)
         self.current_user = None
         self.initialize_database()
         
     def initialize_database(self):
         """Initialize the database with required tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create users table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                age INTEGER,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.pool.connection() as conn:
+            conn.execute(CREATE_USERS_SQL)
 
     def hash_password(self, password):
         return hashlib.sha256(password.encode()).hexdigest()
 
+    def invalidate(self, user_id=None, email=None):
+        if user_id is not None:
+            self.users.discard_where(lambda key, user: key == user_id)
+        self.logins.discard_where(
+            lambda key, user: (user_id is not None and user[0] == user_id) or (email is not None and key[0] == email))
+
     def register_user(self, name, age, email, password):
         hashed_password = self.hash_password(password)
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO users (name, age, email, password)
-                VALUES (?, ?, ?, ?)
-            ''', (name, age, email, hashed_password))
-            conn.commit()
+            with self.pool.connection() as conn:
+                conn.execute(INSERT_USER_SQL, (name, age, email, hashed_password))
+        except sqlite3.IntegrityError:
+            return False
+        self.invalidate(email=email)
+        return True
+
+    def update_user(self, user_id, **fields):
+        """Change any of name, age, email or password; returns False if the email is taken"""
+        unknown = set(fields) - set(UPDATABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot update user fields: {', '.join(sorted(unknown))}")
+        if not fields:
             return True
+        if "password" in fields:
+            fields["password"] = self.hash_password(fields["password"])
+        assignments = ", ".join(f"{field}=?" for field in fields)
+        try:
+            with self.pool.connection() as conn:
+                conn.execute(f"UPDATE users SET {assignments} WHERE id=?", (*fields.values(), user_id))
         except sqlite3.IntegrityError:
             return False
         finally:
-            conn.close()
+            self.invalidate(user_id=user_id, email=fields.get("email"))
+        return True
 
     def authenticate_user(self, email, password):
         hashed_password = self.hash_password(password)
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE email=? AND password=?", (email, hashed_password))
-        user = cursor.fetchone()
-        conn.close()
+        user = self.logins.get((email, hashed_password))
+        if user is None:
+            with self.pool.connection() as conn:
+                user = conn.execute(AUTHENTICATE_SQL, (email, hashed_password)).fetchone()
+            # Failed logins are not cached, so a user who registers can log in right away
+            if user is not None:
+                self.logins.put((email, hashed_password), user)
+                self.users.put(user[0], user)
         return user
 
     def get_user_by_id(self, user_id):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE id=?", (user_id,))
-        user = cursor.fetchone()
-        conn.close()
+        user = self.users.get(user_id)
+        if user is None:
+            with self.pool.connection() as conn:
+                user = conn.execute(USER_BY_ID_SQL, (user_id,)).fetchone()
+            if user is not None:
+                self.users.put(user_id, user)
         return user
 
 class AuthUI:
     def __init__(self, on_login_success=None):
+        _load_ui()
         self.auth_system = AuthSystem()
         self.on_login_success = on_login_success
         
@@ -0,0 +1,147 @@
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool, cpu_count
+from new_parser import DB_PATH, SCORING_VERSION, ResumeParser, cacheable
+from pdf_extraction import DEFAULT_LIMITS, ExtractionLimits
+from persistence import ResultWriter
+from text_tokenizers import TOKENIZERS
+
+# One parser per worker process, created by the pool initializer
+_worker_parser = None
+
+def _init_worker(db_path, tokenizer, extraction_limits, record_timings):
+    global _worker_parser
+    # With a db_path the worker can read the parse cache; only the writer stores into it
+    _worker_parser = ResumeParser(
+        db_path=db_path, headless=True, tokenizer=tokenizer, extraction_limits=extraction_limits,
+        record_timings=record_timings)
+
+def _analyze_file(pdf_path):
+    try:
+        return pdf_path, _worker_parser.analyze_pdf(pdf_path, store=False)
+    except OSError as e:
+        print(f"Error reading {pdf_path}: {e}")
+        return pdf_path, None
+    except Exception as e:
+        # A corrupt or unusual PDF counts as failed instead of aborting the batch
+        print(f"Error analyzing {pdf_path}: {e}")
+        return pdf_path, None
+
+def find_pdfs(directory, recursive=True):
+    """Return the sorted paths of every PDF under directory"""
+    pdf_paths = []
+    if recursive:
+        for root, _, files in os.walk(directory):
+            pdf_paths.extend(os.path.join(root, name) for name in files if name.lower().endswith('.pdf'))
+    else:
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.lower().endswith('.pdf'):
+                pdf_paths.append(entry.path)
+    return sorted(pdf_paths)
+
+class BatchAnalyzer:
+    """Analyzes many PDFs across a process pool and funnels results into a single database writer"""
+
+    def __init__(self, user_id=None, db_path=DB_PATH, workers=None, commit_every=100, chunksize=4, use_cache=True,
+                 tokenizer="regex", extraction_limits=DEFAULT_LIMITS, record_timings=False):
+        self.user_id = user_id
+        self.db_path = db_path
+        self.use_cache = use_cache
+        self.tokenizer = tokenizer
+        self.extraction_limits = extraction_limits
+        self.record_timings = record_timings
+        self.workers = workers or cpu_count()
+        self.commit_every = commit_every
+        self.chunksize = chunksize
+
+    def run(self, pdf_paths):
+        parser = ResumeParser(user_id=self.user_id, db_path=self.db_path, headless=True)
+        cache = parser.parse_cache
+        writer = ResultWriter(parser.conn, batch_size=self.commit_every, scoring_version=SCORING_VERSION)
+        stats = {
+            "files": len(pdf_paths), "saved": 0, "failed": 0, "cache_hits": 0, "near_duplicates": 0,
+            "elapsed": 0.0, "files_per_sec": 0.0
+        }
+        start = time.perf_counter()
+        try:
+            worker_args = (
+                self.db_path if self.use_cache else None, self.tokenizer,
+                self.extraction_limits, self.record_timings
+            )
+            with Pool(self.workers, initializer=_init_worker, initargs=worker_args) as pool:
+                results = pool.imap_unordered(_analyze_file, pdf_paths, chunksize=self.chunksize)
+                for pdf_path, result in results:
+                    if result is None:
+                        stats["failed"] += 1
+                        continue
+                    if result["cache_hit"]:
+                        stats["cache_hits"] += 1
+                        cache.touch(result["cache_key"])
+                    elif self.use_cache and cacheable(result):
+                        cache.put(result["cache_key"], result["text"], result["parsed_data"])
+                    stats["saved"] += len(writer.add(
+                        self.user_id, os.path.basename(pdf_path), result["ats_score"],
+                        result["parsed_data"], result["text"], result["metrics"], result["parse_version"]
+                    ))
+            stats["saved"] += len(writer.flush())
+            stats["near_duplicates"] = len(writer.duplicates)
+        finally:
+            parser.release_db()
+        stats["elapsed"] = time.perf_counter() - start
+        if stats["elapsed"] > 0:
+            stats["files_per_sec"] = stats["files"] / stats["elapsed"]
+        return stats
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Analyze a directory of resume PDFs without the GUI")
+    arg_parser.add_argument("directory", help="directory containing resume PDFs")
+    arg_parser.add_argument("--user-id", type=int, required=True, help="user the results are saved under")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    arg_parser.add_argument("--commit-every", type=int, default=100, help="resumes written per transaction")
+    arg_parser.add_argument("--chunksize", type=int, default=4, help="files handed to a worker at a time")
+    arg_parser.add_argument("--tokenizer", choices=sorted(TOKENIZERS), default="regex",
+                            help="tokenizer used for skill matching (default: regex)")
+    arg_parser.add_argument("--max-pages", type=int, default=DEFAULT_LIMITS.max_pages,
+                            help="pages extracted per PDF")
+    arg_parser.add_argument("--max-chars", type=int, default=DEFAULT_LIMITS.max_chars,
+                            help="characters extracted per PDF")
+    arg_parser.add_argument("--timeout", type=float, default=DEFAULT_LIMITS.timeout,
+                            help="seconds allowed for extracting one PDF")
+    arg_parser.add_argument("--record-timings", action="store_true",
+                            help="store per-stage timings in resume_timings (see instrumentation.py)")
+    arg_parser.add_argument("--no-cache", action="store_true", help="always re-parse, ignoring the parse cache")
+    arg_parser.add_argument("--no-recursive", action="store_true", help="do not descend into subdirectories")
+    args = arg_parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"Not a directory: {args.directory}")
+        return 1
+
+    pdf_paths = find_pdfs(args.directory, recursive=not args.no_recursive)
+    if not pdf_paths:
+        print("No PDF files found")
+        return 0
+
+    analyzer = BatchAnalyzer(
+        user_id=args.user_id,
+        db_path=args.db,
+        workers=args.workers,
+        commit_every=args.commit_every,
+        chunksize=args.chunksize,
+        use_cache=not args.no_cache,
+        tokenizer=args.tokenizer,
+        extraction_limits=ExtractionLimits(args.max_pages, args.max_chars, args.timeout),
+        record_timings=args.record_timings
+    )
+    print(f"Analyzing {len(pdf_paths)} PDFs with {analyzer.workers} workers")
+    stats = analyzer.run(pdf_paths)
+    print(f"Saved: {stats['saved']}, Failed: {stats['failed']}, Cache hits: {stats['cache_hits']}, "
+          f"Near-duplicates: {stats['near_duplicates']}")
+    print(f"Elapsed: {stats['elapsed']:.2f}s ({stats['files_per_sec']:.1f} files/sec)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Compare the analytics summary queries with GROUP BYs over the full result tables as the corpus grows.
+
+Resumes with generated skills, degrees and scores are saved through ResultWriter, which keeps
+the summary tables up to date. Each size also checks that the incrementally maintained tables
+match a full rebuild, and reports how long that rebuild (the backfill for old data) takes.
+Run from the repository root:
+    python benchmarks/bench_analytics.py --sizes 10000,50000,200000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+import persistence
+from result_records import Education, Skill
+from skill_taxonomy import get_taxonomy
+
+DEGREES = ["", "Bachelor of Science", "BS in Data Science", "Master of Science", "PhD in Computer Science",
+           "Associate of Arts"]
+MONTH = time.strftime("%Y-%m", time.gmtime())
+
+# The same answers computed directly from the result tables
+RAW_QUERIES = {
+    "top skills (month)": (
+        """SELECT k.skill_name, COUNT(DISTINCT k.resume_id) AS resumes FROM skills k
+           JOIN resume_scores s ON s.id = k.resume_id WHERE substr(s.parsed_date, 1, 7) = ?
+           GROUP BY k.skill_name ORDER BY resumes DESC LIMIT 10""",
+        (MONTH,)),
+    "score distribution (user)": (
+        """SELECT MIN(CAST(ats_score / 10 AS INTEGER), 9), COUNT(*), AVG(ats_score) FROM resume_scores
+           WHERE user_id = ? GROUP BY 1""",
+        (7,)),
+    "score distribution (all)": (
+        "SELECT MIN(CAST(ats_score / 10 AS INTEGER), 9), COUNT(*), AVG(ats_score) FROM resume_scores GROUP BY 1",
+        ()),
+    "education breakdown": (
+        f"""SELECT COALESCE(e.level, 0), COUNT(*) FROM resume_scores s LEFT JOIN (
+               SELECT resume_id, MAX({analytics.LEVEL_SQL}) AS level FROM education GROUP BY resume_id
+           ) e ON e.resume_id = s.id GROUP BY 1""",
+        ()),
+}
+SUMMARY_QUERIES = {
+    "top skills (month)": lambda conn: analytics.top_skills(conn, MONTH),
+    "score distribution (user)": lambda conn: analytics.score_distribution(conn, user_id=7),
+    "score distribution (all)": lambda conn: analytics.score_distribution(conn),
+    "education breakdown": lambda conn: analytics.education_breakdown(conn),
+}
+
+def generate_parsed(rng, skills):
+    parsed = {"skills": [], "education": [], "experience": []}
+    for name, category, _ in rng.sample(skills, rng.randrange(3, 15)):
+        parsed["skills"].append(Skill(name, category))
+    for _ in range(rng.randrange(0, 3)):
+        parsed["education"].append(Education("University of Toronto", rng.choice(DEGREES)))
+    return parsed
+
+def snapshot(conn):
+    # Score sums are rounded because adding in a different order changes the last bits
+    return {
+        table: [tuple(round(value, 6) if isinstance(value, float) else value for value in row)
+                for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2")]
+        for table in analytics.ANALYTICS_TABLES
+    }
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default="10000,50000,200000", help="comma separated corpus sizes")
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    args = arg_parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    rng = random.Random(42)
+    skills = get_taxonomy().skills
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = persistence.connect(os.path.join(tmp, "bench.db"))
+        persistence.create_schema(conn)
+        persistence.migrate(conn)
+        writer = persistence.ResultWriter(conn, batch_size=1000)
+        saved = 0
+        print(f"{'resumes':>8} {'query':<26} {'summary ms':>11} {'group by ms':>12}")
+        for size in sizes:
+            for index in range(saved, size):
+                writer.add(1 + index % 50, f"resume_{index}.pdf", rng.uniform(0, 100),
+                           generate_parsed(rng, skills), "")
+            writer.flush()
+            saved = size
+            for name, (sql, params) in RAW_QUERIES.items():
+                summary_ms = median_ms(lambda: SUMMARY_QUERIES[name](conn), args.repeat)
+                raw_ms = median_ms(lambda: conn.execute(sql, params).fetchall(), args.repeat)
+                print(f"{size:>8} {name:<26} {summary_ms:>11.3f} {raw_ms:>12.2f}")
+            incremental = snapshot(conn)
+            start = time.perf_counter()
+            with conn:
+                analytics.rebuild(conn)
+            rebuild_seconds = time.perf_counter() - start
+            status = "match" if snapshot(conn) == incremental else "MISMATCH"
+            print(f"{size:>8} full rebuild {rebuild_seconds:.2f}s, incremental tables {status}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure concurrent login throughput: a connection per call versus the pooled, cached AuthSystem.
+
+Run from the repository root:
+    python benchmarks/bench_auth.py --threads 16 --logins 5000 --users 200
+"""
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth_system import AuthSystem
+from instrumentation import percentile
+from persistence import ConnectionPool
+
+def legacy_authenticate(db_path, email, password):
+    hashed_password = hashlib.sha256(password.encode()).hexdigest()
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM users WHERE email=? AND password=?", (email, hashed_password))
+    user = cursor.fetchone()
+    conn.close()
+    return user
+
+def run(login, users, threads, logins):
+    latencies = []
+    lock = threading.Lock()
+
+    def client(seed, count):
+        rng = random.Random(seed)
+        local = []
+        for _ in range(count):
+            email, password = rng.choice(users)
+            start = time.perf_counter()
+            if login(email, password) is None:
+                raise RuntimeError(f"login failed for {email}")
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=client, args=(seed, logins // threads)) for seed in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, percentile(latencies, 0.50) * 1000, percentile(latencies, 0.99) * 1000
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--threads", type=int, default=16)
+    arg_parser.add_argument("--logins", type=int, default=5000)
+    arg_parser.add_argument("--users", type=int, default=200)
+    arg_parser.add_argument("--pool-size", type=int, default=8)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        setup = AuthSystem(db_path, pool=ConnectionPool(db_path, args.pool_size))
+        users = [(f"user{i}@example.com", f"password{i}") for i in range(args.users)]
+        for i, (email, password) in enumerate(users):
+            setup.register_user(f"User {i}", 30, email, password)
+
+        pooled = AuthSystem(db_path, pool=ConnectionPool(db_path, args.pool_size), cache_ttl=0)
+        cached = AuthSystem(db_path, pool=ConnectionPool(db_path, args.pool_size))
+        print(f"{args.threads} threads, {args.logins} logins over {args.users} users")
+        print(f"{'mode':<22} {'logins/sec':>11} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, login in [
+            ("connect per call", lambda email, password: legacy_authenticate(db_path, email, password)),
+            ("pooled", pooled.authenticate_user),
+            ("pooled + cache", cached.authenticate_user),
+        ]:
+            rate, p50, p99 = run(login, users, args.threads, args.logins)
+            print(f"{name:<22} {rate:>11.0f} {p50:>8.3f} {p99:>8.3f}")
+        for auth in (setup, pooled, cached):
+            auth.pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure streaming export throughput and memory against loading a naive join into memory.
+
+Builds a database of generated results (100k resumes are about 1.1M rows across resume_scores,
+resumes, skills and education), then exports it to JSONL and CSV with export_results and
+with a single joined query read by fetchall. Peak memory is the process's max RSS after each step.
+Run from the repository root:
+    python benchmarks/bench_export.py --resumes 100000
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import persistence
+from bench_analytics import generate_parsed
+from export_results import iter_results, write_csv, write_jsonl
+from skill_taxonomy import get_taxonomy
+
+NAIVE_SQL = """SELECT s.id, s.user_id, s.filename, s.ats_score, s.parsed_date,
+                      k.skill_name, k.category, e.institution, e.degree
+               FROM resume_scores s
+               LEFT JOIN skills k ON k.resume_id = s.id
+               LEFT JOIN education e ON e.resume_id = s.id
+               ORDER BY s.id"""
+
+def naive_export(conn, file):
+    rows = conn.execute(NAIVE_SQL).fetchall()
+    records = {}
+    for resume_id, user_id, filename, ats_score, parsed_date, skill_name, category, institution, degree in rows:
+        record = records.setdefault(resume_id, {
+            "resume_id": resume_id, "user_id": user_id, "filename": filename, "ats_score": ats_score,
+            "parsed_date": parsed_date, "skills": {}, "education": {}
+        })
+        if skill_name is not None:
+            record["skills"][skill_name] = category
+        if institution is not None:
+            record["education"][(institution, degree)] = None
+    for record in records.values():
+        record["skills"] = [{"name": name, "category": category} for name, category in record["skills"].items()]
+        record["education"] = [{"institution": institution, "degree": degree}
+                               for institution, degree in record["education"]]
+        file.write(json.dumps(record) + "\n")
+    return len(records)
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--resumes", type=int, default=100000)
+    args = arg_parser.parse_args()
+    rng = random.Random(42)
+    skills = get_taxonomy().skills
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = persistence.connect(os.path.join(tmp, "bench.db"))
+        persistence.create_schema(conn)
+        persistence.migrate(conn)
+        writer = persistence.ResultWriter(conn, batch_size=1000)
+        for index in range(args.resumes):
+            writer.add(1 + index % 50, f"resume_{index}.pdf", rng.uniform(0, 100), generate_parsed(rng, skills), "")
+        writer.flush()
+        total_rows = sum(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                         for table in ("resume_scores", "resumes", "skills", "education"))
+        print(f"{args.resumes} resumes, {total_rows} rows; max RSS before exporting {max_rss_mb():.0f} MiB")
+        print(f"{'export':<22} {'results':>8} {'seconds':>8} {'results/s':>10} {'max RSS MiB':>12}")
+
+        steps = [
+            ("streaming jsonl", lambda file: write_jsonl(iter_results(conn), file)),
+            ("streaming csv", lambda file: write_csv(iter_results(conn), file)),
+            ("streaming jsonl user", lambda file: write_jsonl(iter_results(conn, user_id=7, min_score=50), file)),
+            # Last, since max RSS never goes back down
+            ("naive join", lambda file: naive_export(conn, file)),
+        ]
+        for label, export in steps:
+            with open(os.devnull, "w", newline="") as file:
+                start = time.perf_counter()
+                count = export(file)
+                elapsed = time.perf_counter() - start
+            print(f"{label:<22} {count:>8} {elapsed:>8.2f} {count / elapsed:>10.0f} {max_rss_mb():>12.0f}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure history page latency for a user with many saved analyses: keyset pages against OFFSET pages.
+
+Run from the repository root:
+    python benchmarks/bench_history.py --resumes 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import persistence
+from bench_analytics import generate_parsed
+from resume_history import PAGE_SIZE, history_count, history_page, load_details
+from skill_taxonomy import get_taxonomy
+
+OFFSET_SQL = """SELECT s.id, s.filename, s.ats_score, s.parsed_date,
+        r.skills_count, r.education_count, r.experience_count
+    FROM resume_scores s LEFT JOIN resumes r ON r.resume_score_id = s.id
+    WHERE s.user_id = ? ORDER BY s.id DESC LIMIT ? OFFSET ?"""
+
+def median_ms(function, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--resumes", type=int, default=100000, help="analyses saved for the measured user")
+    args = arg_parser.parse_args()
+    rng = random.Random(42)
+    skills = get_taxonomy().skills
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = persistence.connect(os.path.join(tmp, "bench.db"))
+        persistence.create_schema(conn)
+        persistence.migrate(conn)
+        writer = persistence.ResultWriter(conn, batch_size=1000)
+        # Every other result belongs to other users, as in a shared database
+        for index in range(args.resumes * 2):
+            user_id = 1 if index % 2 else 2 + index % 40
+            writer.add(user_id, f"resume_{index}.pdf", rng.uniform(0, 100), generate_parsed(rng, skills), "")
+        writer.flush()
+
+        print(f"count: {median_ms(lambda: history_count(conn, 1)):.3f} ms for {history_count(conn, 1)} analyses")
+        print(f"{'page':>6} {'keyset ms':>10} {'offset ms':>10}")
+        pages = args.resumes // PAGE_SIZE
+        # Ids at each page boundary, as the view has them after scrolling that far
+        boundaries = {}
+        last_id = None
+        for page in range(pages):
+            if page in (0, 9, 99, pages // 2, pages - 1):
+                boundaries[page] = last_id
+            last_id = history_page(conn, 1, last_id)[-1][0]
+        for page, before in sorted(boundaries.items()):
+            keyset_ms = median_ms(lambda: history_page(conn, 1, before))
+            offset_ms = median_ms(lambda: conn.execute(OFFSET_SQL, (1, PAGE_SIZE, page * PAGE_SIZE)).fetchall())
+            print(f"{page + 1:>6} {keyset_ms:>10.3f} {offset_ms:>10.3f}")
+        resume_id = history_page(conn, 1)[0][0]
+        print(f"details of one analysis: {median_ms(lambda: load_details(conn, resume_id)):.3f} ms")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
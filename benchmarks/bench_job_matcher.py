@@ -0,0 +1,70 @@
+"""Measure job-description ranking latency over a growing resume corpus.
+
+Resumes are saved through ResultWriter, which maintains the match index, then the
+JobMatcher is timed for its cold load, warm queries and an incremental refresh.
+Requires numpy and scipy. Run from the repository root:
+    python benchmarks/bench_job_matcher.py --documents 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import persistence
+from job_matcher import JobMatcher
+from synthetic_corpus import generate_corpus
+
+JOB_DESCRIPTION = (
+    "We are hiring a senior backend engineer with Python, Django, PostgreSQL and AWS experience. "
+    "Kubernetes and Docker are a plus; you will mentor engineers and improve latency and throughput."
+)
+
+EMPTY_PARSE = {"skills": [], "education": [], "experience": []}
+
+def save_corpus(conn, texts, batch_size=1000):
+    writer = persistence.ResultWriter(conn, batch_size=batch_size)
+    for index, text in enumerate(texts):
+        writer.add(1 + index % 50, f"resume_{index}.pdf", 50.0, EMPTY_PARSE, text)
+    writer.flush()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--documents", type=int, default=20000)
+    arg_parser.add_argument("--queries", type=int, default=20)
+    arg_parser.add_argument("--top", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = persistence.connect(os.path.join(tmp, "bench.db"))
+        persistence.create_schema(conn)
+        persistence.migrate(conn)
+
+        start = time.perf_counter()
+        save_corpus(conn, generate_corpus(args.documents, seed=1))
+        print(f"generated and saved {args.documents} resumes in {time.perf_counter() - start:.1f}s")
+
+        matcher = JobMatcher(conn)
+        start = time.perf_counter()
+        matcher.refresh()
+        print(f"cold load of the term matrix : {(time.perf_counter() - start) * 1000:8.1f} ms "
+              f"({matcher.matrix.nnz} non-zeros)")
+
+        timings = []
+        for _ in range(args.queries):
+            start = time.perf_counter()
+            matcher.rank(JOB_DESCRIPTION, args.top)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"warm query (median of {args.queries})  : {timings[len(timings) // 2] * 1000:8.1f} ms")
+
+        save_corpus(conn, generate_corpus(100, seed=2))
+        start = time.perf_counter()
+        matcher.rank(JOB_DESCRIPTION, args.top)
+        print(f"query after 100 new resumes  : {(time.perf_counter() - start) * 1000:8.1f} ms")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure near-duplicate detection: signing cost, LSH lookup latency versus a full scan, and accuracy.
+
+A synthetic corpus is saved with lightly edited copies of some resumes mixed in; every
+copy should be flagged as a duplicate of its original and nothing else should be.
+Run from the repository root:
+    python benchmarks/bench_near_duplicates.py --sizes 1000,5000,20000 --edit-fraction 0.05
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import persistence
+from near_duplicates import DuplicateIndex, signature, similarity
+from synthetic_corpus import generate_corpus
+
+EMPTY_PARSE = {"skills": [], "education": [], "experience": []}
+
+def edit(text, rng, fraction):
+    """Replace, drop or duplicate roughly fraction of the words"""
+    words = text.split(" ")
+    for _ in range(max(1, int(len(words) * fraction))):
+        index = rng.randrange(len(words))
+        action = rng.random()
+        if action < 0.4:
+            words[index] = rng.choice(words)
+        elif action < 0.7:
+            del words[index]
+        else:
+            words.insert(index, words[index])
+    return " ".join(words)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default="1000,5000,20000", help="comma separated corpus sizes")
+    arg_parser.add_argument("--duplicate-rate", type=float, default=0.1, help="share of resumes resubmitted edited")
+    arg_parser.add_argument("--edit-fraction", type=float, default=0.05, help="share of words changed per copy")
+    arg_parser.add_argument("--lookups", type=int, default=200)
+    args = arg_parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = persistence.connect(os.path.join(tmp, "bench.db"))
+        persistence.create_schema(conn)
+        persistence.migrate(conn)
+        writer = persistence.ResultWriter(conn, batch_size=1000)
+        texts, original_of = [], {}
+        print(f"{'resumes':>8} {'sign ms':>8} {'lsh ms':>8} {'scan ms':>9} {'recall':>7} {'precision':>10}")
+        for size in sizes:
+            for text in generate_corpus(size - len(texts), seed=size):
+                if texts and rng.random() < args.duplicate_rate:
+                    source = rng.randrange(len(texts))
+                    original_of[len(texts) + 1] = original_of.get(source + 1, source + 1)
+                    text = edit(texts[source], rng, args.edit_fraction)
+                texts.append(text)
+                writer.add(1, f"resume_{len(texts)}.pdf", 50.0, EMPTY_PARSE, text)
+            writer.flush()
+
+            sample = rng.sample(range(len(texts)), min(args.lookups, len(texts)))
+            start = time.perf_counter()
+            signatures = [signature(texts[index]) for index in sample]
+            sign_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+            index = DuplicateIndex(conn)
+            start = time.perf_counter()
+            for resume_index, sig in zip(sample, signatures):
+                index.find(sig, exclude=resume_index + 1)
+            lsh_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+            # Brute force: compare against every stored signature
+            stored = [(resume_id, blob) for resume_id, blob in
+                      conn.execute("SELECT resume_id, signature FROM resume_signatures")]
+            start = time.perf_counter()
+            for sig in signatures[:20]:
+                max(similarity(sig, memoryview(blob).cast('I')) for _, blob in stored)
+            scan_ms = (time.perf_counter() - start) / min(20, len(signatures)) * 1000
+
+            flagged = writer.duplicates
+            hits = sum(1 for resume_id, original in flagged.items() if original_of.get(resume_id) == original)
+            recall = hits / len(original_of) if original_of else 1.0
+            precision = hits / len(flagged) if flagged else 1.0
+            print(f"{size:>8} {sign_ms:>8.3f} {lsh_ms:>8.3f} {scan_ms:>9.2f} {recall:>7.3f} {precision:>10.3f}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
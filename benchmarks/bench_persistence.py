@@ -0,0 +1,193 @@
+"""Measure batch ingest write throughput: per-row inserts with a commit per resume versus ResultWriter.
+
+Every resume gets its own generated text. The base rows (resume_scores with the text inline,
+resumes, skills, education, experience) are written three ways doing the same work: the old
+per-row save with a commit per resume, the same with the WAL connection settings, and batched
+executemany with one commit per batch. ResultWriter also compresses the text into resume_texts
+and updates the search, term, near-duplicate and analytics indexes; each of those is timed on
+its own over the same batches, next to the full ResultWriter run.
+Run from the repository root:
+    python benchmarks/bench_persistence.py --resumes 2000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+import persistence
+from job_matcher import TermIndexer
+from near_duplicates import DuplicateIndex
+from result_records import Education, Experience, Skill
+from resume_search import INSERT_SEARCH_SQL
+from synthetic_corpus import generate_corpus
+from text_store import INSERT_TEXT_SQL, text_row
+
+def make_parsed_data(rng):
+    return {
+        "skills": [
+            Skill(f"Skill {rng.randrange(500)}", "Technical")
+            for _ in range(rng.randrange(5, 25))
+        ],
+        "education": [
+            Education("University of Somewhere", "Bachelor of Science", start_date="2015", end_date="2019", gpa=3.5)
+            for _ in range(rng.randrange(1, 3))
+        ],
+        "experience": [
+            Experience("Acme", "Software Engineer", start_date="2019", end_date="Present",
+                       responsibilities="Built things; " * 10)
+            for _ in range(rng.randrange(1, 5))
+        ]
+    }
+
+def legacy_save(conn, user_id, filename, ats_score, parsed_data, resume_text):
+    cursor = conn.cursor()
+    conn.execute("BEGIN TRANSACTION")
+    cursor.execute(
+        "INSERT INTO resume_scores (user_id, filename, ats_score, resume_text) VALUES (?, ?, ?, ?)",
+        (user_id, filename, ats_score, resume_text)
+    )
+    resume_id = cursor.lastrowid
+    cursor.execute(
+        """INSERT INTO resumes (user_id, resume_score_id, filename, skills_count, education_count, experience_count)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        (user_id, resume_id, filename, len(parsed_data["skills"]),
+         len(parsed_data["education"]), len(parsed_data["experience"]))
+    )
+    for skill in parsed_data["skills"]:
+        cursor.execute(
+            "INSERT INTO skills (resume_id, skill_name, category, relevance_score) VALUES (?, ?, ?, ?)",
+            (resume_id, skill.name, skill.category, skill.relevance_score)
+        )
+    for edu in parsed_data["education"]:
+        cursor.execute(
+            """INSERT INTO education (resume_id, institution, degree, field_of_study, start_date, end_date, gpa)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (resume_id, edu.institution, edu.degree, edu.field_of_study,
+             edu.start_date, edu.end_date, edu.gpa)
+        )
+    for exp in parsed_data["experience"]:
+        cursor.execute(
+            """INSERT INTO experience
+               (resume_id, company, position, location, start_date, end_date, description, responsibilities)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (resume_id, exp.company, exp.position, exp.location,
+             exp.start_date, exp.end_date, exp.description, exp.responsibilities)
+        )
+    conn.commit()
+
+def run_legacy(conn, resumes, texts):
+    persistence.create_schema(conn)
+    start = time.perf_counter()
+    for index, (parsed_data, resume_text) in enumerate(zip(resumes, texts)):
+        legacy_save(conn, 1, f"resume{index}.pdf", 50.0, parsed_data, resume_text)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+def save_base(conn, start_id, resumes, texts):
+    # ResultWriter's executemany inserts of the base rows, with the text kept inline as legacy_save does
+    score_rows, resume_rows, skill_rows, education_rows, experience_rows = [], [], [], [], []
+    for resume_id, (parsed_data, resume_text) in enumerate(zip(resumes, texts), start_id):
+        score_rows.append((resume_id, 1, f"resume{resume_id}.pdf", 50.0, resume_text))
+        resume_rows.append((1, resume_id, f"resume{resume_id}.pdf", len(parsed_data["skills"]),
+                            len(parsed_data["education"]), len(parsed_data["experience"])))
+        persistence.add_parsed_rows(resume_id, parsed_data, skill_rows, education_rows, experience_rows)
+    conn.executemany(
+        "INSERT INTO resume_scores (id, user_id, filename, ats_score, resume_text) VALUES (?, ?, ?, ?, ?)",
+        score_rows)
+    conn.executemany(
+        """INSERT INTO resumes (user_id, resume_score_id, filename, skills_count, education_count, experience_count)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        resume_rows)
+    conn.executemany(persistence.INSERT_SKILL_SQL, skill_rows)
+    conn.executemany(persistence.INSERT_EDUCATION_SQL, education_rows)
+    conn.executemany(persistence.INSERT_EXPERIENCE_SQL, experience_rows)
+
+def run_parts(db_path, resumes, texts, batch_size):
+    """Seconds for the batched base rows and for each ResultWriter add-on, each committed per batch"""
+    conn = persistence.connect(db_path)
+    persistence.create_schema(conn)
+    persistence.migrate(conn)
+    indexer = TermIndexer(conn)
+    dedup = DuplicateIndex(conn)
+    add_ons = {
+        "compressed text": lambda rows: conn.executemany(
+            INSERT_TEXT_SQL, [text_row(resume_id, text) for resume_id, text in rows]),
+        "search index": lambda rows: conn.executemany(INSERT_SEARCH_SQL, rows),
+        "term index": indexer.index,
+        "near duplicates": dedup.index,
+        "analytics": lambda rows: analytics.add(conn, [resume_id for resume_id, _ in rows]),
+    }
+    seconds = dict.fromkeys(["base rows"] + list(add_ons), 0.0)
+    for offset in range(0, len(resumes), batch_size):
+        batch_texts = texts[offset:offset + batch_size]
+        rows = list(enumerate(batch_texts, offset + 1))
+        start = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        save_base(conn, offset + 1, resumes[offset:offset + batch_size], batch_texts)
+        conn.commit()
+        seconds["base rows"] += time.perf_counter() - start
+        for name, add_on in add_ons.items():
+            start = time.perf_counter()
+            conn.execute("BEGIN IMMEDIATE")
+            add_on(rows)
+            conn.commit()
+            seconds[name] += time.perf_counter() - start
+    conn.close()
+    return seconds
+
+def run_writer(db_path, resumes, texts, batch_size):
+    conn = persistence.connect(db_path)
+    persistence.create_schema(conn)
+    persistence.migrate(conn)
+    writer = persistence.ResultWriter(conn, batch_size=batch_size)
+    start = time.perf_counter()
+    for index, (parsed_data, resume_text) in enumerate(zip(resumes, texts)):
+        writer.add(1, f"resume{index}.pdf", 50.0, parsed_data, resume_text)
+    writer.flush()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--resumes", type=int, default=2000)
+    arg_parser.add_argument("--batch-size", type=int, default=100)
+    arg_parser.add_argument("--pages", type=int, default=1)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(7)
+    resumes = [make_parsed_data(rng) for _ in range(args.resumes)]
+    texts = generate_corpus(args.resumes, args.pages)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = run_legacy(sqlite3.connect(os.path.join(tmp, "legacy.db")), resumes, texts)
+        legacy_wal = run_legacy(persistence.connect(os.path.join(tmp, "legacy_wal.db")), resumes, texts)
+        parts = run_parts(os.path.join(tmp, "parts.db"), resumes, texts, args.batch_size)
+        writer = run_writer(os.path.join(tmp, "writer.db"), resumes, texts, args.batch_size)
+
+    def line(label, seconds):
+        print(f"{label:<28} {seconds:8.3f}s {args.resumes / seconds:10.1f} resumes/sec "
+              f"{seconds / args.resumes * 1000:8.3f} ms/resume")
+
+    print(f"{args.resumes} resumes of {args.pages} page(s), batches of {args.batch_size}")
+    print("base rows only:")
+    line("  commit per resume", legacy)
+    line("  commit per resume (WAL)", legacy_wal)
+    line("  batched (WAL)", parts["base rows"])
+    print(f"  batched over commit per resume: {legacy / parts['base rows']:.1f}x, "
+          f"{legacy_wal / parts['base rows']:.1f}x over commit per resume with WAL")
+    print("ResultWriter add-ons, each timed alone:")
+    for name, seconds in parts.items():
+        if name != "base rows":
+            line(f"  {name}", seconds)
+    line("ResultWriter, everything", writer)
+
+if __name__ == "__main__":
+    main()
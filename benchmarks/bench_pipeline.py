@@ -0,0 +1,153 @@
+"""Time each stage of the ResumeParser pipeline over a synthetic corpus.
+
+Reports per-stage throughput and p50/p95/p99 latency, and can save the results as JSON
+so runs from different commits can be compared.
+Run from the repository root:
+    python benchmarks/bench_pipeline.py --count 200 --pages 2 --json results.json
+    python benchmarks/bench_pipeline.py --count 200 --pages 2 --compare results.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentation import percentile
+from new_parser import ResumeParser
+from section_segmenter import segment_sections
+from synthetic_corpus import generate_corpus, text_to_pdf
+
+STAGES = [
+    "extract_pdf", "tokenize", "extract_skills", "segment_sections",
+    "extract_education", "extract_experience", "calculate_ats_score", "save_results"
+]
+
+def summarize(timings):
+    summary = {}
+    for stage, values in timings.items():
+        if not values:
+            continue
+        values = sorted(values)
+        total = sum(values)
+        summary[stage] = {
+            "count": len(values),
+            "total_s": total,
+            "mean_ms": total / len(values) * 1000,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "docs_per_sec": len(values) / total if total else 0.0,
+        }
+    return summary
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(corpus, tokenizer, include_pdf):
+    timings = {stage: [] for stage in STAGES}
+    with tempfile.TemporaryDirectory() as tmp:
+        parser = ResumeParser(user_id=1, db_path=os.path.join(tmp, "bench.db"), headless=True, tokenizer=tokenizer)
+        for text in corpus:
+            if include_pdf:
+                pdf_bytes = text_to_pdf(text)
+                start = time.perf_counter()
+                parser.extract_pdf(io.BytesIO(pdf_bytes))
+                timings["extract_pdf"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            tokens = [word for word in parser.tokenizer.tokenize(text) if word not in parser.stop_words]
+            timings["tokenize"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            skills = parser.extract_skills(tokens)
+            timings["extract_skills"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            sections = segment_sections(text)
+            timings["segment_sections"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            education = parser.extract_education(text, sections)
+            timings["extract_education"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            experience = parser.extract_experience(text, sections)
+            timings["extract_experience"].append(time.perf_counter() - start)
+
+            parsed_data = {"skills": skills, "education": education, "experience": experience}
+            start = time.perf_counter()
+            ats_score = parser.calculate_ats_score(parsed_data)
+            timings["calculate_ats_score"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            parser.save_results("bench.pdf", ats_score, parsed_data, text)
+            timings["save_results"].append(time.perf_counter() - start)
+        parser.release_db()
+    return timings
+
+def print_summary(summary, previous=None):
+    header = f"{'stage':<22} {'docs/sec':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header + (f" {'p50 vs prev':>12}" if previous else ""))
+    for stage, row in summary.items():
+        line = (f"{stage:<22} {row['docs_per_sec']:>10.1f} {row['p50_ms']:>9.3f} "
+                f"{row['p95_ms']:>9.3f} {row['p99_ms']:>9.3f}")
+        if previous and stage in previous:
+            old = previous[stage]["p50_ms"]
+            line += f" {(row['p50_ms'] - old) / old * 100 if old else 0.0:>+11.1f}%"
+        print(line)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--count", type=int, default=200)
+    arg_parser.add_argument("--pages", type=int, default=1)
+    arg_parser.add_argument("--skill-density", type=float, default=0.05)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--tokenizer", default="regex")
+    arg_parser.add_argument("--no-pdf", action="store_true", help="skip the PDF extraction stage")
+    arg_parser.add_argument("--json", help="write results to this file")
+    arg_parser.add_argument("--compare", help="previous results file to compare p50 latency against")
+    args = arg_parser.parse_args()
+
+    include_pdf = not args.no_pdf
+    if include_pdf:
+        try:
+            import PyPDF2  # noqa: F401
+        except ImportError:
+            print("PyPDF2 is not installed, skipping the extract_pdf stage")
+            include_pdf = False
+
+    corpus = generate_corpus(args.count, args.pages, args.skill_density, args.seed)
+    summary = summarize(run(corpus, args.tokenizer, include_pdf))
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            previous = json.load(file)["stages"]
+    print(f"{args.count} documents, {args.pages} page(s), skill density {args.skill_density}")
+    print_summary(summary, previous)
+
+    if args.json:
+        results = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "config": vars(args),
+            "stages": summary,
+        }
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
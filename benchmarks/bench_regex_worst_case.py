@@ -0,0 +1,90 @@
+"""Fuzz the section, education and experience extraction with adversarial text and report time per KB.
+
+Each input is a generated resume with long runs of pattern fragments spliced in (whitespace,
+digits, month prefixes, bullets, keywords), like the garbage a broken PDF text layer produces,
+plus hand-written worst cases for each extraction pattern. Linear extraction keeps the worst
+ms/KB flat as inputs grow; a pattern that backtracks shows up as ms/KB growing with the size.
+Run from the repository root:
+    python benchmarks/bench_regex_worst_case.py --sizes 1,4,16,64 --cases 40
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from new_parser import ResumeParser
+from section_segmenter import segment_sections
+from synthetic_corpus import generate_corpus
+
+# Fragments the extraction patterns start on or repeat over
+FRAGMENTS = [
+    " ", "\t", "\n", "1", "12.", "2019 - ", "Jan", "mar", "Septem", "•", "* ", "- ", "at ", "for ", "with ",
+    "Senior ", "Software ", "Engineer ", "Project ", "University of ", "School of ", "GPA ", "3.5/", "BS ", "of ",
+    "Education", "Experience", ":", "a", "é",
+]
+
+def worst_cases(size):
+    """Hand-written inputs aimed at one pattern each, about size characters long"""
+    return {
+        "title whitespace": "Experience\nSoftware Engineer\n" + " " * size + "x",
+        "month letters": "Education\nUniversity of " + "mar" * (size // 3),
+        "gpa digits": "Education\nUniversity of Somewhere " + "1" * size,
+        "bullet digits": "Experience\nSoftware Engineer at Acme\n" + "1" * size,
+        "company words": "Experience\n" + "QA Engineer at " * (size // 15),
+        "heading spaces": "Skills" + " " * size + "x\n",
+        "degree spaces": "Education\n" + "BS" + " " * size + "of",
+    }
+
+def fuzz_case(rng, size, base_texts):
+    parts, length = [], 0
+    while length < size:
+        if rng.random() < 0.3:
+            text = rng.choice(base_texts)
+            start = rng.randrange(len(text))
+            part = text[start:start + rng.randrange(50, 1000)]
+        else:
+            # Runs are long enough to matter at every size
+            fragment = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randrange(1, 4)))
+            part = fragment * max(1, rng.randrange(size // 8 + 1) // len(fragment))
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)[:size]
+
+def extraction_seconds(parser, text):
+    start = time.perf_counter()
+    sections = segment_sections(text)
+    parser.extract_education(text, sections)
+    parser.extract_experience(text, sections)
+    return time.perf_counter() - start
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default="1,4,16,64", help="comma-separated input sizes in KB")
+    arg_parser.add_argument("--cases", type=int, default=40, help="fuzzed inputs per size")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    parser = ResumeParser(db_path=None, headless=True)
+    base_texts = generate_corpus(20)
+    typical = sum(extraction_seconds(parser, text) for text in base_texts) / sum(len(text) for text in base_texts)
+    print(f"generated resumes: {typical * 1024 * 1000:.3f} ms/KB")
+
+    names = list(worst_cases(1))
+    print(f"{'KB':>5} {'fuzz p50':>9} {'fuzz max':>9} " + " ".join(f"{name:>16}" for name in names) + "  (ms/KB)")
+    worst = {}
+    for size_kb in sizes:
+        size = size_kb * 1024
+        rng = random.Random(args.seed * 1000003 + size_kb)
+        fuzz = sorted(extraction_seconds(parser, fuzz_case(rng, size, base_texts)) / size_kb * 1000
+                      for _ in range(args.cases))
+        crafted = [extraction_seconds(parser, text) / size_kb * 1000 for text in worst_cases(size).values()]
+        worst[size_kb] = max(fuzz[-1], *crafted)
+        print(f"{size_kb:>5} {fuzz[len(fuzz) // 2]:>9.3f} {fuzz[-1]:>9.3f} "
+              + " ".join(f"{value:>16.3f}" for value in crafted))
+    print(f"worst ms/KB grew {worst[sizes[-1]] / worst[sizes[0]]:.1f}x from {sizes[0]} KB to {sizes[-1]} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Compare slotted result records with the per-entry dicts they replaced: memory, pickling and row building.
+
+Parses a generated corpus once, then holds the same parsed fields both as records and as
+dicts keyed by field name (the old format). Memory is what tracemalloc sees retained per
+resume for the entry objects and their lists; the strings are shared by both forms and not
+counted. Pickling is a batch worker's result list; the JSON sizes are the parse cache payload.
+Timings run with the garbage collector off, as timeit does; records are tracked by the collector
+where dicts of strings are not, so the full collections each form triggers while being unpickled
+are counted separately.
+Run from the repository root:
+    python benchmarks/bench_result_records.py --documents 2000
+"""
+import argparse
+import gc
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from new_parser import ResumeParser
+from result_records import RECORD_TYPES, ParsedResume, parsed_to_dicts
+from synthetic_corpus import generate_corpus
+
+def legacy_rows(resume_id, parsed_data):
+    # add_parsed_rows as it was with dict entries
+    return (
+        [(resume_id, skill["name"], skill["category"], skill["relevance_score"]) for skill in parsed_data["skills"]],
+        [(resume_id, edu["institution"], edu["degree"], edu["field_of_study"], edu["start_date"], edu["end_date"],
+          edu["gpa"]) for edu in parsed_data["education"]],
+        [(resume_id, exp["company"], exp["position"], exp["location"], exp["start_date"], exp["end_date"],
+          exp["description"], exp["responsibilities"]) for exp in parsed_data["experience"]],
+    )
+
+def record_rows(resume_id, parsed_data):
+    key = (resume_id,)
+    return tuple([key + entry for entry in parsed_data[name]] for name in RECORD_TYPES)
+
+def retained_bytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, kept
+
+def median_seconds(function, repeat=5):
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    timings.sort()
+    return timings[len(timings) // 2]
+
+def full_collections(function, repeat=20):
+    before = gc.get_stats()[2]["collections"]
+    for _ in range(repeat):
+        function()
+    return gc.get_stats()[2]["collections"] - before
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--documents", type=int, default=2000)
+    arg_parser.add_argument("--pages", type=int, default=2)
+    args = arg_parser.parse_args()
+
+    parser = ResumeParser(db_path=None, headless=True)
+    parsed = [parser.parse_resume(text) for text in generate_corpus(args.documents, pages=args.pages)]
+    entries = sum(len(entries) for parsed_data in parsed for entries in parsed_data.values())
+    print(f"{args.documents} resumes, {entries / args.documents:.1f} entries per resume")
+
+    def as_records():
+        return [ParsedResume((name, [record_type(*entry) for entry in parsed_data[name]])
+                             for name, record_type in RECORD_TYPES.items()) for parsed_data in parsed]
+
+    forms = {
+        "dicts": retained_bytes(lambda: [parsed_to_dicts(parsed_data) for parsed_data in parsed]),
+        "records": retained_bytes(as_records),
+    }
+    build_rows = {"dicts": legacy_rows, "records": record_rows}
+    print(f"{'form':<8} {'bytes/resume':>13} {'pickle B/resume':>16} {'dumps ms':>9} {'loads ms':>9} "
+          f"{'full GCs/20 loads':>18} {'rows ms':>8} {'cache JSON B/resume':>20}")
+    for label, (memory, data) in forms.items():
+        # One worker chunk's worth of results, pickled as ProcessPool sends them back
+        results = [{"ats_score": 50.0, "parsed_data": parsed_data} for parsed_data in data]
+        payload = pickle.dumps(results, pickle.HIGHEST_PROTOCOL)
+        dumps_ms = median_seconds(lambda: pickle.dumps(results, pickle.HIGHEST_PROTOCOL)) * 1000
+        loads_ms = median_seconds(lambda: pickle.loads(payload)) * 1000
+        collections = full_collections(lambda: pickle.loads(payload))
+        rows_ms = median_seconds(lambda: [build_rows[label](index, parsed_data)
+                                          for index, parsed_data in enumerate(data)]) * 1000
+        cache_bytes = sum(len(json.dumps(parsed_data)) for parsed_data in data)
+        print(f"{label:<8} {memory / args.documents:>13.0f} {len(payload) / args.documents:>16.0f} "
+              f"{dumps_ms:>9.1f} {loads_ms:>9.1f} {collections:>18} {rows_ms:>8.1f} {cache_bytes / args.documents:>20.0f}")
+
+if __name__ == "__main__":
+    main()
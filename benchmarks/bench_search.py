@@ -0,0 +1,75 @@
+"""Measure full-text search latency as the resume corpus grows, against scanning every stored text.
+
+Resumes are saved through ResultWriter, which keeps the resume_fts index in sync.
+Run from the repository root:
+    python benchmarks/bench_search.py --sizes 1000,5000,20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import persistence
+from resume_search import search
+from synthetic_corpus import generate_corpus
+from text_store import decompress_text
+
+# (FTS5 query, substrings that must all appear for the scan baseline)
+QUERIES = [
+    ("kubernetes", ["kubernetes"]),
+    ("kubernetes AND django", ["kubernetes", "django"]),
+    ('"computer vision" AND pytorch', ["computer vision", "pytorch"]),
+    ("tensorflow AND flask AND gcp", ["tensorflow", "flask", "gcp"]),
+    ("phd AND hooli AND tanaka", ["phd", "hooli", "tanaka"]),
+]
+
+EMPTY_PARSE = {"skills": [], "education": [], "experience": []}
+
+def scan_search(conn, terms):
+    # Without an index every stored text has to be loaded and scanned to find, count or rank matches
+    return [
+        resume_id for resume_id, blob in conn.execute("SELECT resume_id, compressed FROM resume_texts")
+        if all(term in decompress_text(blob).lower() for term in terms)
+    ]
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default="1000,5000,20000", help="comma separated corpus sizes")
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = persistence.connect(os.path.join(tmp, "bench.db"))
+        persistence.create_schema(conn)
+        persistence.migrate(conn)
+        writer = persistence.ResultWriter(conn, batch_size=1000)
+        saved = 0
+        print(f"{'resumes':>8} {'query':<32} {'hits':>6} {'fts ms':>8} {'fts user ms':>12} {'scan ms':>9}")
+        for size in sizes:
+            for index, text in enumerate(generate_corpus(size - saved, seed=size), saved):
+                writer.add(1 + index % 50, f"resume_{index}.pdf", 50.0, EMPTY_PARSE, text)
+            writer.flush()
+            saved = size
+            for query, terms in QUERIES:
+                hits = len(search(conn, query, limit=size))
+                fts_ms = median_ms(lambda: search(conn, query), args.repeat)
+                user_ms = median_ms(lambda: search(conn, query, user_id=7), args.repeat)
+                scan_ms = median_ms(lambda: scan_search(conn, terms), args.repeat)
+                print(f"{size:>8} {query:<32} {hits:>6} {fts_ms:>8.2f} {user_ms:>12.2f} {scan_ms:>9.2f}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare the per-skill regex loop with the compiled SkillMatcher as the taxonomy grows.
+
+Run from the repository root:
+    python benchmarks/bench_skill_matcher.py
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SkillMatcher
+
+WORDS = [
+    "cloud", "data", "stream", "graph", "secure", "neural", "quantum", "mobile",
+    "vector", "edge", "batch", "query", "signal", "render", "cache", "schema",
+    "kernel", "proxy", "token", "cluster", "pipeline", "model", "sensor", "ledger"
+]
+
+def make_taxonomy(size, rng):
+    skills = set()
+    while len(skills) < size:
+        length = rng.choice((1, 1, 2, 2, 3))
+        skills.add(" ".join(rng.choice(WORDS) + str(rng.randrange(size)) for _ in range(length)))
+    return [(skill, "Technical") for skill in sorted(skills)]
+
+def make_resume(taxonomy, rng, words=1500, skill_count=40):
+    body = [rng.choice(WORDS) for _ in range(words)]
+    for skill, _ in rng.sample(taxonomy, min(skill_count, len(taxonomy))):
+        body.insert(rng.randrange(len(body)), skill)
+    return " ".join(body)
+
+def legacy_match(taxonomy, tokens, text):
+    found = []
+    for skill, _ in taxonomy:
+        if skill in tokens or re.search(r'\b' + re.escape(skill) + r'\b', text):
+            found.append(skill)
+    return found
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default="30,300,3000,10000", help="comma separated taxonomy sizes")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'skills':>8} {'build ms':>10} {'legacy ms':>10} {'matcher ms':>11} {'speedup':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        taxonomy = make_taxonomy(size, rng)
+        text = make_resume(taxonomy, rng).lower()
+        tokens = text.split()
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build = time.perf_counter() - start
+
+        legacy = best_of(lambda: legacy_match(taxonomy, tokens, text), args.repeat)
+        compiled = best_of(lambda: matcher.match_text(text), args.repeat)
+        assert set(legacy_match(taxonomy, tokens, text)) == set(matcher.match_text(text))
+        print(f"{size:>8} {build * 1000:>10.2f} {legacy * 1000:>10.2f} {compiled * 1000:>11.2f} {legacy / compiled:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Measure cold-start time of the application modules and of a first headless parse.
+
+Each case runs in a fresh interpreter so import and first-use costs are included.
+Run from the repository root:
+    python benchmarks/bench_startup.py --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_RESUME = (
+    "Experience\\nSenior Software Engineer at Acme Corp\\nJan 2020 - Present\\n"
+    "- Built Python and SQL services on AWS\\nEducation\\nUniversity of Toronto\\n"
+    "Bachelor of Science 2015 - 2019 GPA: 3.8\\nSkills\\nPython, Docker, Machine Learning\\n"
+)
+
+CASES = {
+    "import main": "import main",
+    "import new_parser": "import new_parser",
+    "headless parse": (
+        "from new_parser import ResumeParser\n"
+        f"ResumeParser(db_path=None, headless=True).analyze_text('{SAMPLE_RESUME}')"
+    ),
+}
+
+def time_case(code):
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return elapsed
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    baseline = [time_case("pass") for _ in range(args.repeat)]
+    print(f"{'case':<20} {'min ms':>9} {'median ms':>10}")
+    print(f"{'python -c pass':<20} {min(baseline) * 1000:>9.1f} {statistics.median(baseline) * 1000:>10.1f}")
+    for name, code in CASES.items():
+        try:
+            timings = [time_case(code) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{name:<20} failed: {e}")
+            continue
+        print(f"{name:<20} {min(timings) * 1000:>9.1f} {statistics.median(timings) * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
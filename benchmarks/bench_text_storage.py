@@ -0,0 +1,144 @@
+"""Report database size and resume_scores scan speed before and after moving resume text out of it.
+
+Builds a database in the pre-migration layout (raw text inline in resume_scores), measures it,
+applies the migration that compresses the text into resume_texts, vacuums and measures again.
+Then saves the same corpus through ResultWriter and the parse cache, as an analysis run does,
+and reports the bytes each table takes next to the uncompressed copies the search index and
+the cache used to keep.
+Run from the repository root:
+    python benchmarks/bench_text_storage.py --resumes 20000 --pages 2
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import persistence
+from parse_cache import ParseCache
+from resume_search import TOKENIZE
+from synthetic_corpus import generate_corpus
+from text_store import iter_stored_texts, load_text
+
+EMPTY_PARSE = {"skills": [], "education": [], "experience": []}
+
+# The search index and parse cache as they were when each kept its own copy of the text
+LEGACY_TABLES_SQL = [
+    f'''CREATE VIRTUAL TABLE legacy_fts USING fts5(resume_text, tokenize="{TOKENIZE}")''',
+    "CREATE TABLE legacy_cache (cache_key TEXT PRIMARY KEY, resume_text TEXT, parsed_data TEXT)",
+]
+
+SCANS = {
+    "score summary": "SELECT user_id, COUNT(*), AVG(ats_score) FROM resume_scores GROUP BY user_id",
+    "history listing": "SELECT id, filename, ats_score, parsed_date FROM resume_scores ORDER BY id DESC",
+}
+
+def measure(db_path, repeat):
+    conn = sqlite3.connect(db_path)
+    result = {"MiB": os.path.getsize(db_path) / 1024 / 1024}
+    for name, sql in SCANS.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            timings.append(time.perf_counter() - start)
+        result[name] = min(timings) * 1000
+    conn.close()
+    return result
+
+def table_bytes(conn):
+    """{table: bytes} from dbstat, with each table's indexes and FTS5 shadow tables counted under it"""
+    sizes = {}
+    for name, table, size in conn.execute(
+            """SELECT d.name, COALESCE(m.tbl_name, d.name), SUM(d.pgsize) FROM dbstat d
+               LEFT JOIN sqlite_master m ON m.name = d.name GROUP BY d.name"""):
+        for fts in ("resume_fts", "legacy_fts"):
+            if table.startswith(fts + "_"):
+                table = fts
+        sizes[table] = sizes.get(table, 0) + size
+    return sizes
+
+def measure_writer(db_path, texts):
+    conn = persistence.connect(db_path)
+    persistence.create_schema(conn)
+    persistence.migrate(conn)
+    cache = ParseCache(conn, max_bytes=1 << 40)
+    writer = persistence.ResultWriter(conn, batch_size=1000)
+    for index, text in enumerate(texts):
+        cache.put(f"key{index}", text, EMPTY_PARSE)
+        writer.add(1 + index % 50, f"resume_{index}.pdf", 50.0, EMPTY_PARSE, text)
+    writer.flush()
+    for statement in LEGACY_TABLES_SQL:
+        conn.execute(statement)
+    for rows in iter_stored_texts(conn):
+        conn.executemany("INSERT INTO legacy_fts (rowid, resume_text) VALUES (?, ?)", rows)
+        conn.executemany("INSERT INTO legacy_cache VALUES (?, ?, '{}')",
+                         [(f"key{resume_id}", text) for resume_id, text in rows])
+    conn.commit()
+    conn.execute("VACUUM")
+    sizes = table_bytes(conn)
+    conn.close()
+    return sizes
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--resumes", type=int, default=20000)
+    arg_parser.add_argument("--pages", type=int, default=2)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        conn = persistence.connect(db_path)
+        persistence.create_schema(conn)
+        # Stop before the migration being measured, so the text is still inline
+        persistence.migrate(conn, target_version=5)
+        conn.executemany(
+            "INSERT INTO resume_scores (id, user_id, filename, ats_score, resume_text) VALUES (?, ?, ?, ?, ?)",
+            [(index + 1, 1 + index % 50, f"resume_{index}.pdf", 50.0 + index % 50, text)
+             for index, text in enumerate(generate_corpus(args.resumes, args.pages))]
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        before = measure(db_path, args.repeat)
+
+        conn = persistence.connect(db_path)
+        start = time.perf_counter()
+        persistence.migrate(conn)
+        migrate_seconds = time.perf_counter() - start
+        conn.execute("VACUUM")
+        start = time.perf_counter()
+        for resume_id in range(1, 1001):
+            load_text(conn, resume_id)
+        load_ms = (time.perf_counter() - start) / 1000 * 1000
+        conn.close()
+        after = measure(db_path, args.repeat)
+        texts = generate_corpus(args.resumes, args.pages)
+        sizes = measure_writer(os.path.join(tmp, "writer.db"), texts)
+
+    print(f"{args.resumes} resumes of {args.pages} page(s); migration took {migrate_seconds:.2f}s")
+    print(f"{'':<20} {'before':>10} {'after':>10}")
+    for key in before:
+        unit = "" if key == "MiB" else " ms"
+        print(f"{key + unit:<20} {before[key]:>10.2f} {after[key]:>10.2f}")
+    print(f"loading one text on demand: {load_ms:.3f} ms")
+
+    mib = 1024 * 1024
+    legacy = sizes["legacy_fts"] + sizes["legacy_cache"]
+    current = sum(size for name, size in sizes.items() if not name.startswith("legacy_"))
+    print(f"\nsaved through ResultWriter and the parse cache: {sum(len(text) for text in texts) / mib:.1f} MiB of text")
+    print(f"{'table':<20} {'MiB':>8}")
+    for name in ("resume_texts", "resume_fts", "parse_cache"):
+        print(f"{name:<20} {sizes[name] / mib:>8.2f}")
+    print(f"{'everything else':<20} {(current - sizes['resume_texts'] - sizes['resume_fts'] - sizes['parse_cache']) / mib:>8.2f}")
+    print(f"{'total':<20} {current / mib:>8.2f}")
+    print(f"with the old full-text copies the index and cache took {legacy / mib:.2f} MiB "
+          f"instead of {(sizes['resume_fts'] + sizes['parse_cache']) / mib:.2f} MiB "
+          f"(total {(current - sizes['resume_fts'] - sizes['parse_cache'] + legacy) / mib:.2f} MiB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Compare tokenizer throughput and the skill sets each one yields.
+
+Uses the .txt files in --corpus when given, otherwise a generated corpus.
+Run from the repository root:
+    python benchmarks/bench_tokenizers.py --documents 300
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from new_parser import ResumeParser
+from skill_taxonomy import get_taxonomy
+from text_tokenizers import TOKENIZERS
+
+FILLER = (
+    "Designed, built and shipped production services; mentored engineers, reviewed code "
+    "and owned on-call. Improved latency by 35% (p99) across the team's APIs."
+).split()
+
+def generate_corpus(count, rng):
+    """Return (texts, expected skill sets); the filler text contains no skills"""
+    taxonomy = get_taxonomy()
+    soft_skills = set(taxonomy.names("Soft"))
+    skill_names = [name for name in taxonomy.names() if name not in soft_skills]
+    corpus, expected = [], []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randrange(300, 900))]
+        skills = rng.sample(skill_names, rng.randrange(3, 12))
+        for skill in skills:
+            decorated = rng.choice(("{}", "{},", "({})", "{}.", "{}/", "- {}"))
+            words.insert(rng.randrange(len(words)), decorated.format(rng.choice((skill, skill.lower(), skill.upper()))))
+        corpus.append(" ".join(words))
+        expected.append(set(skills))
+    return corpus, expected
+
+def load_corpus(directory):
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".txt"):
+            with open(os.path.join(directory, name), encoding="utf-8") as file:
+                corpus.append(file.read())
+    return corpus
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--corpus", help="directory of .txt resumes")
+    arg_parser.add_argument("--documents", type=int, default=300, help="generated documents when no corpus is given")
+    args = arg_parser.parse_args()
+
+    if args.corpus:
+        corpus, expected = load_corpus(args.corpus), None
+    else:
+        corpus, expected = generate_corpus(args.documents, random.Random(3))
+    total_chars = sum(len(text) for text in corpus)
+
+    skill_sets = {}
+    print(f"{len(corpus)} documents, {total_chars / 1e6:.2f}M characters")
+    header = f"{'tokenizer':<10} {'seconds':>9} {'docs/sec':>10} {'MB/sec':>8}"
+    print(header + (f" {'recall':>7} {'precision':>9}" if expected else ""))
+    for name in TOKENIZERS:
+        parser = ResumeParser(db_path=None, headless=True, tokenizer=name)
+        try:
+            parser.tokenizer.tokenize("warm up")
+        except (ImportError, LookupError) as e:
+            print(f"{name:<10} unavailable: {e}")
+            continue
+        start = time.perf_counter()
+        results = []
+        for text in corpus:
+            tokens = [word for word in parser.tokenizer.tokenize(text) if word not in parser.stop_words]
+            results.append({skill.name for skill in parser.extract_skills(tokens)})
+        elapsed = time.perf_counter() - start
+        skill_sets[name] = results
+        line = f"{name:<10} {elapsed:>9.3f} {len(corpus) / elapsed:>10.1f} {total_chars / elapsed / 1e6:>8.2f}"
+        if expected:
+            true_positives = sum(len(found & truth) for found, truth in zip(results, expected))
+            recall = true_positives / sum(len(truth) for truth in expected)
+            precision = true_positives / max(1, sum(len(found) for found in results))
+            line += f" {recall:>7.3f} {precision:>9.3f}"
+        print(line)
+
+    if len(skill_sets) == 2:
+        nltk_sets, regex_sets = skill_sets["nltk"], skill_sets["regex"]
+        differing = sum(1 for a, b in zip(nltk_sets, regex_sets) if a != b)
+        only_nltk = sum(len(a - b) for a, b in zip(nltk_sets, regex_sets))
+        only_regex = sum(len(b - a) for a, b in zip(nltk_sets, regex_sets))
+        print(f"documents with different skill sets: {differing}/{len(corpus)}")
+        print(f"skills found only by nltk: {only_nltk}, only by regex: {only_regex}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Measure what the folder watcher costs on a large drop directory once its files are in the manifest.
+
+Fills a directory with copies of a few generated resume PDFs, ingests it once, then times
+rescans with nothing changed, with a share of the files touched (new mtime, same content)
+and with a share replaced by different content.
+Run from the repository root:
+    python benchmarks/bench_watch_folder.py --files 50000 --unique 500
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_corpus import write_corpus
+from watch_folder import FolderWatcher
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--files", type=int, default=50000, help="PDFs in the watched directory")
+    arg_parser.add_argument("--unique", type=int, default=500, help="distinct generated resumes they are copied from")
+    arg_parser.add_argument("--changed", type=float, default=0.01, help="share of files touched or replaced")
+    arg_parser.add_argument("--workers", type=int, default=None)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = os.path.join(tmp, "sources")
+        write_corpus(sources, args.unique, formats=("pdf",))
+        source_paths = sorted(os.path.join(sources, name) for name in os.listdir(sources))
+        drop = os.path.join(tmp, "drop")
+        # Spread over subdirectories the way a year of dated drops would be
+        paths = [os.path.join(drop, f"batch_{index // 1000:03d}", f"resume_{index:06d}.pdf")
+                 for index in range(args.files)]
+        old = time.time() - 3600
+        for index, path in enumerate(paths):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            shutil.copyfile(source_paths[index % len(source_paths)], path)
+            os.utime(path, (old, old))
+
+        watcher = FolderWatcher(drop, user_id=1, db_path=os.path.join(tmp, "bench.db"), workers=args.workers)
+        step = max(1, int(1 / args.changed)) if args.changed else len(paths) + 1
+        print(f"{'pass':<30} {'changed':>8} {'saved':>7} {'scan ms':>9} {'total s':>9}")
+
+        def run(label):
+            results = []
+            watcher.run(once=True, report=results.append)
+            stats = results[0]
+            print(f"{label:<30} {stats['changed']:>8} {stats.get('saved', 0):>7} "
+                  f"{stats['scan_seconds'] * 1000:>9.1f} {stats['elapsed']:>9.2f}")
+
+        run("initial ingest")
+        run("rescan, nothing changed")
+        for path in paths[::step]:
+            os.utime(path, (old + 60, old + 60))
+        run(f"rescan, {args.changed:.0%} touched")
+        for index, path in enumerate(paths[::step]):
+            shutil.copyfile(source_paths[(index * step + 1) % len(source_paths)], path)
+            os.utime(path, (old + 120, old + 120))
+        run(f"rescan, {args.changed:.0%} replaced")
+
+if __name__ == "__main__":
+    main()
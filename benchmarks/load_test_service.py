@@ -0,0 +1,84 @@
+"""Load-test a running analysis service and report requests/sec and latency percentiles.
+
+Each client thread keeps one HTTP connection open and uploads synthetic resume PDFs.
+Responses with status 503 show the service shedding load once its queue is full.
+Start the service first, then run from the repository root:
+    python analysis_service.py --db load.db --workers 4 --queue-size 16
+    python benchmarks/load_test_service.py --email user@example.com --password secret --concurrency 32 --requests 500
+"""
+import argparse
+import base64
+import http.client
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentation import percentile
+from synthetic_corpus import generate_corpus, text_to_pdf
+
+def client(host, port, auth, pdfs, count, latencies, statuses, lock):
+    conn = http.client.HTTPConnection(host, port, timeout=120)
+    headers = {"Authorization": auth, "Content-Type": "application/pdf"}
+    for index in range(count):
+        body = pdfs[index % len(pdfs)]
+        start = time.perf_counter()
+        try:
+            conn.request("POST", f"/analyze?filename=load_{index}.pdf", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+            if response.getheader("Connection", "").lower() == "close":
+                conn.close()
+        except (OSError, http.client.HTTPException):
+            status = "error"
+            conn.close()
+        elapsed = time.perf_counter() - start
+        with lock:
+            statuses[status] += 1
+            if status == 200:
+                latencies.append(elapsed)
+    conn.close()
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8080)
+    arg_parser.add_argument("--email", required=True)
+    arg_parser.add_argument("--password", required=True)
+    arg_parser.add_argument("--concurrency", type=int, default=16, help="simultaneous client connections")
+    arg_parser.add_argument("--requests", type=int, default=200, help="total uploads")
+    arg_parser.add_argument("--pages", type=int, default=1)
+    arg_parser.add_argument("--distinct", type=int, default=50, help="distinct PDFs; repeats can hit the parse cache")
+    args = arg_parser.parse_args()
+
+    auth = "Basic " + base64.b64encode(f"{args.email}:{args.password}".encode("utf-8")).decode("ascii")
+    pdfs = [text_to_pdf(text) for text in generate_corpus(args.distinct, args.pages, seed=int(time.time()))]
+    latencies, statuses, lock = [], Counter(), threading.Lock()
+    per_client = [args.requests // args.concurrency + (1 if i < args.requests % args.concurrency else 0)
+                  for i in range(args.concurrency)]
+    threads = [
+        threading.Thread(target=client, args=(args.host, args.port, auth, pdfs[i::args.concurrency] or pdfs,
+                                              count, latencies, statuses, lock))
+        for i, count in enumerate(per_client) if count
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{args.requests} uploads, {args.concurrency} connections, {elapsed:.2f}s")
+    print("status: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str)))
+    print(f"completed/sec: {statuses[200] / elapsed:.1f}, requests/sec: {args.requests / elapsed:.1f}")
+    if latencies:
+        print(f"latency ms  p50 {percentile(latencies, 0.50) * 1000:.1f}  p95 {percentile(latencies, 0.95) * 1000:.1f}"
+              f"  p99 {percentile(latencies, 0.99) * 1000:.1f}  max {latencies[-1] * 1000:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Deterministic generator of synthetic resumes, as text and as PDF files.
+
+The same seed always yields the same corpus, so benchmark runs are comparable across commits.
+Run from the repository root to write a corpus to disk:
+    python benchmarks/synthetic_corpus.py out_dir --count 200 --pages 2 --skill-density 0.05
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_taxonomy import get_taxonomy
+
+FIRST_NAMES = ["Ayesha", "Bilal", "Chen", "Dana", "Elena", "Farhan", "Grace", "Hiro", "Imran", "Julia"]
+LAST_NAMES = ["Khan", "Smith", "Garcia", "Okafor", "Ivanova", "Tanaka", "Hashmi", "Novak", "Silva", "Brown"]
+UNIVERSITIES = ["Toronto", "Lahore", "Michigan", "Edinburgh", "Melbourne", "Technology", "Applied Sciences"]
+DEGREES = [
+    "Bachelor of Science", "Bachelor of Engineering", "Master of Science",
+    "Master of Business Administration", "PhD in Computer Science", "BS in Data Science"
+]
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Data Scientist", "Backend Developer",
+    "Frontend Developer", "Cloud Architect", "Data Analyst", "Product Manager", "QA Engineer"
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Systems", "Hooli"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+FILLER = (
+    "designed built maintained scaled migrated automated improved reduced latency throughput "
+    "for internal and external customers across several teams while mentoring junior engineers "
+    "owning releases reviewing code writing documentation and on call rotations"
+).split()
+
+# Roughly one page of extracted text
+CHARS_PER_PAGE = 3000
+
+def _sentence(rng, skills, skill_density, words=14):
+    parts = []
+    for _ in range(words):
+        if skills and rng.random() < skill_density:
+            parts.append(rng.choice(skills))
+        else:
+            parts.append(rng.choice(FILLER))
+    return " ".join(parts).capitalize()
+
+def _date_range(rng, start_year):
+    end_year = start_year + rng.randrange(1, 5)
+    if rng.random() < 0.5:
+        return f"{rng.choice(MONTHS)} {start_year} - {rng.choice(MONTHS)} {end_year}", end_year
+    return f"{start_year} - {end_year}", end_year
+
+def generate_resume(seed, pages=1, skill_density=0.05):
+    """Return one synthetic resume of about the given number of pages"""
+    rng = random.Random(seed)
+    skills = rng.sample(get_taxonomy().names(), rng.randrange(6, 20))
+    lines = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", "Summary", _sentence(rng, skills, skill_density, 30)]
+
+    lines.append("Education")
+    year = rng.randrange(2000, 2016)
+    for _ in range(rng.randrange(1, 3)):
+        dates, year = _date_range(rng, year)
+        lines.append(f"University of {rng.choice(UNIVERSITIES)}")
+        lines.append(f"{rng.choice(DEGREES)} {dates} GPA: {rng.uniform(2.5, 4.0):.2f}")
+
+    lines.append("Experience")
+    target = pages * CHARS_PER_PAGE
+    while sum(len(line) + 1 for line in lines) < target:
+        start_year = year
+        dates, year = _date_range(rng, start_year)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}")
+        lines.append(dates)
+        for _ in range(rng.randrange(3, 7)):
+            lines.append(f"- {_sentence(rng, skills, skill_density)}")
+
+    lines.append("Skills")
+    lines.append(", ".join(skills))
+    return "\n".join(lines) + "\n"
+
+def generate_corpus(count, pages=1, skill_density=0.05, seed=0):
+    return [generate_resume(seed * 1000003 + index, pages, skill_density) for index in range(count)]
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def text_to_pdf(text, lines_per_page=55):
+    """Render plain text as a minimal single-font PDF that PyPDF2 can extract"""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, page_lines in enumerate(pages):
+        content = "BT /F1 10 Tf 50 760 Td 13 TL " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in page_lines) + " ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * index} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode("latin-1")
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+    return bytes(output)
+
+def write_corpus(directory, count, pages=1, skill_density=0.05, seed=0, formats=("txt", "pdf")):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index, text in enumerate(generate_corpus(count, pages, skill_density, seed)):
+        base = os.path.join(directory, f"resume_{index:05d}")
+        if "txt" in formats:
+            with open(base + ".txt", "w", encoding="utf-8") as file:
+                file.write(text)
+        if "pdf" in formats:
+            with open(base + ".pdf", "wb") as file:
+                file.write(text_to_pdf(text))
+            paths.append(base + ".pdf")
+    return paths
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("directory")
+    arg_parser.add_argument("--count", type=int, default=100)
+    arg_parser.add_argument("--pages", type=int, default=1)
+    arg_parser.add_argument("--skill-density", type=float, default=0.05)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--formats", default="txt,pdf", help="comma separated: txt, pdf")
+    args = arg_parser.parse_args()
+    write_corpus(args.directory, args.count, args.pages, args.skill_density, args.seed, args.formats.split(","))
+    print(f"Wrote {args.count} resumes to {args.directory}")
+
+if __name__ == "__main__":
+    main()
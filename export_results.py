@@ -0,0 +1,141 @@
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+import time
+import persistence
+from result_records import parsed_to_dicts
+from text_store import decompress_text
+
+# Resumes per keyset page; each page runs one query per table, so memory stays at one page
+PAGE_SIZE = 500
+CSV_COLUMNS = [
+    "resume_id", "user_id", "filename", "ats_score", "parsed_date", "parse_version", "scoring_version",
+    "skills", "education", "experience", "resume_text",
+]
+
+def _filters(user_id=None, since=None, until=None, min_score=None, max_score=None):
+    conditions, params = [], []
+    if user_id is not None:
+        conditions.append("s.user_id = ?")
+        params.append(user_id)
+    if since is not None:
+        conditions.append("s.parsed_date >= ?")
+        params.append(since)
+    if until is not None:
+        # until is an inclusive date, parsed_date a UTC timestamp
+        conditions.append("s.parsed_date < date(?, '+1 day')")
+        params.append(until)
+    if min_score is not None:
+        conditions.append("s.ats_score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        conditions.append("s.ats_score <= ?")
+        params.append(max_score)
+    return conditions, params
+
+def iter_results(conn, user_id=None, since=None, until=None, min_score=None, max_score=None,
+                 include_text=False, page_size=PAGE_SIZE):
+    """Yield one dict per stored resume matching the filters, in id order, with its parsed records.
+
+    Pages are fetched with keyset pagination (id > last id seen), so every page costs the same
+    however far into the table the export is, and only one page is held in memory at a time.
+    since and until are inclusive dates ("2024-05-01").
+    """
+    conditions, params = _filters(user_id, since, until, min_score, max_score)
+    text_column = "t.compressed, s.resume_text" if include_text else "NULL, NULL"
+    text_join = " LEFT JOIN resume_texts t ON t.resume_id = s.id" if include_text else ""
+    sql = f"""SELECT s.id, s.user_id, s.filename, s.ats_score, s.parsed_date, s.parse_version, s.scoring_version,
+                     {text_column}
+              FROM resume_scores s{text_join}
+              WHERE {' AND '.join(["s.id > ?"] + conditions)} ORDER BY s.id LIMIT ?"""
+    last_id = 0
+    while True:
+        rows = conn.execute(sql, [last_id] + params + [page_size]).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        parsed = persistence.load_parsed_data(conn, [row[0] for row in rows])
+        for resume_id, owner, filename, ats_score, parsed_date, parse_version, scoring_version, blob, text in rows:
+            record = {
+                "resume_id": resume_id,
+                "user_id": owner,
+                "filename": filename,
+                "ats_score": ats_score,
+                "parsed_date": parsed_date,
+                "parse_version": parse_version,
+                "scoring_version": scoring_version,
+                **parsed[resume_id],
+            }
+            if include_text:
+                record["resume_text"] = decompress_text(blob) if blob is not None else text
+            yield record
+
+def write_jsonl(records, file):
+    """Write one JSON object per line; returns the number written"""
+    count = 0
+    for record in records:
+        # Entries are written with their field names rather than as the value lists records serialize to
+        file.write(json.dumps({**record, **parsed_to_dicts(record)}, ensure_ascii=False))
+        file.write("\n")
+        count += 1
+    return count
+
+def _csv_row(record):
+    row = dict(record)
+    # Nested lists are flattened to "; " separated text so the file opens in a spreadsheet
+    row["skills"] = "; ".join(skill.name for skill in record["skills"])
+    row["education"] = "; ".join(
+        ", ".join(part for part in (edu.degree, edu.institution) if part) for edu in record["education"])
+    row["experience"] = "; ".join(
+        " at ".join(part for part in (exp.position, exp.company) if part) for exp in record["experience"])
+    return row
+
+def write_csv(records, file):
+    """Write one row per resume with CSV_COLUMNS; returns the number written"""
+    writer = csv.DictWriter(file, CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow(_csv_row(record))
+        count += 1
+    return count
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv}
+
+def main(argv=None):
+    from new_parser import DB_PATH
+    arg_parser = argparse.ArgumentParser(description="Stream stored analysis results to JSONL or CSV")
+    arg_parser.add_argument("output", help="output file, or - for stdout")
+    arg_parser.add_argument("--format", choices=sorted(WRITERS), default=None,
+                            help="output format (default: from the file extension, else jsonl)")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--user-id", type=int, default=None, help="only this user's results")
+    arg_parser.add_argument("--since", default=None, help="first day to include, e.g. 2024-05-01")
+    arg_parser.add_argument("--until", default=None, help="last day to include, e.g. 2024-05-31")
+    arg_parser.add_argument("--min-score", type=float, default=None)
+    arg_parser.add_argument("--max-score", type=float, default=None)
+    arg_parser.add_argument("--include-text", action="store_true", help="add the extracted resume text")
+    arg_parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="resumes fetched per query")
+    args = arg_parser.parse_args(argv)
+
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    conn = sqlite3.connect(args.db)
+    file = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        start = time.perf_counter()
+        records = iter_results(conn, args.user_id, args.since, args.until, args.min_score, args.max_score,
+                               args.include_text, args.page_size)
+        count = WRITERS[output_format](records, file)
+        elapsed = time.perf_counter() - start
+    finally:
+        if file is not sys.stdout:
+            file.close()
+        conn.close()
+    rate = count / elapsed if elapsed > 0 else 0.0
+    # Reported on stderr so exporting to stdout stays clean
+    print(f"Exported {count} results as {output_format} in {elapsed:.2f}s ({rate:.0f} results/sec)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+
+# Files handled by the folder watcher; resume_id is NULL for files that yielded no text
+CREATE_MANIFEST_TABLES_SQL = [
+    '''CREATE TABLE IF NOT EXISTS ingest_manifest (
+        path TEXT PRIMARY KEY,
+        size INTEGER,
+        mtime_ns INTEGER,
+        content_hash TEXT,
+        resume_id INTEGER,
+        processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
+    )''',
+]
+
+class Manifest:
+    """Every file the watcher has handled, with the size, mtime and content hash it had then.
+
+    Rows are written in the same transaction as the results they point at, so a file is
+    analyzed exactly once even if the watcher is killed mid-batch.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def load(self, directory):
+        """Return {path: (size, mtime_ns, content_hash)} for every recorded file under directory"""
+        prefix = os.path.join(directory, "")
+        # Paths under the prefix sort between it and the same prefix with its separator bumped
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return {
+            path: (size, mtime_ns, content_hash)
+            for path, size, mtime_ns, content_hash in self.conn.execute(
+                "SELECT path, size, mtime_ns, content_hash FROM ingest_manifest WHERE path >= ? AND path < ?",
+                (prefix, upper))
+        }
+
+    def record(self, rows):
+        """rows: (path, size, mtime_ns, content_hash, resume_id); runs in the caller's transaction"""
+        self.conn.executemany(
+            """INSERT INTO ingest_manifest (path, size, mtime_ns, content_hash, resume_id) VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns,
+               content_hash = excluded.content_hash, resume_id = excluded.resume_id,
+               processed_at = CURRENT_TIMESTAMP""",
+            rows
+        )
+
+    def update_stat(self, rows):
+        """rows: (size, mtime_ns, path) of files whose content turned out unchanged"""
+        self.conn.executemany("UPDATE ingest_manifest SET size=?, mtime_ns=? WHERE path=?", rows)
@@ -0,0 +1,110 @@
+import argparse
+import functools
+import math
+import sqlite3
+import time
+
+# Stage names recorded per document; each maps to a <stage>_ms column in resume_timings
+STAGES = ["extract_text", "parse", "skills", "education", "experience", "score", "save"]
+# skills, education and experience run inside parse, so only these add up to the total
+TOP_LEVEL_STAGES = ["extract_text", "parse", "score", "save"]
+
+class StageTimer:
+    """Accumulates wall-clock seconds per stage for one document"""
+
+    def __init__(self):
+        self.durations = {}
+
+    def add(self, stage, seconds):
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+def timed(stage):
+    """Method decorator that records into self.timer; costs one attribute check when self.timer is None"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            timer = self.timer
+            if timer is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                timer.add(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def timing_row(resume_id, metrics):
+    """Row for resume_timings from a metrics dict of timings (seconds), page_count and text_length"""
+    timings = metrics["timings"]
+    stage_ms = [timings[stage] * 1000 if stage in timings else None for stage in STAGES]
+    return (
+        resume_id, metrics.get("page_count"), metrics.get("text_length"),
+        *stage_ms, sum(timings.get(stage, 0.0) for stage in TOP_LEVEL_STAGES) * 1000
+    )
+
+INSERT_TIMINGS_SQL = """INSERT OR REPLACE INTO resume_timings
+    (resume_id, page_count, text_length, {}, total_ms)
+    VALUES ({})""".format(", ".join(f"{stage}_ms" for stage in STAGES), ", ".join("?" * (len(STAGES) + 4)))
+
+CREATE_TIMINGS_SQL = """CREATE TABLE IF NOT EXISTS resume_timings (
+    resume_id INTEGER PRIMARY KEY,
+    page_count INTEGER,
+    text_length INTEGER,
+    {},
+    total_ms REAL,
+    FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
+)""".format(",\n    ".join(f"{stage}_ms REAL" for stage in STAGES))
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def stage_percentiles(conn, fractions=(0.50, 0.95, 0.99)):
+    """Return {stage: {"count": n, fraction: ms, ...}} over every recorded document"""
+    report = {}
+    for stage in STAGES + ["total"]:
+        column = f"{stage}_ms"
+        values = [row[0] for row in conn.execute(
+            f"SELECT {column} FROM resume_timings WHERE {column} IS NOT NULL ORDER BY {column}"
+        )]
+        if values:
+            report[stage] = {"count": len(values)}
+            report[stage].update((fraction, percentile(values, fraction)) for fraction in fractions)
+    return report
+
+def slowest_documents(conn, limit=10):
+    return conn.execute(
+        """SELECT t.resume_id, s.filename, t.page_count, t.text_length, t.total_ms
+           FROM resume_timings t JOIN resume_scores s ON s.id = t.resume_id
+           ORDER BY t.total_ms DESC LIMIT ?""",
+        (limit,)
+    ).fetchall()
+
+def main(argv=None):
+    from new_parser import DB_PATH
+    arg_parser = argparse.ArgumentParser(description="Summarize recorded per-stage analysis timings")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--slowest", type=int, default=10, help="number of slowest documents to list")
+    args = arg_parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        report = stage_percentiles(conn)
+        if not report:
+            print("No timings recorded yet")
+            return
+        print(f"{'stage':<14} {'count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for stage, row in report.items():
+            print(f"{stage:<14} {row['count']:>8} {row[0.50]:>9.2f} {row[0.95]:>9.2f} {row[0.99]:>9.2f}")
+        print(f"\nSlowest {args.slowest} documents:")
+        for resume_id, filename, page_count, text_length, total_ms in slowest_documents(conn, args.slowest):
+            print(f"  #{resume_id} {filename}: {total_ms:.1f} ms, {page_count} pages, {text_length} chars")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
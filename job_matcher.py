@@ -0,0 +1,209 @@
+import argparse
+import sqlite3
+import sys
+from array import array
+from collections import Counter
+from nlp_resources import get_stop_words
+from skill_matcher import normalize_tokens
+from text_store import iter_stored_texts
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+CREATE_MATCH_TABLES_SQL = [
+    '''CREATE TABLE IF NOT EXISTS match_terms (
+        id INTEGER PRIMARY KEY,
+        term TEXT UNIQUE NOT NULL
+    )''',
+    # One row per indexed resume; term ids and their counts are packed uint32 arrays
+    '''CREATE TABLE IF NOT EXISTS match_documents (
+        resume_id INTEGER PRIMARY KEY,
+        length INTEGER,
+        term_ids BLOB,
+        term_freqs BLOB,
+        FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
+    )''',
+]
+
+def document_terms(text):
+    stop_words = get_stop_words()
+    return Counter(token for token in normalize_tokens(text) if token not in stop_words)
+
+class TermIndexer:
+    """Adds resumes to the match index as they are saved; never commits"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.vocabulary = None
+
+    def term_ids(self, terms):
+        if self.vocabulary is None:
+            self.vocabulary = dict(self.conn.execute("SELECT term, id FROM match_terms"))
+        missing = [(term,) for term in terms if term not in self.vocabulary]
+        if missing:
+            self.conn.executemany("INSERT OR IGNORE INTO match_terms (term) VALUES (?)", missing)
+            for (term,) in missing:
+                self.vocabulary[term] = self.conn.execute(
+                    "SELECT id FROM match_terms WHERE term=?", (term,)
+                ).fetchone()[0]
+        return [self.vocabulary[term] for term in terms]
+
+    def index(self, documents):
+        """documents: iterable of (resume_id, resume_text)"""
+        rows = []
+        for resume_id, text in documents:
+            counts = document_terms(text or "")
+            terms = list(counts)
+            rows.append((
+                resume_id,
+                sum(counts.values()),
+                array('I', self.term_ids(terms)).tobytes(),
+                array('I', (counts[term] for term in terms)).tobytes()
+            ))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO match_documents (resume_id, length, term_ids, term_freqs) VALUES (?, ?, ?, ?)",
+            rows
+        )
+
+def backfill(conn, batch_size=1000, commit=True):
+    """Index stored resumes that predate the match index; returns how many were added.
+
+    With commit=False everything is left to the caller's transaction, as in the migrations.
+    """
+    indexer = TermIndexer(conn)
+    added = 0
+    for rows in iter_stored_texts(conn, "match_documents", batch_size):
+        indexer.index(rows)
+        if commit:
+            conn.commit()
+        added += len(rows)
+    return added
+
+class JobMatcher:
+    """BM25 ranking of stored resumes against a job description over a sparse term matrix.
+
+    The matrix is loaded from match_documents on first use and afterwards only extended
+    with resumes saved since the previous query.
+    """
+
+    def __init__(self, conn):
+        import numpy as np
+        from scipy import sparse
+        self.np = np
+        self.sparse = sparse
+        self.conn = conn
+        self.vocabulary = {}
+        self.last_term_id = 0
+        self.last_resume_id = 0
+        self.matrix = sparse.csc_matrix((0, 0), dtype=np.float32)
+        self.resume_ids = np.zeros(0, dtype=np.int64)
+        self.user_ids = np.zeros(0, dtype=np.int64)
+        self.lengths = np.zeros(0, dtype=np.float32)
+
+    def refresh(self):
+        np, sparse = self.np, self.sparse
+        # Terms and documents are read from one snapshot, so every term id in the fetched
+        # documents is in the vocabulary even while a writer is adding resumes
+        snapshot = not self.conn.in_transaction
+        if snapshot:
+            self.conn.execute("BEGIN")
+        try:
+            for term_id, term in self.conn.execute(
+                "SELECT id, term FROM match_terms WHERE id > ? ORDER BY id", (self.last_term_id,)
+            ):
+                self.vocabulary[term] = term_id
+                self.last_term_id = term_id
+
+            rows = self.conn.execute(
+                """SELECT d.resume_id, COALESCE(s.user_id, -1), d.length, d.term_ids, d.term_freqs
+                   FROM match_documents d JOIN resume_scores s ON s.id = d.resume_id
+                   WHERE d.resume_id > ? ORDER BY d.resume_id""",
+                (self.last_resume_id,)
+            ).fetchall()
+        finally:
+            if snapshot:
+                self.conn.commit()
+        columns = self.last_term_id + 1
+        if not rows:
+            if self.matrix.shape[1] < columns:
+                self.matrix.resize((self.matrix.shape[0], columns))
+            return
+
+        indices = [np.frombuffer(row[3], dtype=np.uint32) for row in rows]
+        data = [np.frombuffer(row[4], dtype=np.uint32) for row in rows]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in indices], out=indptr[1:])
+        new_rows = sparse.csr_matrix(
+            (np.concatenate(data).astype(np.float32), np.concatenate(indices), indptr),
+            shape=(len(rows), columns)
+        )
+        self.matrix.resize((self.matrix.shape[0], columns))
+        self.matrix = sparse.vstack([self.matrix, new_rows], format="csc")
+        self.resume_ids = np.concatenate([self.resume_ids, np.fromiter((row[0] for row in rows), np.int64, len(rows))])
+        self.user_ids = np.concatenate([self.user_ids, np.fromiter((row[1] for row in rows), np.int64, len(rows))])
+        self.lengths = np.concatenate([self.lengths, np.fromiter((row[2] for row in rows), np.float32, len(rows))])
+        self.last_resume_id = rows[-1][0]
+
+    def rank(self, job_description, top_k=10, user_id=None):
+        """Return up to top_k (resume_id, score) pairs, best first"""
+        np = self.np
+        self.refresh()
+        doc_count = self.matrix.shape[0]
+        query = document_terms(job_description)
+        term_ids = [self.vocabulary[term] for term in query if term in self.vocabulary]
+        if not doc_count or not term_ids:
+            return []
+
+        columns = self.matrix[:, term_ids]
+        doc_freq = np.diff(columns.indptr)
+        idf = np.log1p((doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+        query_weight = np.array([query[term] for term in query if term in self.vocabulary], dtype=np.float32)
+
+        # Each stored value belongs to the column (query term) it sits in
+        column_of_value = np.repeat(np.arange(len(term_ids)), doc_freq)
+        docs = columns.indices
+        tf = columns.data
+        norm = K1 * (1 - B + B * self.lengths[docs] / max(float(self.lengths.mean()), 1.0))
+        values = (idf * query_weight)[column_of_value] * tf * (K1 + 1) / (tf + norm)
+        scores = np.bincount(docs, weights=values, minlength=doc_count)
+
+        if user_id is not None:
+            scores[self.user_ids != user_id] = 0
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(self.resume_ids[row]), float(scores[row])) for row in candidates]
+
+def main(argv=None):
+    from new_parser import DB_PATH
+    arg_parser = argparse.ArgumentParser(description="Rank stored resumes against a job description")
+    arg_parser.add_argument("job_description", nargs="?", help="file with the job description (default: stdin)")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--top", type=int, default=10, help="number of resumes to return")
+    arg_parser.add_argument("--user-id", type=int, default=None, help="only rank this user's resumes")
+    arg_parser.add_argument("--backfill", action="store_true", help="index stored resumes missing from the index first")
+    args = arg_parser.parse_args(argv)
+
+    if args.job_description:
+        with open(args.job_description, encoding="utf-8") as file:
+            job_description = file.read()
+    else:
+        job_description = sys.stdin.read()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.backfill:
+            print(f"Indexed {backfill(conn)} stored resumes")
+        matcher = JobMatcher(conn)
+        for rank, (resume_id, score) in enumerate(matcher.rank(job_description, args.top, args.user_id), 1):
+            filename, ats_score = conn.execute(
+                "SELECT filename, ats_score FROM resume_scores WHERE id=?", (resume_id,)
+            ).fetchone()
+            print(f"{rank:>3}. #{resume_id} {filename}  match {score:.2f}  ATS {ats_score:.1f}%")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import argparse
+import hashlib
+import sqlite3
+from array import array
+from skill_matcher import normalize_tokens
+from text_store import iter_stored_texts
+
+# Signature layout: NUM_HASHES minimums split into BANDS bands of ROWS values for LSH.
+# With 32 bands of 4 rows a pair at Jaccard 0.5 becomes a candidate ~87% of the time, at 0.7
+# almost always, and at 0.2 (far above unrelated resumes) ~5%.
+NUM_HASHES = 128
+BANDS = 32
+ROWS = NUM_HASHES // BANDS
+SHINGLE_SIZE = 3
+# Estimated Jaccard similarity of word 3-shingles above which a resume is flagged as a
+# near-duplicate; changing 5% of the words already brings two copies down to about 0.8
+DUPLICATE_THRESHOLD = 0.5
+# Most candidates compared per lookup, taking those that share the most bands first
+MAX_CANDIDATES = 50
+
+CREATE_DEDUP_TABLES_SQL = [
+    # duplicate_of points at the earliest resume of a near-duplicate group, NULL for originals
+    '''CREATE TABLE IF NOT EXISTS resume_signatures (
+        resume_id INTEGER PRIMARY KEY,
+        signature BLOB,
+        duplicate_of INTEGER,
+        similarity REAL,
+        FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
+    )''',
+    "CREATE INDEX IF NOT EXISTS idx_resume_signatures_duplicate_of ON resume_signatures (duplicate_of)",
+    # One row per band of each original (not-duplicate) resume; bucket hashes the band number
+    # together with its values
+    '''CREATE TABLE IF NOT EXISTS resume_lsh (
+        bucket INTEGER,
+        resume_id INTEGER,
+        PRIMARY KEY (bucket, resume_id)
+    ) WITHOUT ROWID''',
+]
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+def shingles(text, size=SHINGLE_SIZE):
+    tokens = normalize_tokens(text)
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+def signature(text):
+    """MinHash signature of the text's word shingles, or None if the text has no words.
+
+    Uses one-permutation hashing: every shingle is hashed once, the low bits pick one of
+    NUM_HASHES bins and each bin keeps its minimum. Empty bins borrow from the next
+    non-empty bin so short documents still get a full signature.
+    """
+    bins = [None] * NUM_HASHES
+    for shingle in shingles(text):
+        value = _hash64(shingle.encode("utf-8"))
+        index = value % NUM_HASHES
+        value >>= 32
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+    if all(value is None for value in bins):
+        return None
+    for index in range(NUM_HASHES):
+        if bins[index] is None:
+            offset = 1
+            while bins[(index + offset) % NUM_HASHES] is None:
+                offset += 1
+            # Mixing in the distance keeps borrowed bins from all repeating one value
+            bins[index] = (bins[(index + offset) % NUM_HASHES] + offset * 0x9E3779B1) & 0xFFFFFFFF
+    return array('I', bins)
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_HASHES
+
+def band_buckets(sig):
+    return [
+        _hash64(bytes([band]) + sig[band * ROWS:(band + 1) * ROWS].tobytes()) - (1 << 63)
+        for band in range(BANDS)
+    ]
+
+class DuplicateIndex:
+    """Signs resumes as they are saved and flags near-duplicates of earlier ones; never commits"""
+
+    def __init__(self, conn, threshold=DUPLICATE_THRESHOLD):
+        self.conn = conn
+        self.threshold = threshold
+
+    def candidates(self, sig):
+        """Return (resume_id, signature blob, duplicate_of) of the indexed resumes sharing a band with sig"""
+        buckets = band_buckets(sig)
+        return self.conn.execute(
+            f"""SELECT s.resume_id, s.signature, s.duplicate_of FROM resume_signatures s
+                JOIN (SELECT resume_id FROM resume_lsh WHERE bucket IN ({', '.join('?' * len(buckets))})
+                      GROUP BY resume_id ORDER BY COUNT(*) DESC LIMIT ?) c ON c.resume_id = s.resume_id""",
+            buckets + [MAX_CANDIDATES]
+        ).fetchall()
+
+    def find(self, sig, exclude=None):
+        """Return (resume_id, similarity) of the most similar indexed resume above the threshold, or None"""
+        best = None
+        for resume_id, blob, duplicate_of in self.candidates(sig):
+            if resume_id == exclude:
+                continue
+            score = similarity(sig, array('I', blob))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (duplicate_of or resume_id, score)
+        return best
+
+    def index(self, documents):
+        """documents: iterable of (resume_id, resume_text); returns {resume_id: duplicate_of} for flagged ones"""
+        flagged = {}
+        for resume_id, text in documents:
+            sig = signature(text or "")
+            if sig is None:
+                continue
+            match = self.find(sig, exclude=resume_id)
+            duplicate_of, score = match if match else (None, None)
+            if duplicate_of is not None:
+                flagged[resume_id] = duplicate_of
+            # Rows are written one document at a time so later resumes in a batch see earlier ones
+            self.conn.execute(
+                "INSERT OR REPLACE INTO resume_signatures (resume_id, signature, duplicate_of, similarity) VALUES (?, ?, ?, ?)",
+                (resume_id, sig.tobytes(), duplicate_of, score)
+            )
+            # Only originals go into the buckets: a duplicate is found through its original, and
+            # indexing every copy would make each new copy compare against all earlier ones
+            if duplicate_of is None:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO resume_lsh (bucket, resume_id) VALUES (?, ?)",
+                    [(bucket, resume_id) for bucket in band_buckets(sig)]
+                )
+        return flagged
+
+def backfill(conn, batch_size=1000, commit=True):
+    """Sign stored resumes that predate the dedup index, oldest first; returns (signed, flagged).
+
+    With commit=False everything is left to the caller's transaction, as in the migration
+    that creates the tables.
+    """
+    index = DuplicateIndex(conn)
+    signed = flagged = 0
+    for rows in iter_stored_texts(conn, "resume_signatures", batch_size):
+        flagged += len(index.index(rows))
+        if commit:
+            conn.commit()
+        signed += len(rows)
+    return signed, flagged
+
+def duplicate_groups(conn, user_id=None):
+    """Return {original resume_id: [(duplicate resume_id, similarity), ...]}"""
+    sql = """SELECT d.duplicate_of, d.resume_id, d.similarity FROM resume_signatures d
+             JOIN resume_scores s ON s.id = d.resume_id WHERE d.duplicate_of IS NOT NULL"""
+    params = []
+    if user_id is not None:
+        sql += " AND s.user_id = ?"
+        params.append(user_id)
+    groups = {}
+    for original, resume_id, score in conn.execute(sql + " ORDER BY d.duplicate_of, d.resume_id", params):
+        groups.setdefault(original, []).append((resume_id, score))
+    return groups
+
+def main(argv=None):
+    from new_parser import DB_PATH
+    arg_parser = argparse.ArgumentParser(description="List near-duplicate resumes")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--user-id", type=int, default=None, help="only list this user's resumes")
+    arg_parser.add_argument("--backfill", action="store_true", help="sign stored resumes missing from the index first")
+    args = arg_parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.backfill:
+            signed, flagged = backfill(conn)
+            print(f"Signed {signed} stored resumes, {flagged} flagged as near-duplicates")
+        groups = duplicate_groups(conn, args.user_id)
+        if not groups:
+            print("No near-duplicate resumes found")
+            return
+        for original, duplicates in groups.items():
+            filename = conn.execute("SELECT filename FROM resume_scores WHERE id=?", (original,)).fetchone()[0]
+            print(f"#{original} {filename}")
+            for resume_id, score in duplicates:
+                filename = conn.execute("SELECT filename FROM resume_scores WHERE id=?", (resume_id,)).fetchone()[0]
+                print(f"    #{resume_id} {filename}  similarity {score:.2f}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,262 +1,320 @@
+import io
 import os
+import queue
 import re
-import sqlite3
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-import PyPDF2
-import nltk; from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-
-# NLTK Data Packs (needed for tokenization and stopwords)
-# Download punkt and stopwords if not already available
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+import threading
+import persistence
+from nlp_resources import get_stop_words
+from instrumentation import StageTimer, timed
+from parse_cache import ParseCache, pdf_cache_key
+from pdf_extraction import DEFAULT_LIMITS, extract_pdf_text
+from result_records import Education, Experience, ParsedResume, Skill
+from resume_history import PAGE_SIZE as HISTORY_PAGE_SIZE, history_count, history_page, load_details
+from section_segmenter import section_spans, segment_sections
+from skill_taxonomy import get_taxonomy
+from text_store import load_text
+from text_tokenizers import get_tokenizer
+
+# tkinter is imported by create_ui, so headless parsing and batch workers never load Tk
+tk = filedialog = messagebox = ttk = None
+
+def _load_tkinter():
+    global tk, filedialog, messagebox, ttk
+    if tk is None:
+        import tkinter
+        from tkinter import filedialog as tk_filedialog, messagebox as tk_messagebox, ttk as tk_ttk
+        tk, filedialog, messagebox, ttk = tkinter, tk_filedialog, tk_messagebox, tk_ttk
+
+DB_PATH = 'resumes_analyzer_ATS.db'
+
+DEGREE_PATTERN = re.compile(r'(?:Bachelor|BS|BA|Master|MS|MA|PhD|Doctorate|Associate)(?:\s+of\s+|\s+in\s+|\s+)(?:Science|Arts|Engineering|Business|Administration|Computer Science|Information Technology|Financial Technology|Data Science)', re.IGNORECASE)
+
+EDUCATION_PATTERNS = [
+    DEGREE_PATTERN,
+    re.compile(r'(?:University|College|Institute|School) of [\w\s]+', re.IGNORECASE),
+    re.compile(r'(?:High School|Secondary School|School) of [\w\s]+', re.IGNORECASE)
+]
+
+# Every extraction pattern must run in linear time on arbitrary PDF text (checked by
+# benchmarks/bench_regex_worst_case.py): no match attempt may start inside a long run of
+# characters and scan to its end, since that repeats for every position of the run.
+
+# A month is its first three letters plus at most six more ("September"), so a long run of
+# letters is not rescanned from every "mar" or "jan" inside it
+DATE_RANGE_PATTERN = re.compile(r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]{0,6} \d{4} - (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]{0,6} \d{4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]{0,6} \d{4} - Present|\d{4} - \d{4}|\d{4} - Present', re.IGNORECASE)
+
+# (?<!\d) starts a number only at its first digit instead of at every digit of a long run
+GPA_PATTERN = re.compile(r'GPA:? \d+\.\d+|(?<!\d)\d+\.\d+/\d+\.\d+ GPA')
+GPA_VALUE_PATTERN = re.compile(r'\d+\.\d+')
+
+JOB_TITLE_PATTERNS = [
+    # Whitespace is only allowed after a seniority word; a leading optional \s* made every
+    # position of a whitespace run a match attempt that scanned to its end
+    re.compile(r'(?:(?:Senior|Junior|Lead|Principal)\s*)?(?:Software|Systems|Data|Full Stack|Frontend|Backend|Web|Mobile|Cloud|DevOps|QA|Test)\s*(?:Engineer|Developer|Architect|Analyst|Scientist)', re.IGNORECASE),
+    re.compile(r'(?:Project|Product|Program)\s*Manager', re.IGNORECASE),
+    re.compile(r'(?:Director|VP|CTO|CEO|CIO|COO)', re.IGNORECASE)
+]
+
+# Nothing after the final runs below can fail, so each is scanned once; (?<!\d) keeps a
+# numbered bullet from being retried at every digit of a long number
+COMPANY_PATTERN = re.compile(r'(?:at|for|with) ([\w\s]+)', re.IGNORECASE)
+RESPONSIBILITY_PATTERN = re.compile(r'(?:•|\*|\-|(?<!\d)\d+\.)\s*([\w\s\.,;:]+)')
+
+# Bump when extraction logic changes so cached parses from older code are not reused
+EXTRACTOR_VERSION = "2"
+# Bump when calculate_ats_score changes; stored scores from older versions are re-scored by rescore.py
+SCORING_VERSION = "1"
+
+# Progress stages reported while analyzing one file, in order
+ANALYSIS_STAGES = ["Reading file", "Extracting text", "Parsing", "Scoring", "Saving"]
+
+def parse_version(tokenizer, taxonomy=None):
+    """Version of the parse output: the extractor, the tokenizer name and the content of the skills taxonomy.
+
+    The tokenizers find different skill sets, so results and cache entries from one are not
+    current for the other.
+    """
+    return f"{EXTRACTOR_VERSION}-{tokenizer}-{(taxonomy or get_taxonomy()).version}"
+
+def cacheable(result):
+    """Whether a freshly analyzed result may go into the parse cache.
+
+    Text cut short by a page or character budget or by the timeout is not cached, so a later
+    run with larger limits extracts the whole document and reports any truncation itself.
+    """
+    return not result["cache_hit"] and not result["extraction"]["truncated"]
+
+def format_results(ats_score, parsed_data):
+    """Return the plain-text report shown for one analysis"""
+    lines = [f"ATS Score: {ats_score:.2f}%", "", "Skills Found:"]
+    for skill in parsed_data["skills"]:
+        relevance = ""
+        if skill.relevance_score == 3:
+            relevance = " (High Relevance)"
+        elif skill.relevance_score == 2:
+            relevance = " (Medium Relevance)"
+        lines.append(f"- {skill.name} [{skill.category}]{relevance}")
+
+    lines += ["", "Education:"]
+    for edu in parsed_data["education"]:
+        edu_str = f"- {edu.institution}"
+        if edu.degree:
+            edu_str += f", {edu.degree}"
+        if edu.start_date or edu.end_date:
+            edu_str += f" ({edu.start_date} - {edu.end_date})"
+        if edu.gpa:
+            edu_str += f", GPA: {edu.gpa}"
+        lines.append(edu_str)
+
+    lines += ["", "Experience:"]
+    for exp in parsed_data["experience"]:
+        exp_str = f"- {exp.position}"
+        if exp.company:
+            exp_str += f" at {exp.company}"
+        if exp.start_date or exp.end_date:
+            exp_str += f" ({exp.start_date} - {exp.end_date})"
+        lines.append(exp_str)
+        if exp.responsibilities:
+            lines.append(f"  Responsibilities: {exp.responsibilities}")
+    return "\n".join(lines) + "\n"
 
 class ResumeParser:
-    def __init__(self, user_id=None):
+    def __init__(self, user_id=None, db_path=DB_PATH, headless=False, tokenizer="nltk",
+                 extraction_limits=DEFAULT_LIMITS, record_timings=False):
         self.user_id = user_id
-        self.init_db()
-        self.stop_words = set(stopwords.words('english'))
-        self.create_ui()
+        # When enabled, analyze_pdf gives each document a fresh StageTimer
+        self.record_timings = record_timings
+        self.timer = None
+        self.tokenizer = get_tokenizer(tokenizer)
+        self.extraction_limits = extraction_limits
+        self.db_path = db_path
+        self.conn = None
+        self.parse_cache = None
+        # Batch workers only parse, so they run without a database connection
+        if db_path is not None:
+            self.init_db()
+        self.stop_words = get_stop_words()
+        if not headless:
+            self.create_ui()
 
     def init_db(self):
-        self.conn = sqlite3.connect('resumes_analyzer_ATS.db')
-        self.cursor = self.conn.cursor()
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS resume_scores (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER,
-            filename TEXT,
-            ats_score REAL,
-            resume_text TEXT,
-            parsed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-        ''')
-        
-        
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS skills (
-            id INTEGER PRIMARY KEY,
-            resume_id INTEGER,
-            skill_name TEXT,
-            category TEXT,
-            relevance_score INTEGER DEFAULT 0,
-            FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
-        )
-        ''')
-        
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS education (
-            id INTEGER PRIMARY KEY,
-            resume_id INTEGER,
-            institution TEXT,
-            degree TEXT,
-            field_of_study TEXT,
-            start_date TEXT,
-            end_date TEXT,
-            gpa REAL,
-            FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
-        )
-        ''')
-        
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS experience (
-            id INTEGER PRIMARY KEY,
-            resume_id INTEGER,
-            company TEXT,
-            position TEXT,
-            location TEXT,
-            start_date TEXT,
-            end_date TEXT,
-            description TEXT,
-            responsibilities TEXT,
-            FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
-        )
-        ''')
-        
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS resumes (
-            id INTEGER PRIMARY KEY,
-            user_id INTEGER NOT NULL,
-            resume_score_id INTEGER,
-            filename TEXT,
-            skills_count INTEGER DEFAULT 0,
-            education_count INTEGER DEFAULT 0,
-            experience_count INTEGER DEFAULT 0,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            FOREIGN KEY (resume_score_id) REFERENCES resume_scores (id)
-        )
-        ''')
-        
+        # Borrowed from the process-wide pool that the auth system also uses
+        self.pool = persistence.get_pool(self.db_path)
+        self.conn = self.pool.acquire()
+        persistence.create_schema(self.conn)
+        persistence.migrate(self.conn)
+        self.writer = persistence.ResultWriter(self.conn, scoring_version=SCORING_VERSION)
+        self.parse_cache = ParseCache(self.conn)
         self.conn.commit()
+
+    def release_db(self):
+        """Return the database connection to the pool"""
+        if self.conn is not None:
+            self.pool.release(self.conn)
+            self.conn = None
         
     def extract_text_from_pdf(self, pdf_path):
-        text = ""
         try:
             with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num in range(len(pdf_reader.pages)):
-                    text += pdf_reader.pages[page_num].extract_text()
-            return text
-        except Exception as e:
+                return self.extract_text_from_stream(file)
+        except OSError as e:
             print(f"Error extracting text from PDF: {e}")
             return ""
-    
-    def parse_resume(self, text):
-        tokens = word_tokenize(text.lower())
-        filtered_tokens = [word for word in tokens if word is not None and word.isalnum() and word not in self.stop_words]
-        skills = self.extract_skills(filtered_tokens, text.lower())
-        education = self.extract_education(text)
-        experience = self.extract_experience(text)
+
+    def extract_text_from_stream(self, stream):
+        return self.extract_pdf(stream)[0]
+
+    @timed("extract_text")
+    def extract_pdf(self, stream):
+        """Return (text, info) within this parser's extraction limits; see pdf_extraction.iter_pdf_pages"""
+        try:
+            return extract_pdf_text(stream, self.extraction_limits)
+        except Exception as e:
+            print(f"Error extracting text from PDF: {e}")
+            return "", None
+
+    def analyze_pdf(self, pdf_path, store=True, progress=None):
+        """Extract, parse and score a PDF, reusing the cached parse of an identical file.
+
+        Returns a dict with text, parsed_data, ats_score, parse_version (of the tokenizer and
+        skills taxonomy the document was parsed with), cache_key, cache_hit, extraction (the page/char/timing
+        info from extract_pdf, None on a cache hit) and metrics (stage timings for
+        save_results, None unless record_timings is on), or None when no text
+        could be extracted. With store=False the cache is only read, which is how batch
+        workers use it while the writer process records new entries. progress, if given,
+        is called with each stage name from ANALYSIS_STAGES as it starts.
+        """
+        progress = progress or (lambda stage: None)
+        progress("Reading file")
+        with open(pdf_path, 'rb') as file:
+            pdf_bytes = file.read()
+        return self.analyze_bytes(pdf_bytes, store, progress)
+
+    def analyze_bytes(self, pdf_bytes, store=True, progress=None):
+        """Same as analyze_pdf for a PDF that is already in memory"""
+        progress = progress or (lambda stage: None)
+        self.timer = StageTimer() if self.record_timings else None
+        cache = self.parse_cache
+        # One taxonomy for the whole document, even if the file is reloaded meanwhile
+        taxonomy = get_taxonomy()
+        version = parse_version(self.tokenizer.name, taxonomy)
+        cache_key = pdf_cache_key(pdf_bytes, version)
+        cached = cache.get(cache_key, touch=store) if cache else None
+        extraction = None
+        if cached:
+            text, parsed_data = cached
+        else:
+            progress("Extracting text")
+            text, extraction = self.extract_pdf(io.BytesIO(pdf_bytes))
+            if not text:
+                return None
+            progress("Parsing")
+            parsed_data = self.parse_resume(text, taxonomy)
+            if store and cache and not extraction["truncated"]:
+                cache.put(cache_key, text, parsed_data)
+        if store and cache:
+            self.conn.commit()
+        progress("Scoring")
+        ats_score = self.calculate_ats_score(parsed_data)
+        metrics = None
+        if self.timer is not None:
+            metrics = {
+                "timings": self.timer.durations,
+                "page_count": extraction["pages_read"] if extraction else None,
+                "text_length": len(text)
+            }
+            self.timer = None
         return {
-            "skills": skills,
-            "education": education,
-            "experience": experience
+            "text": text,
+            "parsed_data": parsed_data,
+            "ats_score": ats_score,
+            "parse_version": version,
+            "cache_key": cache_key,
+            "cache_hit": cached is not None,
+            "extraction": extraction,
+            "metrics": metrics
         }
     
-    def extract_skills(self, tokens, text):
-        skills_list = [
-            "Python", "Java", "Javascript", "HTML", "CSS", "SQL", "NoSQL", 
-            "React", "Angular", "Vue", "Node", "Express", "Django", "Flask",
-            "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Git", "Agile",
-            "Scrum", "Machine Learning", "Data Analysis", "Data Science",
-            "TensorFlow", "PyTorch", "NLP", "Computer Vision"
-        ]
-        
-        technical_skills = [
-            "Python", "Java", "Javascript", "HTML", "CSS", "SQL", "NoSQL", 
-            "React", "Angular", "Vue", "Node", "Express", "Django", "Flask",
-            "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Git"
-        ]
-        
-        soft_skills = [
-            "Communication", "Leadership", "Teamwork", "Problem Solving",
-            "Critical Thinking", "Time Management", "Adaptability"
-        ]
-        
-        domain_skills = [
-            "Machine Learning", "Data Analysis", "Data Science",
-            "TensorFlow", "PyTorch", "NLP", "Computer Vision", "Agile",
-            "Scrum"
-        ]
-        
-        skills_found = []
-        
-        for skill in skills_list:
-            if skill in tokens or re.search(r'\b' + re.escape(skill) + r'\b', text):
-                category = "Technical"
-                if skill in soft_skills:
-                    category = "Soft"
-                elif skill in domain_skills:
-                    category = "Domain"
-                
-                skills_found.append({
-                    "name": skill,
-                    "category": category,
-                    "relevance_score": 0  
-                })
-        
-        return skills_found
+    @timed("parse")
+    def parse_resume(self, text, taxonomy=None):
+        tokens = self.tokenizer.tokenize(text)
+        filtered_tokens = [word for word in tokens if word not in self.stop_words]
+        skills = self.extract_skills(filtered_tokens, taxonomy)
+        sections = segment_sections(text)
+        education = self.extract_education(text, sections)
+        experience = self.extract_experience(text, sections)
+        return ParsedResume(skills=skills, education=education, experience=experience)
     
-    def extract_education(self, text):
+    @timed("skills")
+    def extract_skills(self, tokens, taxonomy=None):
+        # Skills and their synonyms are matched over the stopword-filtered tokens in one pass
+        matcher = (taxonomy or get_taxonomy()).matcher
+        return [Skill(skill, matcher.category(skill)) for skill in matcher.match_tokens(tokens)]
+    
+    @timed("education")
+    def extract_education(self, text, sections=None):
         education = []
-        
-        education_patterns = [
-            r'(?i)(?:Bachelor|BS|BA|Master|MS|MA|PhD|Doctorate|Associate)(?:\s+of\s+|\s+in\s+|\s+)(?:Science|Arts|Engineering|Business|Administration|Computer Science|Information Technology|Financial Technology|Data Science)',
-            r'(?i)(?:University|College|Institute|School) of [\w\s]+',
-            r'(?i)(?:High School|Secondary School|School) of [\w\s]+'
-        ]
-        
-        date_pattern = r'(?i)(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4} - (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4} - Present|\d{4} - \d{4}|\d{4} - Present'
-
-        gpa_pattern = r'GPA:? \d+\.\d+|\d+\.\d+/\d+\.\d+ GPA'
-        
-        for pattern in education_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                edu_entry = {
-                    "institution": match,
-                    "degree": "",
-                    "field_of_study": "",
-                    "start_date": "",
-                    "end_date": "",
-                    "gpa": None
-                }
-                
-                degree_match = re.search(r'(?i)(?:Bachelor|BS|BA|Master|MS|MA|PhD|Doctorate|Associate)(?:\s+of\s+|\s+in\s+|\s+)(?:Science|Arts|Engineering|Business|Administration|Computer Science|Information Technology|Financial Technology|Data Science)', text[max(0, text.find(match)-100):text.find(match)+len(match)+100])
-                if degree_match:
-                    edu_entry["degree"] = degree_match.group(0)
-                
-                date_match = re.search(date_pattern, text[max(0, text.find(match)-100):text.find(match)+len(match)+100])
-                if date_match:
-                    dates = date_match.group(0).split(' - ')
-                    if len(dates) == 2:
-                        edu_entry["start_date"] = dates[0]
-                        edu_entry["end_date"] = dates[1]
-                
-                gpa_match = re.search(gpa_pattern, text[max(0, text.find(match)-100):text.find(match)+len(match)+100])
-                if gpa_match:
-                    gpa_text = gpa_match.group(0)
-                    gpa_value = re.search(r'\d+\.\d+', gpa_text)
-                    if gpa_value:
-                        edu_entry["gpa"] = float(gpa_value.group(0))
-                education.append(edu_entry)
+        for section_start, section_end in section_spans(sections, "education", len(text)):
+            for pattern in EDUCATION_PATTERNS:
+                for match in pattern.finditer(text, section_start, section_end):
+                    degree, start_date, end_date, gpa = "", "", "", None
+                    window_start = max(section_start, match.start() - 100)
+                    window_end = min(section_end, match.end() + 100)
+                    
+                    degree_match = DEGREE_PATTERN.search(text, window_start, window_end)
+                    if degree_match:
+                        degree = degree_match.group(0)
+                    
+                    date_match = DATE_RANGE_PATTERN.search(text, window_start, window_end)
+                    if date_match:
+                        dates = date_match.group(0).split(' - ')
+                        if len(dates) == 2:
+                            start_date, end_date = dates
+                    
+                    gpa_match = GPA_PATTERN.search(text, window_start, window_end)
+                    if gpa_match:
+                        gpa_value = GPA_VALUE_PATTERN.search(gpa_match.group(0))
+                        if gpa_value:
+                            gpa = float(gpa_value.group(0))
+                    education.append(Education(match.group(0), degree, "", start_date, end_date, gpa))
         return education
     
-    def extract_experience(self, text):
+    @timed("experience")
+    def extract_experience(self, text, sections=None):
         experience = []
-        job_titles = [
-            r'(?i)(?:Senior|Junior|Lead|Principal)?\s*(?:Software|Systems|Data|Full Stack|Frontend|Backend|Web|Mobile|Cloud|DevOps|QA|Test)\s*(?:Engineer|Developer|Architect|Analyst|Scientist)',
-            r'(?i)(?:Project|Product|Program)\s*Manager',
-            r'(?i)(?:Director|VP|CTO|CEO|CIO|COO)'
-        ]
-        company_pattern = r'(?i)(?:at|for|with) ([\w\s]+)'
-        date_pattern = r'(?i)(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4} - (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4} - Present|\d{4} - \d{4}|\d{4} - Present'
-        
-        for pattern in job_titles:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                exp_entry = {
-                    "position": match,
-                    "company": "",
-                    "location": "",
-                    "start_date": "",
-                    "end_date": "",
-                    "description": "",
-                    "responsibilities": ""
-                }
-                
-                company_match = re.search(company_pattern, text[max(0, text.find(match)-50):text.find(match)+len(match)+100])
-                if company_match and len(company_match.groups()) > 0:
-                    exp_entry["company"] = company_match.group(1)
-                
-                date_match = re.search(date_pattern, text[max(0, text.find(match)-100):text.find(match)+len(match)+100])
-                if date_match:
-                    dates = date_match.group(0).split(' - ')
-                    if len(dates) == 2:
-                        exp_entry["start_date"] = dates[0]
-                        exp_entry["end_date"] = dates[1]
-                
-                resp_pattern = r'(?:•|\*|\-|\d+\.)\s*([\w\s\.,;:]+)'
-                resp_matches = re.findall(resp_pattern, text[text.find(match):text.find(match)+500])
-                if resp_matches:
-                    exp_entry["responsibilities"] = "; ".join(resp_matches)
-                
-                experience.append(exp_entry)
+        for section_start, section_end in section_spans(sections, "experience", len(text)):
+            for pattern in JOB_TITLE_PATTERNS:
+                for match in pattern.finditer(text, section_start, section_end):
+                    company, start_date, end_date, responsibilities = "", "", "", ""
+                    
+                    company_match = COMPANY_PATTERN.search(
+                        text, max(section_start, match.start() - 50), min(section_end, match.end() + 100))
+                    if company_match:
+                        company = company_match.group(1)
+                    
+                    date_match = DATE_RANGE_PATTERN.search(
+                        text, max(section_start, match.start() - 100), min(section_end, match.end() + 100))
+                    if date_match:
+                        dates = date_match.group(0).split(' - ')
+                        if len(dates) == 2:
+                            start_date, end_date = dates
+                    
+                    resp_matches = RESPONSIBILITY_PATTERN.findall(
+                        text, match.start(), min(section_end, match.start() + 500))
+                    if resp_matches:
+                        responsibilities = "; ".join(resp_matches)
+                    
+                    experience.append(Experience(company, match.group(0), "", start_date, end_date, "",
+                                                 responsibilities))
         
         return experience
     
+    def analyze_text(self, text):
+        """Run parsing and scoring on extracted text, returning (parsed_data, ats_score)"""
+        parsed_data = self.parse_resume(text)
+        return parsed_data, self.calculate_ats_score(parsed_data)
+
+    @timed("score")
     def calculate_ats_score(self, parsed_data):
         score = 0
         max_score = 100
@@ -278,135 +336,185 @@ class ResumeParser:
         
         return (score / max_score) * 100
     
-    def save_results(self, filename, ats_score, parsed_data, resume_text):
+    def save_results(self, filename, ats_score, parsed_data, resume_text, metrics=None, parse_version=None):
         try:
-            self.conn.execute("BEGIN TRANSACTION")
-            self.cursor.execute(
-                """INSERT INTO resume_scores 
-                   (user_id, filename, ats_score, resume_text) 
-                   VALUES (?, ?, ?, ?)""",
-                (self.user_id, filename, ats_score, resume_text)
-            )
-            resume_id = self.cursor.lastrowid
-            skills_count = len(parsed_data["skills"])
-            education_count = len(parsed_data["education"])
-            experience_count = len(parsed_data["experience"])
-            self.cursor.execute(
-                """INSERT INTO resumes 
-                   (user_id, resume_score_id, filename, 
-                    skills_count, education_count, experience_count) 
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (self.user_id, resume_id, filename, 
-                 skills_count, education_count, experience_count)
-            )
-
-            for skill in parsed_data["skills"]:
-                self.cursor.execute(
-                    """INSERT INTO skills 
-                       (resume_id, skill_name, category, relevance_score) 
-                       VALUES (?, ?, ?, ?)""",
-                    (resume_id, skill["name"], skill["category"], skill["relevance_score"])
-                )
-                
-            for edu in parsed_data["education"]:
-                self.cursor.execute(
-                    """INSERT INTO education 
-                       (resume_id, institution, degree, field_of_study, start_date, end_date, gpa) 
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (resume_id, edu["institution"], edu["degree"], edu["field_of_study"], 
-                     edu["start_date"], edu["end_date"], edu["gpa"])
-                )
-
-            for exp in parsed_data["experience"]:
-                self.cursor.execute(
-                    """INSERT INTO experience 
-                       (resume_id, company, position, location, start_date, end_date, description, responsibilities) 
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (resume_id, exp["company"], exp["position"], exp["location"], 
-                     exp["start_date"], exp["end_date"], exp["description"], exp["responsibilities"])
-                )
-            
-            self.conn.commit()
+            self.writer.add(self.user_id, filename, ats_score, parsed_data, resume_text, metrics, parse_version)
+            self.writer.flush()
             return True
         except Exception as e:
-            self.conn.rollback()
             print(f"Error saving results: {e}")
             return False
-    
+
     def browse_file(self):
-        filename = filedialog.askopenfilename(
+        filenames = filedialog.askopenfilenames(
             initialdir="/",
-            title="Select Resume. Only PDF files are supported",
+            title="Select Resumes. Only PDF files are supported",
             filetypes=(("PDF files", "*.pdf"), ("All files", "*.*"))
         )
-        if filename:
-            self.file_path.set(filename)
+        if filenames:
+            self.selected_files = list(filenames)
+            self.file_path.set("; ".join(filenames))
     
     def process_resume(self):
-        file_path = self.file_path.get()
-        if not file_path:
+        entry = self.file_path.get().strip()
+        if not entry:
             messagebox.showerror("Error", "Select a PDF file.")
             return
-        if not file_path.lower().endswith('.pdf'):
-            messagebox.showerror("Error", "Only PDF files are supported")
+        # The entry holds the browsed selection unless the user typed a path over it
+        if entry == "; ".join(self.selected_files):
+            file_paths = self.selected_files
+        else:
+            file_paths = [entry]
+        
+        for file_path in file_paths:
+            if not file_path.lower().endswith('.pdf'):
+                messagebox.showerror("Error", f"Only PDF files are supported: {os.path.basename(file_path)}")
+                return
+            if not os.path.isfile(file_path):
+                messagebox.showerror("Error", f"File not found: {file_path}")
+                return
+        
+        for file_path in file_paths:
+            job_id = self.worker.submit(file_path)
+            self.queue_list.insert(tk.END, f"{os.path.basename(file_path)} - Queued")
+            self.job_rows[job_id] = (self.queue_list.size() - 1, os.path.basename(file_path))
+        self.file_path.set("")
+        self.selected_files = []
+
+    def poll_results(self):
+        """Apply worker events on the Tk thread, then reschedule"""
+        try:
+            while True:
+                self.handle_worker_event(*self.results.get_nowait())
+        except queue.Empty:
+            pass
+        self.root.after(100, self.poll_results)
+
+    def handle_worker_event(self, kind, job_id, payload):
+        row, filename = self.job_rows[job_id]
+        if kind == "progress":
+            stage = ANALYSIS_STAGES.index(payload) + 1
+            self.progress_bar["value"] = stage * 100 / len(ANALYSIS_STAGES)
+            self.status_text.set(f"{filename}: {payload}...")
+            status = payload
+        elif kind == "error":
+            self.progress_bar["value"] = 0
+            self.status_text.set(f"{filename}: {payload}")
+            status = f"Failed: {payload}"
+        else:
+            result, saved = payload
+            self.progress_bar["value"] = 100
+            self.status_text.set(f"{filename}: ATS score {result['ats_score']:.2f}%")
+            status = f"Done, ATS score {result['ats_score']:.2f}%"
+            if not saved:
+                status += " (not saved)"
+            self.show_results(result["ats_score"], result["parsed_data"])
+        self.queue_list.delete(row)
+        self.queue_list.insert(row, f"{filename} - {status}")
+
+    def show_results(self, ats_score, parsed_data):
+        # One insert for the whole report; Text widgets re-layout after every insert
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, format_results(ats_score, parsed_data))
+
+    def open_history(self):
+        """Window listing this user's saved analyses, newest first, fetched a page at a time as it scrolls"""
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.lift()
             return
-        
-        if not os.path.isfile(file_path):
-            messagebox.showerror("Error", "File not found")
+        window = self.history_window = tk.Toplevel(self.root)
+        window.title("Analysis History")
+        window.geometry("800x600")
+
+        header = ttk.Frame(window)
+        header.pack(fill=tk.X, padx=10, pady=(10, 0))
+        self.history_summary = tk.StringVar()
+        ttk.Label(header, textvariable=self.history_summary).pack(side=tk.LEFT)
+        ttk.Button(header, text="Refresh", command=self.reload_history).pack(side=tk.RIGHT)
+
+        list_frame = ttk.Frame(window)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        columns = (
+            ("filename", "File", 260, tk.W), ("score", "ATS Score", 80, tk.E), ("date", "Analyzed", 140, tk.W),
+            ("skills", "Skills", 60, tk.E), ("education", "Education", 70, tk.E), ("experience", "Experience", 70, tk.E)
+        )
+        tree = self.history_tree = ttk.Treeview(
+            list_frame, columns=[column[0] for column in columns], show="headings", selectmode="browse", height=12)
+        for column, heading, width, anchor in columns:
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor=anchor)
+        scrollbar = ttk.Scrollbar(list_frame, command=tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            # Fetch the next page once the end of what is loaded comes into view
+            if float(last) > 0.9 and not self.history_exhausted and not self.history_loading:
+                self.history_loading = True
+                self.root.after_idle(self.load_history_page)
+        tree.configure(yscrollcommand=on_scroll)
+        tree.bind("<<TreeviewSelect>>", self.show_history_details)
+
+        details_frame = ttk.LabelFrame(window, text="Details")
+        details_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 10))
+        self.history_text_button = ttk.Button(
+            details_frame, text="Show Resume Text", command=self.show_history_text, state=tk.DISABLED)
+        self.history_text_button.pack(anchor=tk.E, padx=5, pady=(5, 0))
+        self.history_details = tk.Text(details_frame, wrap=tk.WORD, height=12)
+        self.history_details.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        details_scrollbar = ttk.Scrollbar(self.history_details, command=self.history_details.yview)
+        details_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.history_details.config(yscrollcommand=details_scrollbar.set)
+
+        self.reload_history()
+
+    def reload_history(self):
+        self.history_tree.delete(*self.history_tree.get_children())
+        self.history_scores = {}
+        self.history_last_id = None
+        self.history_exhausted = False
+        self.history_loading = True
+        self.history_summary.set(f"{history_count(self.conn, self.user_id)} saved analyses")
+        self.load_history_page()
+
+    def load_history_page(self):
+        rows = history_page(self.conn, self.user_id, self.history_last_id)
+        for resume_id, filename, ats_score, parsed_date, skills, education, experience in rows:
+            self.history_scores[resume_id] = ats_score
+            self.history_tree.insert("", tk.END, iid=str(resume_id), values=(
+                filename, f"{ats_score:.2f}%", parsed_date, skills, education, experience))
+        if rows:
+            self.history_last_id = rows[-1][0]
+        self.history_exhausted = len(rows) < HISTORY_PAGE_SIZE
+        self.history_loading = False
+
+    def show_history_details(self, event=None):
+        selection = self.history_tree.selection()
+        if not selection:
             return
-        
-        text = self.extract_text_from_pdf(file_path)
-        
-        if not text:
-            messagebox.showerror("Error", "Could not extract text from the PDF")
+        resume_id = int(selection[0])
+        # Details are read only for the row that was clicked
+        report = format_results(self.history_scores[resume_id], load_details(self.conn, resume_id))
+        self.history_details.delete(1.0, tk.END)
+        self.history_details.insert(tk.END, report)
+        self.history_text_button.config(state=tk.NORMAL)
+
+    def show_history_text(self):
+        selection = self.history_tree.selection()
+        if not selection:
             return
-        
-        parsed_data = self.parse_resume(text)
-            
-        ats_score = self.calculate_ats_score(parsed_data)
-        
-        filename = os.path.basename(file_path)
-        saved = self.save_results(filename, ats_score, parsed_data, text)
-        
-        self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, f"ATS Score: {ats_score:.2f}%\n\n")
-        
-        self.result_text.insert(tk.END, "Skills Found:\n")
-        for skill in parsed_data["skills"]:
-            relevance = ""
-            if skill["relevance_score"] == 3:
-                relevance = " (High Relevance)"
-            elif skill["relevance_score"] == 2:
-                relevance = " (Medium Relevance)"
-            
-            self.result_text.insert(tk.END, f"- {skill['name']} [{skill['category']}]{relevance}\n")
-        
-        self.result_text.insert(tk.END, "\nEducation:\n")
-        for edu in parsed_data["education"]:
-            edu_str = (f"- {edu['institution']}")
-            if edu["degree"]:
-                edu_str += f", {edu['degree']}"
-            if edu["start_date"] or edu["end_date"]:
-                edu_str += f" ({edu['start_date']} - {edu['end_date']})"
-            if edu["gpa"]:
-                edu_str += f", GPA: {edu['gpa']}"
-            self.result_text.insert(tk.END, f"{edu_str}\n")
-        
-        self.result_text.insert(tk.END, "\nExperience:\n")
-        for exp in parsed_data["experience"]:
-            exp_str = f"- {exp['position']}"
-            if exp["company"]:
-                exp_str += f" at {exp['company']}"
-            if exp["start_date"] or exp["end_date"]:
-                exp_str += f" ({exp['start_date']} - {exp['end_date']})"
-            self.result_text.insert(tk.END, f"{exp_str}\n")
-            if exp["responsibilities"]:
-                self.result_text.insert(tk.END, f"  Responsibilities: {exp['responsibilities']}\n")
-        
-        if saved:
-            messagebox.showinfo("Success", f"Resume analyzed, ATS score: {ats_score:.2f}%")
+        text = load_text(self.conn, int(selection[0]))
+        self.history_details.insert(tk.END, f"\nResume Text:\n{text or '(not stored)'}\n")
+        self.history_text_button.config(state=tk.DISABLED)
+
+    def close(self):
+        self.worker.stop()
+        self.root.destroy()
+        self.release_db()
 
     def create_ui(self):
+        _load_tkinter()
         self.root = tk.Tk()
         self.root.title("Resume Analyzer")
         self.root.geometry("800x600")
@@ -424,13 +532,31 @@ class ResumeParser:
         file_frame.pack(fill=tk.X, pady=10)
         
         self.file_path = tk.StringVar()
+        self.selected_files = []
         
-        ttk.Label(file_frame, text="Select Resume PDF:").pack(side=tk.LEFT, padx=5)
+        ttk.Label(file_frame, text="Select Resume PDFs:").pack(side=tk.LEFT, padx=5)
         ttk.Entry(file_frame, textvariable=self.file_path, width=50).pack(side=tk.LEFT, padx=5)
         ttk.Button(file_frame, text="Browse", command=self.browse_file).pack(side=tk.LEFT, padx=5)
         
-        # Process button
-        ttk.Button(main_frame, text="Analyze Resume", command=self.process_resume).pack(pady=10)
+        # Process and history buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="Analyze Resume", command=self.process_resume).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="History", command=self.open_history).pack(side=tk.LEFT, padx=5)
+        self.history_window = None
+        
+        # Queue and progress
+        queue_frame = ttk.LabelFrame(main_frame, text="Queue")
+        queue_frame.pack(fill=tk.X, pady=5)
+        
+        self.queue_list = tk.Listbox(queue_frame, height=5)
+        self.queue_list.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.progress_bar = ttk.Progressbar(queue_frame, mode="determinate", maximum=100)
+        self.progress_bar.pack(fill=tk.X, padx=5)
+        
+        self.status_text = tk.StringVar(value="Idle")
+        ttk.Label(queue_frame, textvariable=self.status_text).pack(anchor=tk.W, padx=5, pady=(0, 5))
         
         # Results area
         result_frame = ttk.LabelFrame(main_frame, text="Analysis Results")
@@ -444,7 +570,67 @@ class ResumeParser:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.result_text.config(yscrollcommand=scrollbar.set)
         
+        # Analysis runs on a worker thread with its own database connection
+        self.results = queue.Queue()
+        self.job_rows = {}
+        self.worker = AnalysisWorker(self.user_id, self.db_path, self.results, self.record_timings)
+        self.worker.start()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.root.after(100, self.poll_results)
+        
         self.root.mainloop()
 
+class AnalysisWorker(threading.Thread):
+    """Background thread that analyzes and saves queued PDFs, reporting events on a results queue.
+
+    Events are (kind, job_id, payload) tuples: ("progress", id, stage), ("error", id, message)
+    and ("done", id, (result, saved)).
+    """
+
+    def __init__(self, user_id, db_path, results, record_timings=False):
+        super().__init__(daemon=True)
+        self.user_id = user_id
+        self.db_path = db_path
+        self.record_timings = record_timings
+        self.results = results
+        self.jobs = queue.Queue()
+        self.next_job_id = 0
+
+    def submit(self, pdf_path):
+        self.next_job_id += 1
+        self.jobs.put((self.next_job_id, pdf_path))
+        return self.next_job_id
+
+    def stop(self):
+        self.jobs.put(None)
+
+    def run(self):
+        # The worker borrows its own connection rather than sharing the GUI's
+        parser = ResumeParser(
+            user_id=self.user_id, db_path=self.db_path, headless=True, record_timings=self.record_timings)
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                self.analyze(parser, *job)
+        finally:
+            parser.release_db()
+
+    def analyze(self, parser, job_id, pdf_path):
+        try:
+            result = parser.analyze_pdf(
+                pdf_path, progress=lambda stage: self.results.put(("progress", job_id, stage)))
+            if not result:
+                self.results.put(("error", job_id, "Could not extract text from the PDF"))
+                return
+            self.results.put(("progress", job_id, "Saving"))
+            saved = parser.save_results(
+                os.path.basename(pdf_path), result["ats_score"], result["parsed_data"], result["text"],
+                result["metrics"], result["parse_version"])
+            self.results.put(("done", job_id, (result, saved)))
+        except Exception as e:
+            self.results.put(("error", job_id, str(e)))
+
 if __name__ == "__main__":
     parser = ResumeParser()
\ No newline at end of file
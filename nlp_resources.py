@@ -0,0 +1,52 @@
+# On-first-use access to NLTK resources. Nothing here runs at import time and nothing is
+# downloaded implicitly: missing NLTK data falls back to the bundled stopword list or to
+# tokenization without the Punkt model. Run this module once to install the full data packs.
+from stopwords_en import ENGLISH_STOP_WORDS
+
+NLTK_PACKAGES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+}
+
+_stop_words = None
+_word_tokenize = None
+
+def _nltk_has(resource):
+    import nltk
+    try:
+        nltk.data.find(resource)
+        return True
+    except LookupError:
+        return False
+
+def get_stop_words():
+    global _stop_words
+    if _stop_words is None:
+        try:
+            from nltk.corpus import stopwords
+            _stop_words = frozenset(stopwords.words('english'))
+        except (ImportError, LookupError):
+            _stop_words = ENGLISH_STOP_WORDS
+    return _stop_words
+
+def get_word_tokenize():
+    """Return NLTK's word_tokenize, skipping Punkt sentence splitting when its model is not installed"""
+    global _word_tokenize
+    if _word_tokenize is None:
+        from nltk.tokenize import word_tokenize
+        if _nltk_has(NLTK_PACKAGES['punkt_tab']) or _nltk_has(NLTK_PACKAGES['punkt']):
+            _word_tokenize = word_tokenize
+        else:
+            _word_tokenize = lambda text: word_tokenize(text, preserve_line=True)
+    return _word_tokenize
+
+def download_nltk_data():
+    """Explicitly fetch any missing NLTK data packs (needs network access)"""
+    import nltk
+    for package, resource in NLTK_PACKAGES.items():
+        if not _nltk_has(resource):
+            nltk.download(package)
+
+if __name__ == "__main__":
+    download_nltk_data()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import time
+from result_records import parsed_from_json
+from text_store import compress_text, decompress_text
+
+CREATE_CACHE_TABLES_SQL = [
+    '''CREATE TABLE IF NOT EXISTS parse_cache (
+        cache_key TEXT PRIMARY KEY,
+        compressed_text BLOB,
+        parsed_data TEXT,
+        size_bytes INTEGER,
+        last_used REAL
+    )''',
+    "CREATE INDEX IF NOT EXISTS idx_parse_cache_last_used ON parse_cache (last_used)",
+]
+
+def drop_uncompressed(conn):
+    """Migration step: drop a cache that still keeps its text uncompressed; entries are cheap to re-create"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(parse_cache)")]
+    if "resume_text" in columns:
+        conn.execute("DROP TABLE parse_cache")
+
+def pdf_cache_key(pdf_bytes, version):
+    """Content address of a PDF for a given extractor/taxonomy version"""
+    return f"{hashlib.sha256(pdf_bytes).hexdigest()}:{version}"
+
+class ParseCache:
+    """Extracted text and parsed fields keyed on PDF content, stored in SQLite with size-bounded LRU eviction.
+
+    The table is created by the database migrations. The cache never commits; writes become
+    part of the caller's current transaction.
+    """
+
+    def __init__(self, conn, max_bytes=64 * 1024 * 1024):
+        self.conn = conn
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = None
+
+    def get(self, cache_key, touch=True):
+        """Return (resume_text, parsed_data) for a cached PDF, or None on a miss"""
+        row = self.conn.execute(
+            "SELECT compressed_text, parsed_data FROM parse_cache WHERE cache_key=?", (cache_key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if touch:
+            self.touch(cache_key)
+        return decompress_text(row[0]), parsed_from_json(json.loads(row[1]))
+
+    def touch(self, cache_key):
+        self.conn.execute("UPDATE parse_cache SET last_used=? WHERE cache_key=?", (time.time(), cache_key))
+
+    def put(self, cache_key, resume_text, parsed_data):
+        # Records are tuples, so entries are stored as value lists without their field names
+        payload = json.dumps(parsed_data)
+        compressed = compress_text(resume_text)
+        size_bytes = len(compressed) + len(payload)
+        if size_bytes > self.max_bytes:
+            return
+        previous = self.conn.execute(
+            "SELECT size_bytes FROM parse_cache WHERE cache_key=?", (cache_key,)
+        ).fetchone()
+        total_bytes = self.total_bytes()
+        self.conn.execute(
+            """INSERT OR REPLACE INTO parse_cache
+               (cache_key, compressed_text, parsed_data, size_bytes, last_used)
+               VALUES (?, ?, ?, ?, ?)""",
+            (cache_key, compressed, payload, size_bytes, time.time())
+        )
+        self._total_bytes = total_bytes + size_bytes - (previous[0] if previous else 0)
+        if self._total_bytes > self.max_bytes:
+            self.evict(self._total_bytes - self.max_bytes)
+
+    def evict(self, bytes_needed):
+        """Drop least recently used entries until at least bytes_needed have been freed"""
+        freed = 0
+        victims = []
+        for cache_key, size_bytes in self.conn.execute(
+            "SELECT cache_key, size_bytes FROM parse_cache ORDER BY last_used, rowid"
+        ):
+            victims.append((cache_key,))
+            freed += size_bytes
+            if freed >= bytes_needed:
+                break
+        self.conn.executemany("DELETE FROM parse_cache WHERE cache_key=?", victims)
+        self._total_bytes = self.total_bytes() - freed
+
+    def total_bytes(self):
+        if self._total_bytes is None:
+            self._total_bytes = self.conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM parse_cache"
+            ).fetchone()[0]
+        return self._total_bytes
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self.total_bytes()
+        }
@@ -0,0 +1,98 @@
+import argparse
+import time
+import tracemalloc
+
+class ExtractionLimits:
+    """Per-document budgets for PDF text extraction; None disables a limit.
+
+    The timeout is checked between pages, so a single pathological page can overrun it.
+    """
+    __slots__ = ("max_pages", "max_chars", "timeout")
+
+    def __init__(self, max_pages=50, max_chars=200000, timeout=30.0):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.timeout = timeout
+
+DEFAULT_LIMITS = ExtractionLimits()
+
+def iter_pdf_pages(stream, limits=DEFAULT_LIMITS, info=None):
+    """Yield the text of each page in order, stopping early once a limit is reached.
+
+    If info is a dict it is filled in as pages are read: total_pages, pages_read, chars,
+    page_errors and truncated (None, "pages", "chars" or "timeout").
+    """
+    import PyPDF2
+    info = {} if info is None else info
+    info.update(total_pages=0, pages_read=0, chars=0, page_errors=0, truncated=None)
+    deadline = time.perf_counter() + limits.timeout if limits.timeout is not None else None
+
+    pdf_reader = PyPDF2.PdfReader(stream)
+    if pdf_reader.is_encrypted:
+        pdf_reader.decrypt("")
+    info["total_pages"] = len(pdf_reader.pages)
+
+    for page in pdf_reader.pages:
+        if limits.max_pages is not None and info["pages_read"] >= limits.max_pages:
+            info["truncated"] = "pages"
+            return
+        if deadline is not None and time.perf_counter() > deadline:
+            info["truncated"] = "timeout"
+            return
+        info["pages_read"] += 1
+        try:
+            page_text = page.extract_text() or ""
+        except Exception:
+            # One damaged page should not discard the rest of the document
+            info["page_errors"] += 1
+            continue
+        if limits.max_chars is not None and info["chars"] + len(page_text) > limits.max_chars:
+            page_text = page_text[:limits.max_chars - info["chars"]]
+            info["chars"] += len(page_text)
+            info["truncated"] = "chars"
+            yield page_text
+            return
+        info["chars"] += len(page_text)
+        yield page_text
+
+def extract_pdf_text(stream, limits=DEFAULT_LIMITS, measure_memory=False):
+    """Return (text, info) for a PDF stream; info also holds seconds and, if requested, peak_memory_bytes"""
+    info = {}
+    if measure_memory:
+        import PyPDF2  # imported first so the module itself is not counted in the peak
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        text = "".join(iter_pdf_pages(stream, limits, info))
+    finally:
+        info["seconds"] = time.perf_counter() - start
+        if measure_memory:
+            info["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return text, info
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Extract text from PDFs and report per-document cost")
+    arg_parser.add_argument("pdfs", nargs="+")
+    arg_parser.add_argument("--max-pages", type=int, default=DEFAULT_LIMITS.max_pages)
+    arg_parser.add_argument("--max-chars", type=int, default=DEFAULT_LIMITS.max_chars)
+    arg_parser.add_argument("--timeout", type=float, default=DEFAULT_LIMITS.timeout)
+    args = arg_parser.parse_args(argv)
+
+    limits = ExtractionLimits(args.max_pages, args.max_chars, args.timeout)
+    for pdf_path in args.pdfs:
+        try:
+            with open(pdf_path, 'rb') as file:
+                _, info = extract_pdf_text(file, limits, measure_memory=True)
+        except Exception as e:
+            print(f"{pdf_path}: failed ({e})")
+            continue
+        print(
+            f"{pdf_path}: {info['pages_read']}/{info['total_pages']} pages, {info['chars']} chars, "
+            f"{info['seconds'] * 1000:.1f} ms, peak {info['peak_memory_bytes'] / 1024:.0f} KiB"
+            + (f", truncated ({info['truncated']})" if info["truncated"] else "")
+            + (f", {info['page_errors']} page errors" if info["page_errors"] else "")
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+import functools
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+import analytics
+from ingest_manifest import CREATE_MANIFEST_TABLES_SQL
+from instrumentation import CREATE_TIMINGS_SQL, INSERT_TIMINGS_SQL, timing_row
+from job_matcher import CREATE_MATCH_TABLES_SQL, TermIndexer, backfill as match_backfill
+from near_duplicates import CREATE_DEDUP_TABLES_SQL, DuplicateIndex, backfill as dedup_backfill
+from parse_cache import CREATE_CACHE_TABLES_SQL, drop_uncompressed as drop_uncompressed_cache
+from result_records import Education, Experience, ParsedResume, Skill
+from resume_search import CREATE_SEARCH_TABLES_SQL, INSERT_SEARCH_SQL, make_contentless
+from text_store import CREATE_TEXT_TABLES_SQL, INSERT_TEXT_SQL, move_texts, text_row
+
+# Connection settings for write-heavy ingest: WAL lets readers proceed during batch commits
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA busy_timeout=5000",
+]
+
+def add_version_columns(conn):
+    # Skips columns that already exist, e.g. in a database whose user_version was set back by hand
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(resume_scores)")}
+    for column in ("parse_version", "scoring_version"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE resume_scores ADD COLUMN {column} TEXT")
+
+# Schema changes applied in order on top of create_schema, tracked with PRAGMA user_version.
+# A step is either an SQL statement or a callable taking the connection.
+MIGRATIONS = [
+    (1, [
+        "CREATE INDEX IF NOT EXISTS idx_skills_resume_id ON skills (resume_id)",
+        "CREATE INDEX IF NOT EXISTS idx_education_resume_id ON education (resume_id)",
+        "CREATE INDEX IF NOT EXISTS idx_experience_resume_id ON experience (resume_id)",
+        "CREATE INDEX IF NOT EXISTS idx_resume_scores_user_id ON resume_scores (user_id)",
+    ]),
+    (2, [
+        CREATE_TIMINGS_SQL,
+    ]),
+    # Resumes already stored are indexed for matching as the tables are created
+    (3, CREATE_MATCH_TABLES_SQL + [functools.partial(match_backfill, commit=False)]),
+    (4, CREATE_SEARCH_TABLES_SQL),
+    # Existing resumes are signed oldest first so each group points at its earliest resume
+    (5, CREATE_DEDUP_TABLES_SQL + [functools.partial(dedup_backfill, commit=False)]),
+    # resume_scores.resume_text is kept for older readers but left NULL from here on
+    (6, CREATE_TEXT_TABLES_SQL + [move_texts]),
+    # Versions of the extractor/taxonomy and of the scoring weights each result was produced with;
+    # NULL for results saved before versions were recorded
+    (7, [add_version_columns]),
+    # Summary tables for the analytics queries, filled from the results already stored
+    (8, analytics.CREATE_ANALYTICS_TABLES_SQL + [analytics.rebuild]),
+    # The history view joins resumes on its resume_scores id
+    (9, [
+        "CREATE INDEX IF NOT EXISTS idx_resumes_resume_score_id ON resumes (resume_score_id)",
+    ]),
+    # Near-duplicates are no longer kept in the LSH buckets, only their originals
+    (10, [
+        """DELETE FROM resume_lsh WHERE resume_id IN
+           (SELECT resume_id FROM resume_signatures WHERE duplicate_of IS NOT NULL)""",
+    ]),
+    # The search index drops its uncompressed copy of every text; snippets read resume_texts
+    (11, [make_contentless]),
+    # Databases that got the match tables before they were filled by the migration
+    (12, [functools.partial(match_backfill, commit=False)]),
+    # The folder watcher's manifest, created by the watcher itself before this
+    (13, CREATE_MANIFEST_TABLES_SQL),
+    # The parse cache, created by ParseCache itself before this; an old uncompressed cache is dropped
+    (14, [drop_uncompressed_cache] + CREATE_CACHE_TABLES_SQL),
+]
+
+def connect(db_path):
+    conn = sqlite3.connect(db_path)
+    configure_connection(conn)
+    return conn
+
+def configure_connection(conn):
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+class ConnectionPool:
+    """Thread-safe pool of configured connections to one database.
+
+    Connections are opened on demand up to size and handed to one thread at a time.
+    Each keeps sqlite3's prepared statement cache, so callers that reuse constant SQL
+    strings skip re-compiling them.
+    """
+
+    def __init__(self, db_path, size=8, timeout=10.0):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.opened = 0
+        self.lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if self.opened < self.size:
+                self.opened += 1
+                try:
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                    configure_connection(conn)
+                    return conn
+                except Exception:
+                    self.opened -= 1
+                    raise
+        try:
+            return self.idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection free after {self.timeout}s") from None
+
+    def acquire(self):
+        """Borrow a connection until release(conn), for owners that keep one for their lifetime"""
+        return self._acquire()
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self.idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; the open transaction is committed on success and rolled back on error"""
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self.idle.put(conn)
+
+    def close(self):
+        with self.lock:
+            while True:
+                try:
+                    self.idle.get_nowait().close()
+                except queue.Empty:
+                    break
+                self.opened -= 1
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path, size=8):
+    """Return the process-wide pool for db_path, creating it on first use"""
+    with _pools_lock:
+        # A forked worker inherits the parent's pools, whose connections it must not use
+        pool = _pools.get((os.getpid(), db_path))
+        if pool is None:
+            pool = _pools[os.getpid(), db_path] = ConnectionPool(db_path, size)
+        return pool
+
+def create_schema(conn):
+    cursor = conn.cursor()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS resume_scores (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER,
+        filename TEXT,
+        ats_score REAL,
+        resume_text TEXT,
+        parsed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS skills (
+        id INTEGER PRIMARY KEY,
+        resume_id INTEGER,
+        skill_name TEXT,
+        category TEXT,
+        relevance_score INTEGER DEFAULT 0,
+        FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS education (
+        id INTEGER PRIMARY KEY,
+        resume_id INTEGER,
+        institution TEXT,
+        degree TEXT,
+        field_of_study TEXT,
+        start_date TEXT,
+        end_date TEXT,
+        gpa REAL,
+        FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS experience (
+        id INTEGER PRIMARY KEY,
+        resume_id INTEGER,
+        company TEXT,
+        position TEXT,
+        location TEXT,
+        start_date TEXT,
+        end_date TEXT,
+        description TEXT,
+        responsibilities TEXT,
+        FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS resumes (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        resume_score_id INTEGER,
+        filename TEXT,
+        skills_count INTEGER DEFAULT 0,
+        education_count INTEGER DEFAULT 0,
+        experience_count INTEGER DEFAULT 0,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (resume_score_id) REFERENCES resume_scores (id)
+    )
+    ''')
+    conn.commit()
+
+def migrate(conn, target_version=None):
+    """Apply any migrations newer than the database's user_version, up to target_version if given"""
+    for version, statements in MIGRATIONS:
+        if target_version is not None and version > target_version:
+            break
+        if version <= conn.execute("PRAGMA user_version").fetchone()[0]:
+            continue
+        # sqlite3 opens no implicit transaction before DDL, so each step gets an explicit one.
+        # IMMEDIATE takes the write lock first: a process migrating the same database at the
+        # same time waits here, then sees the new user_version and skips the step.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < version:
+                for statement in statements:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version={version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+INSERT_SKILL_SQL = "INSERT INTO skills (resume_id, skill_name, category, relevance_score) VALUES (?, ?, ?, ?)"
+INSERT_EDUCATION_SQL = """INSERT INTO education
+    (resume_id, institution, degree, field_of_study, start_date, end_date, gpa)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+INSERT_EXPERIENCE_SQL = """INSERT INTO experience
+    (resume_id, company, position, location, start_date, end_date, description, responsibilities)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+def add_parsed_rows(resume_id, parsed_data, skill_rows, education_rows, experience_rows):
+    """Append the skills, education and experience rows of one parsed resume to the given lists"""
+    # Records are tuples in column order, so each row is the resume id followed by the record
+    key = (resume_id,)
+    skill_rows.extend(key + skill for skill in parsed_data["skills"])
+    education_rows.extend(key + edu for edu in parsed_data["education"])
+    experience_rows.extend(key + exp for exp in parsed_data["experience"])
+
+def load_parsed_data(conn, resume_ids):
+    """Rebuild {resume_id: parsed_data} from the stored skills, education and experience rows"""
+    parsed = {resume_id: ParsedResume(skills=[], education=[], experience=[]) for resume_id in resume_ids}
+    placeholders = ", ".join("?" * len(parsed))
+    for row in conn.execute(
+            f"SELECT resume_id, skill_name, category, relevance_score FROM skills "
+            f"WHERE resume_id IN ({placeholders}) ORDER BY id", list(parsed)):
+        parsed[row[0]]["skills"].append(Skill(*row[1:]))
+    for row in conn.execute(
+            f"SELECT resume_id, institution, degree, field_of_study, start_date, end_date, gpa FROM education "
+            f"WHERE resume_id IN ({placeholders}) ORDER BY id", list(parsed)):
+        parsed[row[0]]["education"].append(Education(*row[1:]))
+    for row in conn.execute(
+            f"SELECT resume_id, company, position, location, start_date, end_date, description, responsibilities "
+            f"FROM experience WHERE resume_id IN ({placeholders}) ORDER BY id", list(parsed)):
+        parsed[row[0]]["experience"].append(Experience(*row[1:]))
+    return parsed
+
+class ResultWriter:
+    """Buffers analyzed resumes and writes them with executemany, committing a whole group at once"""
+
+    def __init__(self, conn, batch_size=100, parse_version=None, scoring_version=None, on_write=None):
+        self.conn = conn
+        self.batch_size = batch_size
+        # Called with the ids of each written group inside its transaction, before the commit,
+        # so callers can record their own rows atomically with the results
+        self.on_write = on_write
+        # Recorded on every row so stale results can be found and re-scored later
+        self.parse_version = parse_version
+        self.scoring_version = scoring_version
+        self.pending = []
+        self.indexer = TermIndexer(conn)
+        self.dedup = DuplicateIndex(conn)
+        # {resume_id: earliest resume_id it nearly duplicates} for everything this writer saved
+        self.duplicates = {}
+
+    def add(self, user_id, filename, ats_score, parsed_data, resume_text, metrics=None, parse_version=None):
+        """Queue one resume; returns the ids written if this filled the batch, otherwise [].
+
+        metrics, when given, holds the document's stage timings, page_count and text_length
+        and is recorded in resume_timings together with its share of the write time.
+        parse_version overrides the writer's default for this resume, e.g. when the skills
+        taxonomy was reloaded while a batch was being analyzed.
+        """
+        self.pending.append((user_id, filename, ats_score, parsed_data, resume_text, metrics,
+                             parse_version or self.parse_version))
+        if len(self.pending) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def flush(self):
+        """Write every queued resume in one transaction and return their resume_scores ids"""
+        if not self.pending:
+            return []
+        start = time.perf_counter()
+        try:
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            # Ids are assigned up front so child rows can be inserted with executemany;
+            # this is safe because the transaction already holds the write lock
+            next_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM resume_scores").fetchone()[0]
+            score_rows, resume_rows, skill_rows, education_rows, experience_rows = [], [], [], [], []
+            resume_ids, measured, parse_versions = [], [], []
+            for resume_id, queued in enumerate(self.pending, next_id):
+                user_id, filename, ats_score, parsed_data, resume_text, metrics, parse_version = queued
+                resume_ids.append(resume_id)
+                parse_versions.append(parse_version)
+                if metrics is not None:
+                    measured.append((resume_id, metrics))
+                score_rows.append((resume_id, user_id, filename, ats_score, resume_text))
+                resume_rows.append((
+                    user_id, resume_id, filename, len(parsed_data["skills"]),
+                    len(parsed_data["education"]), len(parsed_data["experience"])
+                ))
+                add_parsed_rows(resume_id, parsed_data, skill_rows, education_rows, experience_rows)
+
+            self.conn.executemany(
+                """INSERT INTO resume_scores (id, user_id, filename, ats_score, parse_version, scoring_version)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [row[:4] + (parse_version, self.scoring_version)
+                 for row, parse_version in zip(score_rows, parse_versions)]
+            )
+            self.conn.executemany(
+                INSERT_TEXT_SQL, [text_row(resume_id, resume_text) for resume_id, _, _, _, resume_text in score_rows])
+            self.conn.executemany(
+                """INSERT INTO resumes
+                   (user_id, resume_score_id, filename, skills_count, education_count, experience_count)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                resume_rows
+            )
+            self.conn.executemany(INSERT_SKILL_SQL, skill_rows)
+            self.conn.executemany(INSERT_EDUCATION_SQL, education_rows)
+            self.conn.executemany(INSERT_EXPERIENCE_SQL, experience_rows)
+            analytics.add(self.conn, resume_ids)
+            self.conn.executemany(
+                INSERT_SEARCH_SQL,
+                [(resume_id, resume_text or "") for resume_id, _, _, _, resume_text in score_rows]
+            )
+            self.indexer.index(
+                (resume_id, resume_text) for resume_id, _, _, _, resume_text in score_rows)
+            flagged = self.dedup.index(
+                (resume_id, resume_text) for resume_id, _, _, _, resume_text in score_rows)
+            if measured:
+                save_seconds = (time.perf_counter() - start) / len(self.pending)
+                for _, metrics in measured:
+                    metrics["timings"]["save"] = save_seconds
+                self.conn.executemany(
+                    INSERT_TIMINGS_SQL, [timing_row(resume_id, metrics) for resume_id, metrics in measured])
+            if self.on_write:
+                self.on_write(resume_ids)
+            self.conn.commit()
+            self.duplicates.update(flagged)
+        except Exception:
+            self.conn.rollback()
+            # Term ids assigned inside the rolled back transaction no longer exist
+            self.indexer.vocabulary = None
+            raise
+        finally:
+            self.pending = []
+        return resume_ids
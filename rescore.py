@@ -0,0 +1,198 @@
+import argparse
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool, cpu_count
+import analytics
+import persistence
+from new_parser import DB_PATH, SCORING_VERSION, ResumeParser, parse_version as current_parse_version
+from skill_taxonomy import get_taxonomy
+from text_store import decompress_text
+from text_tokenizers import TOKENIZERS
+
+# A result needs re-parsing when its parse version is stale and its text is still stored;
+# otherwise a stale score is recomputed from the stored skills/education/experience rows
+STALE_SQL = """SELECT s.id, s.parse_version IS NOT ? AND (t.compressed IS NOT NULL OR s.resume_text IS NOT NULL),
+        t.compressed, s.resume_text
+    FROM resume_scores s LEFT JOIN resume_texts t ON t.resume_id = s.id
+    WHERE s.id > ? AND (s.scoring_version IS NOT ?
+        OR (s.parse_version IS NOT ? AND (t.compressed IS NOT NULL OR s.resume_text IS NOT NULL)))
+    ORDER BY s.id LIMIT ?"""
+
+# One parser per worker process, created by the pool initializer
+_worker_parser = None
+
+def _init_worker(tokenizer):
+    global _worker_parser
+    _worker_parser = ResumeParser(db_path=None, headless=True, tokenizer=tokenizer)
+
+def _rescore_chunk(jobs):
+    """jobs: list of (resume_id, text, parsed_data) with exactly one of text and parsed_data set.
+
+    Returns (resume_id, parsed_data, ats_score, parse_version) tuples, parsed_data and
+    parse_version being None unless re-parsed.
+    """
+    # The whole chunk is parsed with one taxonomy, and the version recorded is the one used
+    taxonomy = get_taxonomy()
+    version = current_parse_version(_worker_parser.tokenizer.name, taxonomy)
+    results = []
+    for resume_id, text, parsed_data in jobs:
+        reparsed = None
+        if text is not None:
+            reparsed = parsed_data = _worker_parser.parse_resume(text, taxonomy)
+        results.append((resume_id, reparsed, _worker_parser.calculate_ats_score(parsed_data),
+                        version if reparsed is not None else None))
+    return results
+
+def count_stale(conn, parse_version=None, scoring_version=SCORING_VERSION, tokenizer="regex"):
+    """Return (results to re-parse, results to re-score only)"""
+    parse_version = parse_version or current_parse_version(tokenizer)
+    reparse = rescore = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(STALE_SQL, (parse_version, last_id, scoring_version, parse_version, 10000)).fetchall()
+        if not rows:
+            return reparse, rescore
+        for row in rows:
+            if row[1]:
+                reparse += 1
+            else:
+                rescore += 1
+        last_id = rows[-1][0]
+
+class Rescorer:
+    """Brings stored results up to the current parse and scoring versions in parallel chunks.
+
+    Each chunk is committed together with its new versions, so an interrupted run simply
+    continues with whatever is still stale the next time it is started.
+    """
+
+    def __init__(self, db_path=DB_PATH, workers=None, chunk_size=200, tokenizer="regex",
+                 parse_version=None, scoring_version=SCORING_VERSION):
+        self.db_path = db_path
+        self.workers = workers or cpu_count()
+        self.chunk_size = chunk_size
+        self.tokenizer = tokenizer
+        # Defaults to the version of this tokenizer and the taxonomy file as it is now
+        self.parse_version = parse_version or current_parse_version(tokenizer)
+        self.scoring_version = scoring_version
+
+    def stale_chunks(self, conn):
+        """Yield lists of jobs for _rescore_chunk, oldest results first"""
+        last_id = 0
+        while True:
+            rows = conn.execute(STALE_SQL, (
+                self.parse_version, last_id, self.scoring_version, self.parse_version, self.chunk_size
+            )).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            score_only = persistence.load_parsed_data(conn, [row[0] for row in rows if not row[1]])
+            jobs = []
+            for resume_id, needs_parse, compressed, legacy_text in rows:
+                if needs_parse:
+                    text = decompress_text(compressed) if compressed is not None else legacy_text
+                    jobs.append((resume_id, text, None))
+                else:
+                    jobs.append((resume_id, None, score_only[resume_id]))
+            yield jobs
+
+    def apply(self, conn, results):
+        reparsed = [(resume_id, parsed_data) for resume_id, parsed_data, _, _ in results if parsed_data is not None]
+        skill_rows, education_rows, experience_rows = [], [], []
+        for resume_id, parsed_data in reparsed:
+            persistence.add_parsed_rows(resume_id, parsed_data, skill_rows, education_rows, experience_rows)
+        result_ids = [resume_id for resume_id, _, _, _ in results]
+        with conn:
+            # The summary tables drop the old scores and skills and count the new ones
+            analytics.remove(conn, result_ids)
+            if reparsed:
+                ids = [(resume_id,) for resume_id, _ in reparsed]
+                for table in ("skills", "education", "experience"):
+                    conn.executemany(f"DELETE FROM {table} WHERE resume_id=?", ids)
+                conn.executemany(persistence.INSERT_SKILL_SQL, skill_rows)
+                conn.executemany(persistence.INSERT_EDUCATION_SQL, education_rows)
+                conn.executemany(persistence.INSERT_EXPERIENCE_SQL, experience_rows)
+                conn.executemany(
+                    """UPDATE resumes SET skills_count=?, education_count=?, experience_count=?
+                       WHERE resume_score_id=?""",
+                    [(len(parsed_data["skills"]), len(parsed_data["education"]), len(parsed_data["experience"]),
+                      resume_id) for resume_id, parsed_data in reparsed]
+                )
+                conn.executemany(
+                    "UPDATE resume_scores SET parse_version=? WHERE id=?",
+                    [(version, resume_id) for resume_id, parsed_data, _, version in results
+                     if parsed_data is not None]
+                )
+            conn.executemany(
+                "UPDATE resume_scores SET ats_score=?, scoring_version=? WHERE id=?",
+                [(ats_score, self.scoring_version, resume_id) for resume_id, _, ats_score, _ in results]
+            )
+            analytics.add(conn, result_ids)
+        return len(reparsed)
+
+    def run(self, progress=None):
+        """Process every stale result; progress, if given, is called with the stats after each chunk"""
+        conn = persistence.connect(self.db_path)
+        persistence.create_schema(conn)
+        persistence.migrate(conn)
+        stats = {"reparsed": 0, "rescored": 0, "chunks": 0, "elapsed": 0.0}
+        start = time.perf_counter()
+        try:
+            with Pool(self.workers, initializer=_init_worker, initargs=(self.tokenizer,)) as pool:
+                # Only a few chunks are in flight at once, so memory stays flat on large databases
+                pending = deque()
+                chunks = self.stale_chunks(conn)
+                for jobs in chunks:
+                    pending.append(pool.apply_async(_rescore_chunk, (jobs,)))
+                    if len(pending) < 2 * self.workers:
+                        continue
+                    self._finish(conn, pending.popleft().get(), stats, progress)
+                while pending:
+                    self._finish(conn, pending.popleft().get(), stats, progress)
+        finally:
+            conn.close()
+            stats["elapsed"] = time.perf_counter() - start
+        return stats
+
+    def _finish(self, conn, results, stats, progress):
+        reparsed = self.apply(conn, results)
+        stats["reparsed"] += reparsed
+        stats["rescored"] += len(results) - reparsed
+        stats["chunks"] += 1
+        if progress:
+            progress(stats)
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Re-parse or re-score stored resumes produced by older versions")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    arg_parser.add_argument("--chunk-size", type=int, default=200, help="resumes per chunk and transaction")
+    arg_parser.add_argument("--tokenizer", choices=sorted(TOKENIZERS), default="regex",
+                            help="tokenizer used for skill matching when re-parsing (default: regex)")
+    arg_parser.add_argument("--dry-run", action="store_true", help="only count stale results")
+    args = arg_parser.parse_args(argv)
+
+    conn = persistence.connect(args.db)
+    persistence.create_schema(conn)
+    persistence.migrate(conn)
+    parse_version = current_parse_version(args.tokenizer)
+    reparse, rescore = count_stale(conn, parse_version)
+    conn.close()
+    print(f"Current versions: parse {parse_version}, scoring {SCORING_VERSION}")
+    print(f"Stale results: {reparse} to re-parse from stored text, {rescore} to re-score only")
+    if args.dry_run or not reparse + rescore:
+        return 0
+
+    rescorer = Rescorer(args.db, args.workers, args.chunk_size, args.tokenizer, parse_version)
+    try:
+        stats = rescorer.run(lambda stats: print(
+            f"\r{stats['reparsed']} re-parsed, {stats['rescored']} re-scored", end="", flush=True))
+    except KeyboardInterrupt:
+        print("\nInterrupted; finished chunks are saved and the next run continues from there")
+        return 1
+    print(f"\nDone in {stats['elapsed']:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
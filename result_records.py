@@ -0,0 +1,104 @@
+from functools import partial
+from itertools import chain
+from operator import itemgetter
+
+class Record(tuple):
+    """Base for the parsed entries of a resume: a tuple of field values in database column order.
+
+    A batch holds thousands of these, so they carry no per-instance dict or field names.
+    Each one already is the row for executemany (after the resume id) and is written to
+    JSON as a list; to_dict gives the named form for output meant to be read by people.
+    """
+    __slots__ = ()
+    fields = ()
+
+    def to_dict(self):
+        return dict(zip(self.fields, self))
+
+    @classmethod
+    def from_json(cls, data):
+        """Build from a row list, or from a dict keyed by field name as older caches stored"""
+        return cls(**data) if isinstance(data, dict) else tuple.__new__(cls, data)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={value!r}" for name, value in zip(self.fields, self))
+        return f"{self.__class__.__name__}({values})"
+
+class Skill(Record):
+    __slots__ = ()
+    fields = ("name", "category", "relevance_score")
+    name = property(itemgetter(0))
+    category = property(itemgetter(1))
+    relevance_score = property(itemgetter(2))
+
+    def __new__(cls, name, category, relevance_score=0):
+        return tuple.__new__(cls, (name, category, relevance_score))
+
+class Education(Record):
+    __slots__ = ()
+    fields = ("institution", "degree", "field_of_study", "start_date", "end_date", "gpa")
+    institution = property(itemgetter(0))
+    degree = property(itemgetter(1))
+    field_of_study = property(itemgetter(2))
+    start_date = property(itemgetter(3))
+    end_date = property(itemgetter(4))
+    gpa = property(itemgetter(5))
+
+    def __new__(cls, institution, degree="", field_of_study="", start_date="", end_date="", gpa=None):
+        return tuple.__new__(cls, (institution, degree, field_of_study, start_date, end_date, gpa))
+
+class Experience(Record):
+    __slots__ = ()
+    fields = ("company", "position", "location", "start_date", "end_date", "description", "responsibilities")
+    company = property(itemgetter(0))
+    position = property(itemgetter(1))
+    location = property(itemgetter(2))
+    start_date = property(itemgetter(3))
+    end_date = property(itemgetter(4))
+    description = property(itemgetter(5))
+    responsibilities = property(itemgetter(6))
+
+    def __new__(cls, company, position, location="", start_date="", end_date="", description="",
+                responsibilities=""):
+        return tuple.__new__(cls, (company, position, location, start_date, end_date, description,
+                                   responsibilities))
+
+RECORD_TYPES = {"skills": Skill, "education": Education, "experience": Experience}
+
+class ParsedResume(dict):
+    """parsed_data: {"skills": [Skill], "education": [Education], "experience": [Experience]}.
+
+    Pickles as one flat tuple of values per entry type, so sending results between processes
+    is done by the C pickler instead of one __reduce__ call and one tuple per entry. Missing
+    entry types come back as empty lists; any other keys are carried through as they are.
+    """
+    __slots__ = ()
+
+    def __reduce__(self):
+        flat = tuple(tuple(chain.from_iterable(self.get(key, ()))) for key in RECORD_TYPES)
+        extra = {key: value for key, value in self.items() if key not in RECORD_TYPES}
+        if extra:
+            return _parsed_with_extra, (flat, extra)
+        return _parsed_from_values, flat
+
+def _parsed_with_extra(flat, extra):
+    parsed_data = _parsed_from_values(*flat)
+    parsed_data.update(extra)
+    return parsed_data
+
+def _parsed_from_values(*values):
+    parsed_data = ParsedResume()
+    for (key, record_type), flat in zip(RECORD_TYPES.items(), values):
+        # zip over one iterator yields the entries' field groups; tuple.__new__ makes records without __new__ calls
+        rows = zip(*[iter(flat)] * len(record_type.fields))
+        parsed_data[key] = list(map(partial(tuple.__new__, record_type), rows))
+    return parsed_data
+
+def parsed_from_json(data):
+    """Rebuild parsed_data from json.loads output; entries may be lists or dicts keyed by field name"""
+    return ParsedResume(
+        (key, [record_type.from_json(entry) for entry in data[key]]) for key, record_type in RECORD_TYPES.items())
+
+def parsed_to_dicts(parsed_data):
+    """The parsed entries as dicts keyed by field name, for JSON meant to be read by people"""
+    return {key: [entry.to_dict() for entry in parsed_data[key]] for key in RECORD_TYPES}
@@ -0,0 +1,27 @@
+import analytics
+import persistence
+
+# Rows fetched each time the history list is scrolled near its end
+PAGE_SIZE = 100
+
+# Newest first; walks the (user_id, rowid) index backwards from the last id already shown
+HISTORY_SQL = """SELECT s.id, s.filename, s.ats_score, s.parsed_date,
+        r.skills_count, r.education_count, r.experience_count
+    FROM resume_scores s LEFT JOIN resumes r ON r.resume_score_id = s.id
+    WHERE s.user_id = ? AND s.id < ? ORDER BY s.id DESC LIMIT ?"""
+
+def history_page(conn, user_id, before=None, limit=PAGE_SIZE):
+    """Return up to limit of the user's results saved before resume id `before`, newest first.
+
+    Rows are (resume_id, filename, ats_score, parsed_date, skills, education, experience counts).
+    Pass the last id of the previous page to get the next one; the cost is the same for every page.
+    """
+    return conn.execute(HISTORY_SQL, (user_id, before if before is not None else (1 << 63) - 1, limit)).fetchall()
+
+def history_count(conn, user_id):
+    # Read from the analytics summary instead of counting the user's rows
+    return analytics.score_distribution(conn, user_id=user_id)["resumes"]
+
+def load_details(conn, resume_id):
+    """Return the stored parsed_data of one result"""
+    return persistence.load_parsed_data(conn, [resume_id])[resume_id]
@@ -0,0 +1,134 @@
+import argparse
+import sqlite3
+from text_store import iter_stored_texts, load_text
+
+TOKENIZE = "porter unicode61 tokenchars '+#'"
+
+# Full-text index over resume text. It is contentless: the text itself is only kept compressed
+# in resume_texts, and snippets are cut from that. '+' and '#' are word characters so C++ and
+# C# stay whole.
+CREATE_FTS_SQL = f'''CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(
+        resume_text,
+        content='',
+        tokenize="{TOKENIZE}"
+    )'''
+
+CREATE_SEARCH_TABLES_SQL = [
+    CREATE_FTS_SQL,
+    # Index everything saved before the table existed; rowid is the resume_scores id.
+    # Migrations run in order, so the text is still in resume_scores at this point.
+    '''INSERT INTO resume_fts (rowid, resume_text)
+       SELECT id, COALESCE(resume_text, '') FROM resume_scores
+       WHERE id NOT IN (SELECT rowid FROM resume_fts)''',
+]
+
+# A contentless table cannot replace rows, and every resume is indexed once under its new id
+INSERT_SEARCH_SQL = "INSERT INTO resume_fts (rowid, resume_text) VALUES (?, ?)"
+
+SEARCH_SQL = """SELECT s.id, s.user_id, s.filename, s.ats_score, bm25(resume_fts)
+    FROM resume_fts JOIN resume_scores s ON s.id = resume_fts.rowid
+    WHERE resume_fts MATCH ? {}
+    ORDER BY bm25(resume_fts) LIMIT ? OFFSET ?"""
+
+SNIPPET_SQL = """SELECT rowid, snippet(resume_snippets, 0, ?, ?, '...', ?)
+    FROM resume_snippets WHERE resume_snippets MATCH ?"""
+
+def index_stored_texts(conn):
+    """Add every stored resume to resume_fts; runs inside the caller's transaction"""
+    for rows in iter_stored_texts(conn):
+        conn.executemany(INSERT_SEARCH_SQL, [(resume_id, text or "") for resume_id, text in rows])
+
+def make_contentless(conn):
+    """Migration step: re-create an index that still holds its own copy of the text as contentless"""
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name='resume_fts'").fetchone()[0]
+    if "content=''" in sql:
+        return
+    conn.execute("DROP TABLE resume_fts")
+    conn.execute(CREATE_FTS_SQL)
+    index_stored_texts(conn)
+
+def _execute(conn, sql, params, query):
+    try:
+        return conn.execute(sql, params).fetchall()
+    except sqlite3.OperationalError as e:
+        # Malformed MATCH expressions surface as "fts5: syntax error ..." or "no such column: ..."
+        if str(e).startswith(("fts5:", "no such column")):
+            raise ValueError(f"Invalid search query {query!r}: {e}") from e
+        raise
+
+def search(conn, query, user_id=None, limit=20, offset=0, highlight=("[", "]"), snippet_tokens=12):
+    """Return (resume_id, user_id, filename, ats_score, rank, snippet) rows for an FTS5 query, best first.
+
+    The query uses FTS5 syntax: words, "quoted phrases", AND/OR/NOT, prefix* and NEAR().
+    Terms containing '+' or '#' must be quoted, e.g. '"c++" AND docker'.
+    Raises ValueError if the query is malformed.
+    """
+    sql = SEARCH_SQL.format("AND s.user_id = ?" if user_id is not None else "")
+    params = [query]
+    if user_id is not None:
+        params.append(user_id)
+    params += [limit, offset]
+    rows = _execute(conn, sql, params, query)
+    snippets = _snippets(conn, [row[0] for row in rows], query, highlight, snippet_tokens)
+    return [row + (snippets.get(row[0], ""),) for row in rows]
+
+def _snippets(conn, resume_ids, query, highlight, snippet_tokens):
+    """{resume_id: snippet} for one page of results, from their stored texts"""
+    if not resume_ids:
+        return {}
+    # The page's texts go into a throwaway in-memory index with the same tokenizer, so FTS5
+    # highlights exactly what matched without touching the caller's connection or transaction
+    page = sqlite3.connect(":memory:")
+    try:
+        page.execute(f'''CREATE VIRTUAL TABLE resume_snippets USING fts5(resume_text, tokenize="{TOKENIZE}")''')
+        page.executemany("INSERT INTO resume_snippets (rowid, resume_text) VALUES (?, ?)",
+                         [(resume_id, load_text(conn, resume_id) or "") for resume_id in resume_ids])
+        return dict(_execute(page, SNIPPET_SQL, [highlight[0], highlight[1], snippet_tokens, query], query))
+    finally:
+        page.close()
+
+def count_matches(conn, query, user_id=None):
+    sql = "SELECT COUNT(*) FROM resume_fts JOIN resume_scores s ON s.id = resume_fts.rowid WHERE resume_fts MATCH ?"
+    params = [query]
+    if user_id is not None:
+        sql += " AND s.user_id = ?"
+        params.append(user_id)
+    return _execute(conn, sql, params, query)[0][0]
+
+def rebuild(conn):
+    """Re-create the index contents from resume_scores"""
+    with conn:
+        conn.execute("INSERT INTO resume_fts (resume_fts) VALUES ('delete-all')")
+        index_stored_texts(conn)
+        conn.execute("INSERT INTO resume_fts (resume_fts) VALUES ('optimize')")
+
+def main(argv=None):
+    from new_parser import DB_PATH
+    arg_parser = argparse.ArgumentParser(description="Full-text search over analyzed resumes")
+    arg_parser.add_argument("query", help='FTS5 query, e.g. \'kubernetes AND go\' or \'"computer vision" phd\'')
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--user-id", type=int, default=None, help="only search this user's resumes")
+    arg_parser.add_argument("--limit", type=int, default=20, help="number of results to show")
+    arg_parser.add_argument("--offset", type=int, default=0, help="number of results to skip")
+    arg_parser.add_argument("--rebuild", action="store_true", help="rebuild the index from stored resumes first")
+    args = arg_parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.rebuild:
+            rebuild(conn)
+        try:
+            total = count_matches(conn, args.query, args.user_id)
+            results = search(conn, args.query, args.user_id, args.limit, args.offset)
+        except ValueError as e:
+            print(e)
+            return
+        print(f"{total} matching resumes")
+        for resume_id, user_id, filename, ats_score, _, snippet in results:
+            print(f"#{resume_id} {filename} (user {user_id}, ATS {ats_score:.1f}%)")
+            print(f"    {' '.join(snippet.split())}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import re
+
+# Heading text (lowercase, single-spaced) mapped to the section it opens
+SECTION_HEADINGS = {
+    "education": "education",
+    "academic background": "education",
+    "academics": "education",
+    "education and training": "education",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "relevant experience": "experience",
+    "employment": "experience",
+    "employment history": "experience",
+    "work history": "experience",
+    "career history": "experience",
+    "skills": "skills",
+    "technical skills": "skills",
+    "core skills": "skills",
+    "key skills": "skills",
+    "skills and abilities": "skills",
+    "projects": "projects",
+    "personal projects": "projects",
+    "academic projects": "projects",
+    "certifications": "certifications",
+    "licenses and certifications": "certifications",
+    "summary": "summary",
+    "professional summary": "summary",
+    "profile": "summary",
+    "objective": "summary",
+    "career objective": "summary",
+    "awards": "awards",
+    "honors and awards": "awards",
+    "achievements": "awards",
+    "publications": "publications",
+    "languages": "languages",
+    "interests": "interests",
+    "hobbies": "interests",
+    "volunteer experience": "volunteering",
+    "volunteering": "volunteering",
+    "references": "references",
+}
+
+# A heading is a short line made only of letters, spaces and "&", optionally ending with a colon.
+# The whitespace after the colon is only tried once a colon is found, so trailing spaces are not
+# split between two runs in every possible way, which took quadratic time per line
+HEADING_PATTERN = re.compile(r'^[ \t]*([A-Za-z][A-Za-z &]{0,40}?)[ \t]*(?::[ \t]*)?$', re.MULTILINE)
+
+def _heading_key(line):
+    return " ".join(line.lower().replace("&", " and ").split())
+
+def segment_sections(text):
+    """Find the resume's sections in one pass, returning {section: [(start, end), ...]}.
+
+    Each span starts after its heading line and ends where the next recognized heading begins.
+    """
+    headings = []
+    for match in HEADING_PATTERN.finditer(text):
+        section = SECTION_HEADINGS.get(_heading_key(match.group(1)))
+        if section:
+            headings.append((section, match.start(), match.end()))
+
+    sections = {}
+    for index, (section, _, body_start) in enumerate(headings):
+        body_end = headings[index + 1][1] if index + 1 < len(headings) else len(text)
+        sections.setdefault(section, []).append((body_start, body_end))
+    return sections
+
+def section_spans(sections, name, text_length):
+    """Spans to scan for one section, falling back to the whole text when it was not found"""
+    if sections and name in sections:
+        return sections[name]
+    return [(0, text_length)]
@@ -0,0 +1,76 @@
+import re
+
+# Lowercase word tokens, keeping trailing + and # so "C++" and "C#" survive normalization
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+[+#]*")
+
+def normalize_tokens(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+class SkillMatcher:
+    """Token trie over a skill taxonomy that finds every skill in a single pass over the text"""
+
+    def __init__(self, skills, ignore=frozenset()):
+        # skills: iterable of (name, category) or (name, category, synonyms) tuples, in the order
+        # results should be reported; a synonym or abbreviation matches as its skill's name.
+        # ignore: tokens (e.g. stopwords) dropped from skill names, matching what callers drop from text
+        self.ignore = ignore
+        self._root = {}
+        self._categories = {}
+        self._order = {}
+        self.max_depth = 0
+        for name, category, *synonyms in skills:
+            if name in self._categories:
+                continue
+            added = False
+            for phrase in [name, *(synonyms[0] if synonyms else ())]:
+                tokens = [token for token in normalize_tokens(phrase) if token not in ignore]
+                if not tokens:
+                    continue
+                node = self._root
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                # The None key marks the end of a phrase and holds its skill's display name;
+                # a phrase already claimed by an earlier skill keeps that skill
+                node.setdefault(None, name)
+                added = True
+                self.max_depth = max(self.max_depth, len(tokens))
+            if added:
+                self._categories[name] = category
+                self._order[name] = len(self._order)
+
+    def __len__(self):
+        return len(self._categories)
+
+    def state(self):
+        """The compiled trie as plain dicts, strings and ints, e.g. for a marshal snapshot"""
+        return (self.ignore, self._root, self._categories, self._order, self.max_depth)
+
+    @classmethod
+    def from_state(cls, state):
+        matcher = cls.__new__(cls)
+        matcher.ignore, matcher._root, matcher._categories, matcher._order, matcher.max_depth = state
+        return matcher
+
+    def category(self, name):
+        return self._categories.get(name)
+
+    def match_tokens(self, tokens):
+        """Return the skills found in a normalized token sequence, in taxonomy order"""
+        root = self._root
+        found = set()
+        for start in range(len(tokens)):
+            node = root.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                name = node.get(None)
+                if name is not None:
+                    found.add(name)
+                if position >= len(tokens):
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        return sorted(found, key=self._order.__getitem__)
+
+    def match_text(self, text):
+        ignore = self.ignore
+        return self.match_tokens([token for token in normalize_tokens(text) if token not in ignore])
@@ -0,0 +1,174 @@
+import argparse
+import csv
+import hashlib
+import json
+import marshal
+import os
+import sys
+import threading
+import time
+from nlp_resources import get_stop_words
+from skill_matcher import SkillMatcher
+
+DEFAULT_TAXONOMY_PATH = os.environ.get(
+    "RESUME_SKILLS_TAXONOMY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json"))
+CATEGORIES = ("Technical", "Soft", "Domain")
+# Bump when the snapshot layout or SkillMatcher internals change
+SNAPSHOT_FORMAT = 2
+# How often get_taxonomy looks at the file's modification time
+RELOAD_CHECK_SECONDS = 2.0
+
+class Taxonomy:
+    """A compiled skills taxonomy: its entries, a SkillMatcher over them and a content version"""
+
+    def __init__(self, path, version, skills, matcher, mtime):
+        self.path = path
+        self.version = version
+        # [(name, category, synonyms)] in file order
+        self.skills = skills
+        self.matcher = matcher
+        self.mtime = mtime
+
+    def names(self, category=None):
+        return [name for name, skill_category, _ in self.skills if category is None or skill_category == category]
+
+def _synonym_list(value, where):
+    if value is None or value == "":
+        return ()
+    if isinstance(value, str):
+        return tuple(part.strip() for part in value.split("|") if part.strip())
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return tuple(value)
+    raise ValueError(f"{where}: synonyms must be a list of strings")
+
+def parse_taxonomy(data, path):
+    """Return [(name, category, synonyms)] from the raw bytes of a .json or .csv taxonomy file.
+
+    JSON: {"skills": [{"name": ..., "category": ..., "synonyms": [...]}, ...]}
+    CSV: a header row with name,category,synonyms; synonyms separated by "|"
+    """
+    if path.lower().endswith(".csv"):
+        rows = list(csv.DictReader(data.decode("utf-8-sig").splitlines()))
+        entries = [(f"{path} line {number}", row) for number, row in enumerate(rows, 2)]
+    else:
+        document = json.loads(data.decode("utf-8"))
+        if not isinstance(document, dict) or not isinstance(document.get("skills"), list):
+            raise ValueError(f"{path}: expected an object with a \"skills\" list")
+        entries = [(f"{path} skill #{number}", entry) for number, entry in enumerate(document["skills"], 1)]
+
+    skills = []
+    for where, entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where}: expected an object")
+        name = (entry.get("name") or "").strip()
+        category = (entry.get("category") or "Technical").strip()
+        if not name:
+            raise ValueError(f"{where}: missing name")
+        if category not in CATEGORIES:
+            raise ValueError(f"{where}: unknown category {category!r}, expected one of {', '.join(CATEGORIES)}")
+        skills.append((name, category, _synonym_list(entry.get("synonyms"), where)))
+    return skills
+
+def _snapshot_path(path):
+    return path + ".snapshot"
+
+def load_taxonomy(path=DEFAULT_TAXONOMY_PATH, use_snapshot=True):
+    """Read and compile a taxonomy file, going through its snapshot when it is current.
+
+    The snapshot is a local cache written next to the file; it is rebuilt whenever the file's
+    content or the stopword list changes, so it never needs to be edited or shipped. It holds
+    only plain data written with marshal, not pickle, so loading a snapshot from a directory
+    others can write to cannot run code.
+    """
+    mtime = os.stat(path).st_mtime
+    with open(path, "rb") as file:
+        data = file.read()
+    version = hashlib.sha1(data).hexdigest()[:12]
+    ignore = get_stop_words()
+    # Stopwords are removed from skill names when compiling, so they are part of the snapshot key
+    key = (SNAPSHOT_FORMAT, version, hashlib.sha1("\n".join(sorted(ignore)).encode("utf-8")).hexdigest())
+    snapshot_path = _snapshot_path(path)
+
+    if use_snapshot:
+        try:
+            with open(snapshot_path, "rb") as file:
+                snapshot = marshal.load(file)
+            if snapshot["key"] == key:
+                matcher = SkillMatcher.from_state(snapshot["matcher"])
+                return Taxonomy(path, version, snapshot["skills"], matcher, mtime)
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            pass
+
+    skills = parse_taxonomy(data, path)
+    taxonomy = Taxonomy(path, version, skills, SkillMatcher(skills, ignore=ignore), mtime)
+    if use_snapshot:
+        try:
+            temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                marshal.dump({"key": key, "skills": skills, "matcher": taxonomy.matcher.state()}, file)
+            os.replace(temp_path, snapshot_path)
+        except OSError:
+            # A read-only install still works, it just compiles on every start
+            pass
+    return taxonomy
+
+_current = None
+_next_check = 0.0
+_lock = threading.Lock()
+
+def get_taxonomy(path=None):
+    """Return the shared taxonomy, reloading it when its file has changed.
+
+    The file's modification time is checked at most every RELOAD_CHECK_SECONDS. If a changed
+    file cannot be loaded the previous taxonomy stays in use.
+    """
+    global _current, _next_check
+    path = path or DEFAULT_TAXONOMY_PATH
+    current = _current
+    now = time.monotonic()
+    if current is not None and current.path == path and now < _next_check:
+        return current
+    with _lock:
+        current = _current
+        if current is not None and current.path == path:
+            if now < _next_check:
+                return current
+            _next_check = now + RELOAD_CHECK_SECONDS
+            try:
+                if os.stat(path).st_mtime == current.mtime:
+                    return current
+                _current = load_taxonomy(path)
+                print(f"Reloaded skills taxonomy {path} (version {_current.version})")
+            except (OSError, ValueError) as e:
+                print(f"Error reloading skills taxonomy, keeping the previous one: {e}")
+            return _current
+        _current = load_taxonomy(path)
+        _next_check = now + RELOAD_CHECK_SECONDS
+        return _current
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Validate a skills taxonomy and build its snapshot")
+    arg_parser.add_argument("path", nargs="?", default=DEFAULT_TAXONOMY_PATH)
+    args = arg_parser.parse_args(argv)
+
+    # Stopwords are loaded up front so the timings only compare compiling with the snapshot
+    get_stop_words()
+    try:
+        start = time.perf_counter()
+        taxonomy = load_taxonomy(args.path, use_snapshot=False)
+        compile_seconds = time.perf_counter() - start
+        load_taxonomy(args.path)
+        start = time.perf_counter()
+        load_taxonomy(args.path)
+        snapshot_seconds = time.perf_counter() - start
+    except (OSError, ValueError) as e:
+        print(f"Invalid taxonomy: {e}")
+        return 1
+    synonyms = sum(len(entry[2]) for entry in taxonomy.skills)
+    counts = ", ".join(f"{category}: {len(taxonomy.names(category))}" for category in CATEGORIES)
+    print(f"{args.path}: {len(taxonomy.skills)} skills ({counts}), {synonyms} synonyms, version {taxonomy.version}")
+    print(f"compile {compile_seconds * 1000:.1f} ms, load from snapshot {snapshot_seconds * 1000:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import persistence
+from near_duplicates import BANDS, MAX_CANDIDATES, DuplicateIndex, signature
+from result_records import ParsedResume
+
+TEXT = " ".join(f"Built service {index} in Python and Go, reducing latency by {index}%" for index in range(40))
+
+def open_db(tmp_path):
+    conn = persistence.connect(str(tmp_path / "test.db"))
+    persistence.create_schema(conn)
+    persistence.migrate(conn)
+    return conn
+
+def test_identical_resumes_keep_candidates_bounded(tmp_path):
+    conn = open_db(tmp_path)
+    writer = persistence.ResultWriter(conn, batch_size=50)
+    for index in range(300):
+        writer.add(1, f"copy_{index}.pdf", 50.0, ParsedResume(skills=[], education=[], experience=[]), TEXT)
+    writer.flush()
+
+    original = conn.execute("SELECT MIN(id) FROM resume_scores").fetchone()[0]
+    assert writer.duplicates == {resume_id: original for resume_id in writer.duplicates}
+    assert len(writer.duplicates) == 299
+    # Only the original is in the buckets, so every later copy compares against one resume
+    assert conn.execute("SELECT COUNT(*) FROM resume_lsh").fetchone()[0] == BANDS
+    assert [row[0] for row in DuplicateIndex(conn).candidates(signature(TEXT))] == [original]
+
+def test_candidates_are_capped(tmp_path):
+    conn = open_db(tmp_path)
+    # A threshold nothing reaches keeps every copy as an original in the buckets
+    index = DuplicateIndex(conn, threshold=1.1)
+    index.index((resume_id, TEXT) for resume_id in range(1, MAX_CANDIDATES * 3))
+    assert len(index.candidates(signature(TEXT))) == MAX_CANDIDATES
@@ -0,0 +1,26 @@
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_records import Education, Experience, ParsedResume, Skill
+
+def test_round_trip():
+    parsed_data = ParsedResume(
+        skills=[Skill("Python", "Programming", 2)],
+        education=[Education("University of Somewhere", "BS", gpa=3.5)],
+        experience=[Experience("Acme", "Engineer", start_date="2019", end_date="Present")],
+    )
+    loaded = pickle.loads(pickle.dumps(parsed_data, pickle.HIGHEST_PROTOCOL))
+    assert type(loaded) is ParsedResume
+    assert loaded == parsed_data
+    assert type(loaded["skills"][0]) is Skill
+
+def test_missing_entry_types_come_back_empty():
+    loaded = pickle.loads(pickle.dumps(ParsedResume(skills=[Skill("Go", "Programming")])))
+    assert loaded == {"skills": [Skill("Go", "Programming")], "education": [], "experience": []}
+
+def test_other_keys_are_carried_through():
+    parsed_data = ParsedResume(skills=[], education=[], experience=[], source={"pages": 2})
+    assert pickle.loads(pickle.dumps(parsed_data)) == parsed_data
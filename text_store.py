@@ -0,0 +1,129 @@
+import argparse
+import os
+import sqlite3
+import time
+import zlib
+
+COMPRESSION_LEVEL = 6
+
+# Raw resume text lives here, compressed, so resume_scores rows stay small
+CREATE_TEXT_TABLES_SQL = [
+    '''CREATE TABLE IF NOT EXISTS resume_texts (
+        resume_id INTEGER PRIMARY KEY,
+        text_length INTEGER,
+        compressed BLOB,
+        FOREIGN KEY (resume_id) REFERENCES resume_scores (id)
+    )''',
+]
+
+INSERT_TEXT_SQL = "INSERT OR REPLACE INTO resume_texts (resume_id, text_length, compressed) VALUES (?, ?, ?)"
+
+def compress_text(text):
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+def decompress_text(blob):
+    return zlib.decompress(blob).decode("utf-8")
+
+def text_row(resume_id, text):
+    text = text or ""
+    return (resume_id, len(text), compress_text(text))
+
+def load_text(conn, resume_id):
+    """Return the stored text of one resume, or None if there is none"""
+    row = conn.execute("SELECT compressed FROM resume_texts WHERE resume_id=?", (resume_id,)).fetchone()
+    if row is None:
+        # Not moved yet, e.g. the database has not been migrated
+        row = conn.execute("SELECT resume_text FROM resume_scores WHERE id=?", (resume_id,)).fetchone()
+        return row[0] if row else None
+    return decompress_text(row[0])
+
+def iter_stored_texts(conn, skip_indexed_in=None, batch_size=1000):
+    """Yield lists of (resume_id, resume_text), oldest first.
+
+    Reads the compressed copy where it exists and the legacy resume_scores column otherwise,
+    so it works at any migration step. skip_indexed_in names a table keyed on resume_id whose
+    resumes are left out; callers may fill that table between batches.
+    """
+    has_texts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='resume_texts'").fetchone() is not None
+    columns = "s.id, s.resume_text, t.compressed" if has_texts else "s.id, s.resume_text, NULL"
+    joins = " LEFT JOIN resume_texts t ON t.resume_id = s.id" if has_texts else ""
+    where = "s.id > ?"
+    if skip_indexed_in:
+        joins += f" LEFT JOIN {skip_indexed_in} skip ON skip.resume_id = s.id"
+        where += " AND skip.resume_id IS NULL"
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            f"SELECT {columns} FROM resume_scores s{joins} WHERE {where} ORDER BY s.id LIMIT ?",
+            (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield [(resume_id, decompress_text(blob) if blob is not None else text)
+               for resume_id, text, blob in rows]
+
+def move_texts(conn, batch_size=500):
+    """Migration step: compress resume_scores.resume_text into resume_texts and clear the column.
+
+    Runs inside the migration's transaction. The freed pages are reused by later writes;
+    run VACUUM (python text_store.py --vacuum) to shrink the file itself.
+    """
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            """SELECT id, resume_text FROM resume_scores
+               WHERE id > ? AND resume_text IS NOT NULL ORDER BY id LIMIT ?""",
+            (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            return
+        conn.executemany(INSERT_TEXT_SQL, [text_row(resume_id, text) for resume_id, text in rows])
+        conn.executemany("UPDATE resume_scores SET resume_text=NULL WHERE id=?", [(row[0],) for row in rows])
+        last_id = rows[-1][0]
+
+def storage_report(conn, db_path):
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    report = {
+        "file_bytes": os.path.getsize(db_path),
+        "free_bytes": conn.execute("PRAGMA freelist_count").fetchone()[0] * page_size,
+    }
+    report["texts"], report["text_chars"], report["compressed_bytes"] = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(text_length), 0), COALESCE(SUM(LENGTH(compressed)), 0) FROM resume_texts"
+    ).fetchone()
+    report["inline_texts"] = conn.execute(
+        "SELECT COUNT(*) FROM resume_scores WHERE resume_text IS NOT NULL").fetchone()[0]
+    start = time.perf_counter()
+    report["scanned_rows"] = len(conn.execute(
+        "SELECT id, user_id, filename, ats_score, parsed_date FROM resume_scores").fetchall())
+    report["scan_seconds"] = time.perf_counter() - start
+    return report
+
+def main(argv=None):
+    from new_parser import DB_PATH
+    arg_parser = argparse.ArgumentParser(description="Report how resume text is stored and reclaim freed space")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--vacuum", action="store_true", help="rebuild the file to release freed pages")
+    args = arg_parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.vacuum:
+            before = os.path.getsize(args.db)
+            conn.execute("VACUUM")
+            print(f"Vacuumed: {before / 1024 / 1024:.1f} MiB -> {os.path.getsize(args.db) / 1024 / 1024:.1f} MiB")
+        report = storage_report(conn, args.db)
+        print(f"Database file: {report['file_bytes'] / 1024 / 1024:.1f} MiB "
+              f"({report['free_bytes'] / 1024 / 1024:.1f} MiB free pages)")
+        ratio = report["text_chars"] / report["compressed_bytes"] if report["compressed_bytes"] else 0.0
+        print(f"Compressed texts: {report['texts']}, {report['text_chars'] / 1024 / 1024:.1f} MiB raw -> "
+              f"{report['compressed_bytes'] / 1024 / 1024:.1f} MiB ({ratio:.1f}x)")
+        if report["inline_texts"]:
+            print(f"Texts still stored in resume_scores: {report['inline_texts']} (run the migrations to move them)")
+        print(f"Scanned {report['scanned_rows']} resume_scores rows in {report['scan_seconds'] * 1000:.1f} ms")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from nlp_resources import get_word_tokenize
+from skill_matcher import TOKEN_PATTERN
+
+class NltkTokenizer:
+    """NLTK word_tokenize, keeping alphanumeric tokens only (the original parse_resume behaviour)"""
+    name = "nltk"
+
+    def tokenize(self, text):
+        word_tokenize = get_word_tokenize()
+        return [word for word in word_tokenize(text.lower()) if word.isalnum()]
+
+class RegexTokenizer:
+    """Single precompiled regex pass using the skill matcher's own normalization"""
+    name = "regex"
+
+    def tokenize(self, text):
+        return TOKEN_PATTERN.findall(text.lower())
+
+TOKENIZERS = {
+    NltkTokenizer.name: NltkTokenizer,
+    RegexTokenizer.name: RegexTokenizer,
+}
+
+def get_tokenizer(name):
+    try:
+        return TOKENIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown tokenizer {name!r}, expected one of: {', '.join(TOKENIZERS)}")
@@ -0,0 +1,256 @@
+import argparse
+import hashlib
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from multiprocessing import Pool, cpu_count
+from ingest_manifest import Manifest
+from new_parser import DB_PATH, SCORING_VERSION, ResumeParser, cacheable
+from pdf_extraction import DEFAULT_LIMITS, ExtractionLimits
+from persistence import ResultWriter
+from text_tokenizers import TOKENIZERS
+
+# One parser per worker process, created by the pool initializer
+_worker_parser = None
+
+def _init_worker(db_path, tokenizer, extraction_limits):
+    global _worker_parser
+    # With a db_path the worker can read the parse cache; only the watcher stores into it
+    _worker_parser = ResumeParser(
+        db_path=db_path, headless=True, tokenizer=tokenizer, extraction_limits=extraction_limits)
+
+def _analyze_job(job):
+    """job: (path, size, mtime_ns, content hash already recorded for the path or None).
+
+    Returns (job, content_hash, result). content_hash is None if the file could not be read;
+    result is None when the content is unchanged or no text could be extracted.
+    """
+    path, _, _, known_hash = job
+    try:
+        with open(path, 'rb') as file:
+            pdf_bytes = file.read()
+    except OSError as e:
+        print(f"Error reading {path}: {e}")
+        return job, None, None
+    content_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    if content_hash == known_hash:
+        # Touched or copied over with identical content
+        return job, content_hash, None
+    try:
+        return job, content_hash, _worker_parser.analyze_bytes(pdf_bytes, store=False)
+    except Exception as e:
+        print(f"Error analyzing {path}: {e}")
+        return job, content_hash, None
+
+class FolderWatcher:
+    """Polls a directory and sends every new or changed PDF through the analysis pipeline once.
+
+    A rescan only stats the files and compares size and mtime with the manifest, which is held
+    in memory; a file whose stat changed is hashed and re-analyzed only if its content changed.
+    """
+
+    def __init__(self, directory, user_id, db_path=DB_PATH, workers=None, interval=5.0, settle_seconds=2.0,
+                 recursive=True, commit_every=100, use_cache=True, tokenizer="regex",
+                 extraction_limits=DEFAULT_LIMITS):
+        self.directory = os.path.abspath(directory)
+        self.user_id = user_id
+        self.db_path = db_path
+        self.workers = workers or cpu_count()
+        self.interval = interval
+        # Files modified more recently than this may still be being copied in
+        self.settle_seconds = settle_seconds
+        self.recursive = recursive
+        self.commit_every = commit_every
+        self.use_cache = use_cache
+        self.tokenizer = tokenizer
+        self.extraction_limits = extraction_limits
+        self.stopped = threading.Event()
+
+    def scan(self, known):
+        """Return (jobs for new or changed PDFs, number of PDFs seen) for one stat pass"""
+        jobs = []
+        seen = 0
+        settled_before = time.time_ns() - int(self.settle_seconds * 1e9)
+        pending = [self.directory]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError as e:
+                print(f"Error scanning directory: {e}")
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.recursive:
+                                pending.append(entry.path)
+                            continue
+                        if not entry.name.lower().endswith('.pdf') or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        # Removed between listing and stat
+                        continue
+                    seen += 1
+                    recorded = known.get(entry.path)
+                    if recorded and recorded[0] == stat.st_size and recorded[1] == stat.st_mtime_ns:
+                        continue
+                    if stat.st_mtime_ns > settled_before:
+                        continue
+                    jobs.append((entry.path, stat.st_size, stat.st_mtime_ns, recorded[2] if recorded else None))
+        jobs.sort()
+        return jobs, seen
+
+    def process(self, pool, parser, manifest, known, jobs):
+        """Analyze jobs on the pool, saving results and manifest rows together; returns the counts"""
+        counts = {"saved": 0, "failed": 0, "unchanged": 0, "unreadable": 0, "unsaved": 0}
+        # Manifest rows of queued results, in the order the writer assigns their ids
+        queued = []
+        cache = parser.parse_cache
+
+        def record_written(resume_ids):
+            rows = [row + (resume_id,) for row, resume_id in zip(queued, resume_ids)]
+            manifest.record(rows)
+            del queued[:len(resume_ids)]
+            counts["saved"] += len(rows)
+            for path, size, mtime_ns, content_hash, _ in rows:
+                known[path] = (size, mtime_ns, content_hash)
+
+        writer = ResultWriter(parser.conn, batch_size=self.commit_every, scoring_version=SCORING_VERSION,
+                              on_write=record_written)
+        failed, unchanged = [], []
+
+        def write_failed(e):
+            # The writer rolled back; paths left out of known are retried by the next scan
+            print(f"Error saving results: {e}")
+            parser.conn.rollback()
+            counts["unsaved"] += len(queued)
+            del queued[:]
+            writer.pending = []
+
+        for (path, size, mtime_ns, known_hash), content_hash, result in pool.imap_unordered(_analyze_job, jobs):
+            if content_hash is None:
+                # Left out of the manifest so the next scan tries again
+                counts["unreadable"] += 1
+            elif content_hash == known_hash:
+                unchanged.append((size, mtime_ns, path))
+            elif result is None:
+                failed.append((path, size, mtime_ns, content_hash, None))
+            else:
+                queued.append((path, size, mtime_ns, content_hash))
+                try:
+                    if result["cache_hit"]:
+                        cache.touch(result["cache_key"])
+                    elif self.use_cache and cacheable(result):
+                        cache.put(result["cache_key"], result["text"], result["parsed_data"])
+                    writer.add(self.user_id, os.path.basename(path), result["ats_score"], result["parsed_data"],
+                               result["text"], parse_version=result["parse_version"])
+                except sqlite3.Error as e:
+                    write_failed(e)
+        try:
+            writer.flush()
+        except sqlite3.Error as e:
+            write_failed(e)
+        try:
+            with parser.conn:
+                manifest.record(failed)
+                manifest.update_stat(unchanged)
+        except sqlite3.Error as e:
+            print(f"Error recording the manifest: {e}")
+            counts["unsaved"] += len(failed) + len(unchanged)
+            failed, unchanged = [], []
+        for path, size, mtime_ns, content_hash, _ in failed:
+            known[path] = (size, mtime_ns, content_hash)
+        for size, mtime_ns, path in unchanged:
+            known[path] = (size, mtime_ns, known[path][2])
+        counts["failed"] = len(failed)
+        counts["unchanged"] = len(unchanged)
+        return counts
+
+    def run(self, once=False, report=None):
+        """Scan until stop() is called, or a single time with once=True.
+
+        report, if given, is called after every scan with a dict of counts and timings.
+        When run from the main thread, SIGTERM stops the watcher after the batch in progress.
+        """
+        parser = ResumeParser(user_id=self.user_id, db_path=self.db_path, headless=True)
+        previous_handler = None
+        try:
+            manifest = Manifest(parser.conn)
+            known = manifest.load(self.directory)
+            worker_args = (self.db_path if self.use_cache else None, self.tokenizer, self.extraction_limits)
+            with Pool(self.workers, initializer=_init_worker, initargs=worker_args) as pool:
+                # Installed once the workers are forked: they must keep the default handler,
+                # since the pool shuts them down with SIGTERM
+                if threading.current_thread() is threading.main_thread():
+                    previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+                while not self.stopped.is_set():
+                    start = time.perf_counter()
+                    jobs, seen = self.scan(known)
+                    stats = {"files": seen, "changed": len(jobs), "scan_seconds": time.perf_counter() - start}
+                    stats.update(self.process(pool, parser, manifest, known, jobs) if jobs else {})
+                    stats["elapsed"] = time.perf_counter() - start
+                    if report:
+                        report(stats)
+                    if once:
+                        break
+                    self.stopped.wait(self.interval)
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+            parser.release_db()
+
+    def stop(self):
+        self.stopped.set()
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Watch a folder and analyze every new or changed resume PDF once")
+    arg_parser.add_argument("directory", help="directory the PDFs are dropped into")
+    arg_parser.add_argument("--user-id", type=int, required=True, help="user the results are saved under")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    arg_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    arg_parser.add_argument("--interval", type=float, default=5.0, help="seconds between scans")
+    arg_parser.add_argument("--settle", type=float, default=2.0,
+                            help="skip files modified within this many seconds, as they may still be copying")
+    arg_parser.add_argument("--commit-every", type=int, default=100, help="resumes written per transaction")
+    arg_parser.add_argument("--tokenizer", choices=sorted(TOKENIZERS), default="regex",
+                            help="tokenizer used for skill matching (default: regex)")
+    arg_parser.add_argument("--max-pages", type=int, default=DEFAULT_LIMITS.max_pages)
+    arg_parser.add_argument("--max-chars", type=int, default=DEFAULT_LIMITS.max_chars)
+    arg_parser.add_argument("--timeout", type=float, default=DEFAULT_LIMITS.timeout)
+    arg_parser.add_argument("--no-cache", action="store_true", help="always re-parse, ignoring the parse cache")
+    arg_parser.add_argument("--no-recursive", action="store_true", help="do not descend into subdirectories")
+    arg_parser.add_argument("--once", action="store_true", help="scan once and exit")
+    args = arg_parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"Not a directory: {args.directory}")
+        return 1
+
+    watcher = FolderWatcher(
+        args.directory, args.user_id, db_path=args.db, workers=args.workers, interval=args.interval,
+        settle_seconds=args.settle, recursive=not args.no_recursive, commit_every=args.commit_every,
+        use_cache=not args.no_cache, tokenizer=args.tokenizer,
+        extraction_limits=ExtractionLimits(args.max_pages, args.max_chars, args.timeout)
+    )
+
+    def report(stats):
+        if stats["changed"] or args.once:
+            print(f"Scanned {stats['files']} PDFs in {stats['scan_seconds'] * 1000:.0f} ms: "
+                  f"{stats['changed']} new or changed, {stats.get('saved', 0)} saved, "
+                  f"{stats.get('failed', 0)} without text, {stats.get('unchanged', 0)} unchanged content, "
+                  f"{stats.get('unsaved', 0)} to retry "
+                  f"({stats['elapsed']:.2f}s)")
+
+    print(f"Watching {watcher.directory} with {watcher.workers} workers")
+    try:
+        watcher.run(once=args.once, report=report)
+    except KeyboardInterrupt:
+        print("\nStopped; results saved so far are recorded in the manifest")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())